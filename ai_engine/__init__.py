@@ -0,0 +1,9 @@
+"""
+ESCC AI engine.
+
+Importable scan engine used directly by the web workers. ``predict.py`` can
+still be run as a script, which is what the subprocess isolation mode does.
+"""
+from .scanner import Scanner, ScanError, ScanRequest, get_scanner
+
+__all__ = ["Scanner", "ScanError", "ScanRequest", "get_scanner"]
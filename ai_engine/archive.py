@@ -0,0 +1,317 @@
+"""
+Archive (zip / tar) project uploads.
+
+Members are read straight out of the archive, never extracted to disk, and
+scanned in batches across a process pool. Each worker opens the archive
+itself, so only member names travel between processes.
+"""
+import codecs
+import hashlib
+import multiprocessing
+import os
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from .cache import archive_key, file_key, stream_digest
+from .rules import score_counts
+from .stream import CHUNK_SIZE, RuleCounter
+
+ZIP = "zip"
+TAR = "tar"
+
+# Zip-bomb / abuse guards
+MAX_MEMBERS = 5000
+MAX_MEMBER_SIZE = 50 * 1024 * 1024
+# Sab members mila kar (uncompressed); iske baad wale skip
+MAX_TOTAL_BYTES = 512 * 1024 * 1024
+
+# Chhote archives pool ke bagair (IPC overhead zyada hota hai)
+SERIAL_MAX_MEMBERS = 8
+SERIAL_MAX_BYTES = 2 * 1024 * 1024
+
+# Target size of one pool task
+BATCH_BYTES = 8 * 1024 * 1024
+
+BINARY_SNIFF_BYTES = 8192
+
+
+def archive_kind(path):
+    """``"zip"``, ``"tar"`` or ``None`` for a plain file."""
+    try:
+        if zipfile.is_zipfile(path):
+            return ZIP
+        if tarfile.is_tarfile(path):
+            return TAR
+    except OSError:
+        pass
+    return None
+
+
+def list_members(path, kind):
+    """
+    Regular file members as ``[(name, size)]`` in archive order, plus the
+    names that were skipped because of the size/count/total limits.
+    """
+    members = []
+    skipped = []
+    total = 0
+
+    if kind == ZIP:
+        with zipfile.ZipFile(path) as zf:
+            entries = [(i.filename, i.file_size) for i in zf.infolist() if not i.is_dir()]
+    else:
+        with tarfile.open(path, "r:*") as tf:
+            entries = [(i.name, i.size) for i in tf.getmembers() if i.isfile()]
+
+    for name, size in entries:
+        if size > MAX_MEMBER_SIZE or len(members) >= MAX_MEMBERS or total + size > MAX_TOTAL_BYTES:
+            skipped.append(name)
+        else:
+            members.append((name, size))
+            total += size
+    return members, skipped
+
+
+class HashingReader:
+    """Binary stream wrapper: jo bhi padha jaye uska SHA-256 saath saath."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.sha.update(data)
+        return data
+
+    def hexdigest(self):
+        # Scan beech mein ruka ho (binary) toh baaki bhi hash mein
+        while self.read(CHUNK_SIZE):
+            pass
+        return self.sha.hexdigest()
+
+
+def scan_member_stream(raw):
+    """
+    Scan one binary member stream. Returns ``None`` for binary content,
+    otherwise ``(critical, high, medium, loc, rule_hits)``.
+    """
+    head = raw.read(BINARY_SNIFF_BYTES)
+    if b"\x00" in head:
+        return None
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    counter = RuleCounter()
+    counter.feed(decoder.decode(head))
+    while True:
+        block = raw.read(CHUNK_SIZE)
+        if not block:
+            break
+        counter.feed(decoder.decode(block))
+    counter.feed(decoder.decode(b"", final=True))
+    counter.close()
+
+    loc = counter.lines
+    critical, high, medium = score_counts(counter.counts, loc)
+    return critical, high, medium, loc, counter.hits
+
+
+def _file_result(name, counts):
+    critical, high, medium, loc, rule_hits = counts
+    return {
+        "path": name,
+        "critical": critical,
+        "high": high,
+        "medium": medium,
+        "lines_analyzed": loc,
+        "rule_hits": rule_hits,
+    }
+
+
+def iter_member_streams(path, kind, names):
+    """Yield ``(name, binary_stream)`` for ``names``, in archive order."""
+    if kind == ZIP:
+        with zipfile.ZipFile(path) as zf:
+            for name in names:
+                with zf.open(name) as raw:
+                    yield name, raw
+    else:
+        # Stream mode: one sequential pass, no seeking back in .tar.gz
+        wanted = set(names)
+        with tarfile.open(path, "r|*") as tf:
+            for info in tf:
+                if info.name not in wanted:
+                    continue
+                yield info.name, tf.extractfile(info)
+                wanted.discard(info.name)
+                if not wanted:
+                    break
+
+
+def scan_members(path, kind, names, digests=False):
+    """
+    Scan ``names`` from the archive at ``path``. Runs inside pool workers.
+    Returns ``(file_results, binary_names, {name: sha256})``; the digests
+    are only filled with ``digests=True`` (hashed in the same read).
+    """
+    results = []
+    binary = []
+    hashes = {}
+    for name, raw in iter_member_streams(path, kind, names):
+        if digests:
+            raw = HashingReader(raw)
+        counts = scan_member_stream(raw)
+        if counts is None:
+            binary.append(name)
+        else:
+            results.append(_file_result(name, counts))
+        if digests:
+            hashes[name] = raw.hexdigest()
+    return results, binary, hashes
+
+
+def hash_members(path, kind, names):
+    """``{name: sha256}`` for ``names``. Runs inside pool workers."""
+    return {name: stream_digest(raw) for name, raw in iter_member_streams(path, kind, names)}
+
+
+def _batches(members):
+    """Contiguous batches of member names of roughly BATCH_BYTES each."""
+    batch = []
+    batch_bytes = 0
+    for name, size in members:
+        batch.append(name)
+        batch_bytes += size
+        if batch_bytes >= BATCH_BYTES:
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
+
+
+# ================== PROCESS POOL ==================
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers=None):
+    """Long-lived process pool shared by all archive scans in this process."""
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: web worker ke threads/DB connections fork nahi hote
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def _run_batches(func, path, kind, members, workers, on_batch=None):
+    """
+    Run ``func(path, kind, names)`` over ``members``, serially or on the
+    pool. ``on_batch(names, output)`` is called as each batch finishes.
+    """
+    if not members:
+        return []
+    total_bytes = sum(size for _, size in members)
+    if workers == 1 or len(members) <= SERIAL_MAX_MEMBERS or total_bytes <= SERIAL_MAX_BYTES:
+        names = [name for name, _ in members]
+        output = func(path, kind, names)
+        if on_batch is not None:
+            on_batch(names, output)
+        return [output]
+
+    pool = get_pool(workers)
+    futures = {pool.submit(func, path, kind, batch): batch for batch in _batches(members)}
+    outputs = []
+    for future in as_completed(futures):
+        output = future.result()
+        if on_batch is not None:
+            on_batch(futures[future], output)
+        outputs.append(output)
+    return outputs
+
+
+def scan_archive(path, kind=None, workers=None, cache=None, progress=None, lineage=None):
+    """
+    Scan every text member of an archive.
+
+    Returns ``{"files": [...], "skipped": [...]}`` where each file entry has
+    the same counters as a single-file scan. With a ``cache``, every member
+    is hashed in the same read as its scan and the counters are cached by
+    content. Only when ``lineage`` (same project's uploads) already had an
+    archive scanned are members hashed first, so a re-upload only rescans
+    what changed; a first upload is read once.
+
+    ``progress(bytes_scanned, bytes_total, rule_hits)`` is reported as
+    batches finish (uncompressed member bytes).
+    """
+    kind = kind or archive_kind(path)
+    members, skipped = list_members(path, kind)
+    sizes = dict(members)
+    bytes_total = sum(sizes.values())
+
+    keys = {}
+    cached = {}
+    to_scan = members
+    scan = scan_members
+    seen_key = archive_key(lineage) if cache is not None and lineage else None
+    if seen_key is not None and cache.get_many([seen_key]):
+        # Pehle bhi upload hua tha: hash karke sirf badle hue members scan
+        for digests in _run_batches(hash_members, path, kind, members, workers):
+            keys.update((name, file_key(digest)) for name, digest in digests.items())
+        cached = cache.get_many(list(set(keys.values())))
+        to_scan = [(name, size) for name, size in members if keys[name] not in cached]
+    elif cache is not None:
+        # Cold cache: hash scan ke saath hi (archive ek hi dafa decompress)
+        scan = partial(scan_members, digests=True)
+
+    state = {"bytes": bytes_total - sum(size for _, size in to_scan), "hits": 0}
+
+    def on_batch(names, output):
+        state["bytes"] += sum(sizes[name] for name in names)
+        state["hits"] += sum(result["rule_hits"] for result in output[0])
+        if progress is not None:
+            progress(state["bytes"], bytes_total, state["hits"])
+
+    by_name = {}
+    binary = set()
+    for results, binary_names, digests in _run_batches(scan, path, kind, to_scan, workers, on_batch):
+        for result in results:
+            by_name[result["path"]] = result
+        binary.update(binary_names)
+        keys.update((name, file_key(digest)) for name, digest in digests.items())
+
+    if cache is not None:
+        fresh = {}
+        for name, _ in to_scan:
+            if name in binary:
+                fresh[keys[name]] = {"binary": True}
+            elif name in by_name:
+                fresh[keys[name]] = {k: v for k, v in by_name[name].items() if k != "path"}
+        if seen_key is not None:
+            fresh[seen_key] = {"members": len(members)}
+        cache.set_many(fresh)
+
+        for name, _ in members:
+            entry = cached.get(keys[name])
+            if entry is None:
+                continue
+            if entry.get("binary"):
+                binary.add(name)
+            else:
+                by_name[name] = dict(entry, path=name)
+
+    # Archive order mein wapas
+    files = [by_name[name] for name, _ in members if name in by_name]
+    skipped.extend(name for name, _ in members if name in binary)
+    return {"files": files, "skipped": skipped}
@@ -0,0 +1,270 @@
+"""
+Incremental rescans with content-defined blocks.
+
+A file is cut into blocks. Cut points depend only on the content around
+them (a CRC of the line before the cut, rsync style), so editing a few
+lines only changes the blocks around the edit; every other block keeps
+its fingerprint even if lines were inserted or removed above it.
+
+The file is read in ``readline(LONG_LINE_CHARS)`` pieces and blocks are
+built while reading, so at most one block is in memory. Long lines
+(minified bundles, one-line JSON) are also cut inside the line, after a
+character no rule can match (``SAFE_CUT``), with a CRC of the chars before
+the cut deciding where. Blocks stay under ``MAX_BLOCK_CHARS`` in practice;
+if no safe cut shows up within ``MAX_UNCUT_CHARS`` the file is left to the
+plain streaming scan instead.
+
+Rule counts are stored per block fingerprint in one index per project
+lineage (see ``blocks_key``). A rescan only runs the rules on blocks whose
+fingerprint is not in the previous index, sums the per-block counts and
+scores the total with the real line count, so the result is exactly what
+a full scan would give.
+
+No rule hit can cross a cut: the only rule that spans lines is ``secret``
+(``\\s*`` before ``:``/``=``/quote), and a block never starts on a blank
+line or on a line whose first non-space character is one of those. A cut
+inside a line comes right after a ``SAFE_CUT`` character, which is outside
+every rule and every lookaround, so no hit (or its context) contains it.
+"""
+import hashlib
+import io
+import os
+import re
+import zlib
+from collections import Counter
+
+from .cache import blocks_key
+from .rules import count_hits
+from .stream import LINE_BREAKS, scan_stream
+
+# Block size (lines): average ~ MIN + CUT_MASK + 1
+MIN_BLOCK_LINES = 16
+MAX_BLOCK_LINES = 256
+CUT_MASK = 31
+
+# Block size (chars), lambi lines ke liye: file itne chars ke tukdon mein padhi
+# jati hai, aur line ke andar cut sirf pehle tukde ke baad
+LONG_LINE_CHARS = 4096
+MIN_BLOCK_CHARS = 4096
+MAX_BLOCK_CHARS = 64 * 1024
+# Line ke andar cut: itne pichle chars ka CRC
+CUT_WINDOW = 16
+# Itne chars tak koi safe cut na mile toh blocks chhod kar seedha stream scan
+MAX_UNCUT_CHARS = 1024 * 1024
+
+# Block inke pehle kabhi nahi katta (secret rule ka "\s*[:=]\s*['\"]" agli line tak ja sakta hai)
+NO_CUT_BEFORE = frozenset(":=\"'")
+
+# Koi rule (ya uska lookbehind/lookahead) in chars ke bahar kuch match nahi karta:
+# \w, whitespace aur : = " ' . / ( @ -  (rules.py badle toh ye bhi dekhein)
+SAFE_CUT = re.compile(r"""[^\w\s:="'./(@-]""")
+
+# Isse badi files ka index bahut bada ho jata hai; woh seedha stream hoti hain
+MAX_FILE_BYTES = 8 * 1024 * 1024
+
+
+class NoSafeCut(Exception):
+    """MAX_UNCUT_CHARS tak block katne ki koi safe jagah nahi mili."""
+
+
+def _can_start_block(line):
+    head = line.lstrip()
+    return bool(head) and head[0] not in NO_CUT_BEFORE
+
+
+def _line_breaks(text):
+    # Cut kabhi "\r\n" ke beech nahi padta (cut "\n" ya SAFE_CUT char ke baad)
+    return sum(text.count(ch) for ch in LINE_BREAKS) - text.count("\r\n")
+
+
+# ================== SPLITTER ==================
+class BlockSplitter:
+    """
+    Pieces (``readline(LONG_LINE_CHARS)`` results) in, finished blocks out.
+
+        splitter = BlockSplitter()
+        for piece in pieces:
+            for block in splitter.feed(piece):
+                ...
+        for block in splitter.close():
+            ...
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0         # chars in the current block
+        self.lines = 0        # lines finished in the current block
+        self.line_len = 0     # chars of the current line read so far
+        self.line_crc = 0
+        self.prev_crc = 0     # CRC of the last finished line
+        self.tail = ""        # last CUT_WINDOW chars read
+
+    def feed(self, piece):
+        blocks = []
+        if self.line_len == 0:
+            if self.parts and self._cut_before_line(piece):
+                blocks.append(self._take())
+            rest = piece
+        else:
+            rest = self._cut_inside_line(piece, blocks)
+
+        if rest:
+            self.parts.append(rest)
+            self.size += len(rest)
+            if self.size > MAX_UNCUT_CHARS:
+                raise NoSafeCut()
+        self.tail = (self.tail + piece)[-CUT_WINDOW:]
+        self.line_crc = zlib.crc32(piece.encode("utf-8"), self.line_crc)
+        if piece.endswith("\n"):
+            self.lines += 1
+            self.prev_crc = self.line_crc
+            self.line_crc = 0
+            self.line_len = 0
+        else:
+            self.line_len += len(piece)
+        return blocks
+
+    def close(self):
+        return [self._take()] if self.parts else []
+
+    def _take(self):
+        block = "".join(self.parts)
+        self.parts = []
+        self.size = 0
+        self.lines = 0
+        return block
+
+    def _cut_before_line(self, piece):
+        if not _can_start_block(piece):
+            return False
+        if self.size >= MAX_BLOCK_CHARS:
+            return True
+        if self.lines < MIN_BLOCK_LINES:
+            return False
+        return self.lines >= MAX_BLOCK_LINES or self.prev_crc & CUT_MASK == 0
+
+    def _cut_inside_line(self, piece, blocks):
+        """Long line ka agla tukda: safe jagah par cut karke baaki wapas."""
+        window = self.tail + piece
+        shift = len(self.tail)
+        start = 0
+        while True:
+            # Cut p par (piece[p - 1] safe char); block kam se kam MIN_BLOCK_CHARS
+            search_from = max(start, start + MIN_BLOCK_CHARS - self.size - 1)
+            for match in SAFE_CUT.finditer(piece, search_from):
+                cut = match.end()
+                if cut >= len(piece):
+                    return piece[start:]
+                size = self.size + cut - start
+                crc = zlib.crc32(window[shift + cut - CUT_WINDOW:shift + cut].encode("utf-8"))
+                if size >= MAX_BLOCK_CHARS or crc & CUT_MASK == 0:
+                    self.parts.append(piece[start:cut])
+                    self.size = size
+                    blocks.append(self._take())
+                    start = cut
+                    break
+            else:
+                return piece[start:]
+
+
+def _pieces(readline):
+    while True:
+        piece = readline(LONG_LINE_CHARS)
+        if not piece:
+            return
+        yield piece
+
+
+def split_blocks(text):
+    """``text`` -> list of block strings."""
+    splitter = BlockSplitter()
+    blocks = []
+    for piece in _pieces(io.StringIO(text).readline):
+        blocks.extend(splitter.feed(piece))
+    return blocks + splitter.close()
+
+
+def fingerprint(block):
+    return hashlib.blake2b(block.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ================== SCAN ==================
+def _scan_pieces(pieces, index, progress):
+    """
+    Blocks ko padhte padhte scan karna. Returns ``(counts, lines, new_index)``;
+    ``progress(rule_hits)`` har dobara scan hue block ke baad.
+    """
+    index = index or {}
+    total = Counter()
+    new_index = {}
+    breaks = 0
+    last_char = ""
+    splitter = BlockSplitter()
+
+    def add(block):
+        nonlocal breaks, last_char
+        key = fingerprint(block)
+        counts = new_index.get(key)
+        if counts is None:
+            counts = index.get(key)
+        rescanned = counts is None
+        if rescanned:
+            # Sirf badla hua block dobara scan hota hai
+            counts = {rule_id: n for rule_id, n in count_hits(block).items() if rule_id is not None}
+        new_index[key] = counts
+        total.update(counts)
+        breaks += _line_breaks(block)
+        last_char = block[-1]
+        if rescanned and progress is not None:
+            progress(sum(total.values()))
+
+    for piece in pieces:
+        for block in splitter.feed(piece):
+            add(block)
+    for block in splitter.close():
+        add(block)
+
+    lines = breaks + (1 if last_char and last_char not in LINE_BREAKS else 0)
+    return total, lines, new_index
+
+
+def scan_blocks(text, index=None, progress=None):
+    """
+    Scan ``text`` reusing ``index`` (``{fingerprint: counts}`` from the last
+    scan). Returns ``(counts, lines, new_index)``; ``new_index`` only holds
+    this text's blocks, so it never grows past one version of the file.
+    ``progress(chars_done, chars_total, rule_hits)`` after every rescanned
+    block (reused blocks count as done too).
+    """
+    stream = io.StringIO(text)
+    on_block = None
+    if progress is not None:
+        on_block = lambda hits: progress(stream.tell(), len(text), hits)
+    try:
+        return _scan_pieces(_pieces(stream.readline), index, on_block)
+    except NoSafeCut:
+        counter = scan_stream(io.StringIO(text))
+        return counter.counts, counter.lines, {}
+
+
+def scan_file_blocks(file_path, cache, lineage, progress=None):
+    """
+    ``scan_blocks`` for a file, with the lineage's index kept in ``cache``.
+    Returns ``(counts, lines)``, or None if the file can't be cut into
+    blocks (caller then streams it).
+    """
+    key = blocks_key(lineage)
+    index = cache.get_many([key]).get(key)
+
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        on_block = None
+        if progress is not None:
+            bytes_total = os.path.getsize(file_path)
+            on_block = lambda hits: progress(f.buffer.tell(), bytes_total, hits)
+        try:
+            counts, lines, new_index = _scan_pieces(_pieces(f.readline), index, on_block)
+        except NoSafeCut:
+            return None
+
+    cache.set_many({key: new_index})
+    return counts, lines
@@ -0,0 +1,109 @@
+"""
+Content-addressed scan cache.
+
+Keys are built from the SHA-256 of the file content plus the rule set
+version (and, for full analyses, the model version), so a cached entry can
+never be served for different content or after rules/model changed.
+
+Any object with ``get_many(keys) -> dict`` and ``set_many(dict)`` can be
+used as a cache; ``LRUScanCache`` is the in-process default.
+"""
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .rules import RULESET_VERSION
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def stream_digest(raw):
+    """SHA-256 hex digest of a binary stream, read in chunks."""
+    digest = hashlib.sha256()
+    while True:
+        block = raw.read(HASH_CHUNK_SIZE)
+        if not block:
+            break
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    with open(path, "rb") as raw:
+        return stream_digest(raw)
+
+
+def analysis_key(digest, model_version, context=""):
+    """
+    Key for a complete ``run_analysis`` result. ``context`` holds the
+    non-content model inputs (encoded framework/scan type).
+    """
+    return f"analysis:{digest}:{RULESET_VERSION}:{model_version}:{context}"
+
+
+def file_key(digest):
+    """Key for the static counters of one file (model independent)."""
+    return f"file:{digest}:{RULESET_VERSION}"
+
+
+def blocks_key(lineage):
+    """
+    Key for the line-block index of a project lineage (see blocks.py).
+    Lineage naam user input hai, isliye hash (key length fixed rehti hai).
+    """
+    digest = hashlib.sha256(lineage.encode("utf-8")).hexdigest()[:32]
+    return f"blocks:{digest}:{RULESET_VERSION}"
+
+
+def archive_key(lineage):
+    """
+    Marker that a project lineage already had an archive scanned (see
+    archive.py): only then are members hashed before scanning.
+    """
+    digest = hashlib.sha256(lineage.encode("utf-8")).hexdigest()[:32]
+    return f"archive:{digest}:{RULESET_VERSION}"
+
+
+# ================== IN-PROCESS LRU ==================
+class LRUScanCache:
+    """Thread-safe LRU cache holding at most ``max_entries`` results."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = copy.deepcopy(self._data[key])
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items):
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = copy.deepcopy(value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
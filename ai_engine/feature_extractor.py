@@ -1,17 +1,148 @@
-<<<<<<< HEAD
-def extract_features(project):
+"""
+Scan output -> model input.
+
+Turns a static scan result plus the project's framework and scan type into
+rows with exactly the columns ``train.py`` fits on (dataset.csv minus
+project_name/description/score), encoded with the label encoders train.py
+persisted. Everything comes from the scan result itself, no DB queries.
+"""
+import json
+import os
+
+# Library checks: Agar ML libraries nahi hain toh crash na ho
+try:
+    import numpy as np
+    HAS_ML = True
+except ImportError:
+    HAS_ML = False
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+from .registry import ModelRegistry
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# train.py ka exact column order
+FEATURE_COLUMNS = [
+    "compliance_framework",
+    "scan_type",
+    "file_count",
+    "lines_of_code",
+    "issues_found",
+    "critical",
+    "high",
+    "medium",
+]
+ENCODED_COLUMNS = ["compliance_framework", "scan_type"]
+
+# train.py ke saath likhi jati hai (model.pkl ki tarah pehli mili file)
+ENCODER_PATHS = [
+    os.path.join(BASE_DIR, "encoders.json"),
+    os.path.join(BASE_DIR, "model", "encoders.json"),
+]
+
+# encoders.json na ho toh: LabelEncoder dataset.csv par yehi classes banata hai
+DEFAULT_CLASSES = {
+    "compliance_framework": ["GDPR", "ISO 27001", "OWASP", "PCI-DSS"],
+    "scan_type": ["deep", "standard"],
+}
+# Anjaan values (e.g. "General AI") in par map hoti hain
+FALLBACK_VALUES = {
+    "compliance_framework": "GDPR",
+    "scan_type": "standard",
+}
+
+
+def _normalize(value):
+    # "iso27001", "ISO 27001", "Pci dss" sab same
+    return "".join(ch for ch in str(value).lower() if ch.isalnum())
+
+
+# ================== ENCODER ==================
+class FeatureEncoder:
+    """Label encoding for the categorical columns (``classes_`` order)."""
+
+    def __init__(self, classes=None):
+        self.classes = {col: list(values) for col, values in (classes or DEFAULT_CLASSES).items()}
+        self._codes = {
+            col: {_normalize(value): code for code, value in enumerate(values)}
+            for col, values in self.classes.items()
+        }
+
+    def encode(self, column, value):
+        codes = self._codes[column]
+        code = codes.get(_normalize(value)) if value is not None else None
+        if code is None:
+            code = codes.get(_normalize(FALLBACK_VALUES[column]), 0)
+        return code
+
+    def to_dict(self):
+        return {col: list(values) for col, values in self.classes.items()}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def from_label_encoders(cls, encoders):
+        """Build from fitted sklearn LabelEncoders keyed by column."""
+        return cls({col: [str(value) for value in enc.classes_] for col, enc in encoders.items()})
+
+
+def _load_encoder(path):
+    with open(path, encoding="utf-8") as f:
+        return FeatureEncoder(json.load(f))
+
+
+encoder_registry = ModelRegistry(ENCODER_PATHS, loader=_load_encoder)
+
+
+def get_encoder():
+    return encoder_registry.get() or FeatureEncoder()
+
+
+# ================== FEATURES ==================
+def extract_features(result, framework=None, scan_type=None):
+    """Raw (unencoded) feature values for one static scan result."""
+    details = result.get("details", {})
     return {
-        "framework": project.framework,
-        "scan_type": project.scan_type,
-        "file_type": project.file.name.split('.')[-1],
-        "issue_count": project.scan_results.count()
+        "compliance_framework": framework,
+        "scan_type": scan_type,
+        # Single file = 1, archive ki har text file alag
+        "file_count": details.get("file_count", 1),
+        "lines_of_code": details.get("lines_analyzed", 0),
+        "issues_found": details.get("total_issues", 0),
+        "critical": details.get("critical", 0),
+        "high": details.get("high", 0),
+        "medium": details.get("medium", 0),
     }
-=======
-def extract_features(project):
-    return {
-        "framework": project.framework,
-        "scan_type": project.scan_type,
-        "file_type": project.file.name.split('.')[-1],
-        "issue_count": project.scan_results.count()
-    }
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
+
+
+def feature_row(result, framework=None, scan_type=None, encoder=None):
+    """One encoded model input row, in FEATURE_COLUMNS order."""
+    encoder = encoder or get_encoder()
+    features = extract_features(result, framework, scan_type)
+    for col in ENCODED_COLUMNS:
+        features[col] = encoder.encode(col, features[col])
+    return [features[col] for col in FEATURE_COLUMNS]
+
+
+def feature_context(framework=None, scan_type=None, encoder=None):
+    """Encoded categorical inputs as a short string (part of the cache key)."""
+    encoder = encoder or get_encoder()
+    return f"{encoder.encode('compliance_framework', framework)}-{encoder.encode('scan_type', scan_type)}"
+
+
+def feature_matrix(rows):
+    """
+    Stack rows into one model input. A DataFrame with the training column
+    names when pandas is there (sklearn checks them), else a 2-D array.
+    """
+    matrix = np.asarray(rows, dtype=float).reshape(len(rows), len(FEATURE_COLUMNS))
+    if HAS_PANDAS:
+        return pd.DataFrame(matrix, columns=FEATURE_COLUMNS)
+    return matrix
@@ -0,0 +1,43 @@
+"""
+Batch model inference.
+
+A RandomForest ``predict`` call has a large fixed cost (input validation and
+a dispatch per estimator) compared to the per-row work, so scoring N scans
+with one call on an (N, k) array is much cheaper than N single-row calls.
+"""
+import logging
+
+from .feature_extractor import HAS_ML, feature_matrix
+from .registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+
+def predict_batch(rows):
+    """
+    Run the model once over ``rows``. Returns one int prediction per row,
+    or ``None`` for every row when there is no usable model.
+    """
+    if not rows:
+        return []
+    model = model_registry.get() if HAS_ML else None
+    if model is None:
+        return [None] * len(rows)
+
+    try:
+        preds = model.predict(feature_matrix(rows))
+    except Exception as e:
+        # Static score hi use hoga
+        logger.warning(f"Model predict failed: {type(e).__name__}: {e}")
+        return [None] * len(rows)
+    return [int(pred) for pred in preds]
+
+
+def apply_prediction(result, ml_pred):
+    """Merge ML logic with Real Scan logic (in place)."""
+    if ml_pred is None:
+        return result
+    final_score = int((result["ethical_score"] + ml_pred) / 2)
+    result["ethical_score"] = final_score
+    result["security_score"] = max(5, final_score - 5)
+    return result
@@ -1,148 +1,27 @@
-<<<<<<< HEAD
 import os
 import sys
 import json
-import re
-
-# Library checks: Agar ML libraries nahi hain toh crash na ho
-try:
-    import joblib
-    import numpy as np
-    HAS_ML = True
-except ImportError:
-    HAS_ML = False
 
 # Path Setup
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
 
-def scan_file_for_issues(file_path):
-    """
-    File ke andar patterns dhoond kar real issues nikalna
-    """
-    critical = 0
-    high = 0
-    medium = 0
-    loc = 0
-    
-    try:
-        # File path normalizer (Windows/Linux compatibility)
-        file_path = os.path.normpath(file_path)
-        
-        if not os.path.exists(file_path):
-            return 0, 0, 0, 0
+# Script mode (subprocess isolation): ai_engine package ko importable banao
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(BASE_DIR))
 
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.splitlines()
-            loc = len(lines)
+from ai_engine.archive import archive_kind, scan_archive
+from ai_engine.blocks import MAX_FILE_BYTES, scan_file_blocks
+from ai_engine.feature_extractor import feature_row
+from ai_engine.inference import apply_prediction, predict_batch
+from ai_engine.rules import score_counts
+from ai_engine.stream import scan_stream
 
-            # 1. CRITICAL: Hardcoded Secrets & Dangerous Functions
-            # Pattern for: api_key = "...", password: '...'
-            if re.search(r'(password|passwd|secret|api_key|token|auth_key)\s*[:=]\s*["\']', content, re.I):
-                critical += 2
-            if any(func in content for func in ["eval(", "exec(", "os.system(", "subprocess.Popen("]):
-                critical += 3
-            
-            # 2. HIGH: Insecure Protocols & Data Leakage
-            if "http://" in content and "localhost" not in content and "127.0.0.1" not in content:
-                high += 2
-            # Simple Email Regex
-            if re.search(r'[\w\.-]+@[\w\.-]+\.\w+', content):
-                high += 1
-                
-            # 3. MEDIUM: Coding Standards
-            medium += content.count("console.log")
-            medium += content.count("TODO")
-            if loc > 1000: # Very large files are a maintenance risk
-                medium += 1
-
-    except Exception as e:
-        # Debug error for manual testing
-        # print(f"DEBUG ERROR: {str(e)}", file=sys.stderr)
-        pass
-        
-    return critical, high, medium, loc
-
-def run_analysis(file_path):
-    # 1. Real Static Analysis
-    critical, high, medium, loc = scan_file_for_issues(file_path)
-    total_issues = critical + high + medium
-    
-    # 2. Score Calculation (Logic based on your dataset)
-    base_score = 100
-    penalty = (critical * 15) + (high * 8) + (medium * 3)
-    final_score = max(30, base_score - penalty)
-
-    # 3. ML Prediction (Only if libraries and model exist)
-    if HAS_ML and os.path.exists(MODEL_PATH):
-        try:
-            model = joblib.load(MODEL_PATH)
-            # Feature mapping to match your dataset.csv [framework, scan_type, file_count]
-            # Mapping: GDPR=2, deep=1, count=1
-            X = np.array([[2, 1, 1]]) 
-            ml_pred = int(model.predict(X)[0])
-            # Merge ML logic with Real Scan logic
-            final_score = int((final_score + ml_pred) / 2)
-        except:
-            pass # Use the final_score from static analysis
-
-    # Final JSON structure for Django
-    return {
-        "ethical_score": final_score, 
-        "security_score": max(5, final_score - 5),
-        "details": {
-            "total_issues": total_issues,
-            "critical": critical,
-            "high": high,
-            "medium": medium,
-            "lines_analyzed": loc,
-            "status": "Non-Compliant" if critical > 0 else "Compliant",
-            "vulnerabilities": [
-                {"severity": "Critical", "count": critical},
-                {"severity": "High", "count": high},
-                {"severity": "Medium", "count": medium}
-            ]
-        }
-    }
-
-if __name__ == "__main__":
-    # Ensure subprocess communication works via JSON
-    if len(sys.argv) > 1:
-        target_file = sys.argv[1]
-        try:
-            results = run_analysis(target_file)
-            print(json.dumps(results))
-        except Exception as e:
-            # Last resort error reporting
-            print(json.dumps({
-                "ethical_score": 0,
-                "security_score": 0,
-                "details": {"error": str(e)},
-                "status": "Failed"
-            }))
-    else:
-=======
-import os
-import sys
-import json
-import re
-
-# Library checks: Agar ML libraries nahi hain toh crash na ho
-try:
-    import joblib
-    import numpy as np
-    HAS_ML = True
-except ImportError:
-    HAS_ML = False
-
-# Path Setup
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
-
-def scan_file_for_issues(file_path):
+def scan_file_for_issues(file_path, progress=None, cache=None, lineage=None):
     """
-    File ke andar patterns dhoond kar real issues nikalna
+    File ke andar patterns dhoond kar real issues nikalna.
+    ``progress(bytes_scanned, bytes_total, rule_hits)`` har chunk ke baad.
+    ``cache`` + ``lineage`` (same project ke uploads) ho toh sirf badle hue
+    line blocks dobara scan hote hain (see blocks.py).
     """
     critical = 0
     high = 0
@@ -156,30 +35,24 @@ def scan_file_for_issues(file_path):
         if not os.path.exists(file_path):
             return 0, 0, 0, 0
 
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.splitlines()
-            loc = len(lines)
-
-            # 1. CRITICAL: Hardcoded Secrets & Dangerous Functions
-            # Pattern for: api_key = "...", password: '...'
-            if re.search(r'(password|passwd|secret|api_key|token|auth_key)\s*[:=]\s*["\']', content, re.I):
-                critical += 2
-            if any(func in content for func in ["eval(", "exec(", "os.system(", "subprocess.Popen("]):
-                critical += 3
-            
-            # 2. HIGH: Insecure Protocols & Data Leakage
-            if "http://" in content and "localhost" not in content and "127.0.0.1" not in content:
-                high += 2
-            # Simple Email Regex
-            if re.search(r'[\w\.-]+@[\w\.-]+\.\w+', content):
-                high += 1
-                
-            # 3. MEDIUM: Coding Standards
-            medium += content.count("console.log")
-            medium += content.count("TODO")
-            if loc > 1000: # Very large files are a maintenance risk
-                medium += 1
+        scanned = None
+        if cache is not None and lineage and os.path.getsize(file_path) <= MAX_FILE_BYTES:
+            scanned = scan_file_blocks(file_path, cache, lineage, progress)
+
+        if scanned is not None:
+            counts, loc = scanned
+        else:
+            # File ko chunks mein stream karo: poori file memory mein nahi aati,
+            # saare rules ek hi pass mein (see rules.py / stream.py)
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                on_chunk = None
+                if progress is not None:
+                    bytes_total = os.path.getsize(file_path)
+                    on_chunk = lambda counter: progress(f.buffer.tell(), bytes_total, counter.hits)
+                counter = scan_stream(f, on_chunk=on_chunk)
+            counts, loc = counter.counts, counter.lines
+
+        critical, high, medium = score_counts(counts, loc)
 
     except Exception as e:
         # Debug error for manual testing
@@ -188,9 +61,45 @@ def scan_file_for_issues(file_path):
         
     return critical, high, medium, loc
 
-def run_analysis(file_path):
-    # 1. Real Static Analysis
-    critical, high, medium, loc = scan_file_for_issues(file_path)
+def scan_archive_for_issues(file_path, kind=None, workers=None, cache=None, progress=None, lineage=None):
+    """
+    Archive (zip/tar) ki har text file ka scan, process pool par.
+    Totals ke saath per-file breakdown bhi wapas aata hai.
+    """
+    scanned = scan_archive(file_path, kind=kind, workers=workers, cache=cache, progress=progress, lineage=lineage)
+    files = scanned["files"]
+    critical = sum(f["critical"] for f in files)
+    high = sum(f["high"] for f in files)
+    medium = sum(f["medium"] for f in files)
+    loc = sum(f["lines_analyzed"] for f in files)
+    return critical, high, medium, loc, scanned
+
+def static_analysis(file_path, workers=None, cache=None, progress=None, lineage=None):
+    """
+    Real Static Analysis (single file ya poora archive), bina model ke.
+    Model batch mein alag se chalta hai (see inference.py).
+    """
+    kind = archive_kind(file_path)
+    if kind:
+        critical, high, medium, loc, scanned = scan_archive_for_issues(file_path, kind, workers, cache, progress, lineage)
+    else:
+        critical, high, medium, loc = scan_file_for_issues(file_path, progress, cache, lineage)
+        scanned = None
+
+    result = static_result(critical, high, medium, loc)
+    if scanned is not None:
+        result["details"]["file_count"] = len(scanned["files"])
+        result["details"]["files"] = scanned["files"]
+        result["details"]["skipped_files"] = scanned["skipped"]
+    return result
+
+def run_analysis(file_path, workers=None, cache=None, progress=None, scan_type="standard", framework=None):
+    result = static_analysis(file_path, workers, cache, progress)
+    # ML Prediction (Only if libraries and model exist)
+    row = feature_row(result, framework, scan_type)
+    return apply_prediction(result, predict_batch([row])[0])
+
+def static_result(critical, high, medium, loc):
     total_issues = critical + high + medium
     
     # 2. Score Calculation (Logic based on your dataset)
@@ -198,19 +107,6 @@ def run_analysis(file_path):
     penalty = (critical * 15) + (high * 8) + (medium * 3)
     final_score = max(30, base_score - penalty)
 
-    # 3. ML Prediction (Only if libraries and model exist)
-    if HAS_ML and os.path.exists(MODEL_PATH):
-        try:
-            model = joblib.load(MODEL_PATH)
-            # Feature mapping to match your dataset.csv [framework, scan_type, file_count]
-            # Mapping: GDPR=2, deep=1, count=1
-            X = np.array([[2, 1, 1]]) 
-            ml_pred = int(model.predict(X)[0])
-            # Merge ML logic with Real Scan logic
-            final_score = int((final_score + ml_pred) / 2)
-        except:
-            pass # Use the final_score from static analysis
-
     # Final JSON structure for Django
     return {
         "ethical_score": final_score, 
@@ -234,8 +130,11 @@ if __name__ == "__main__":
     # Ensure subprocess communication works via JSON
     if len(sys.argv) > 1:
         target_file = sys.argv[1]
+        # predict.py <file> [scan_type] [framework]
+        scan_type = sys.argv[2] if len(sys.argv) > 2 else "standard"
+        framework = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] else None
         try:
-            results = run_analysis(target_file)
+            results = run_analysis(target_file, scan_type=scan_type, framework=framework)
             print(json.dumps(results))
         except Exception as e:
             # Last resort error reporting
@@ -246,5 +145,4 @@ if __name__ == "__main__":
                 "status": "Failed"
             }))
     else:
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
         print(json.dumps({"error": "No file path provided"}))
\ No newline at end of file
@@ -0,0 +1,101 @@
+import logging
+import os
+import threading
+import time
+
+try:
+    import joblib
+    HAS_JOBLIB = True
+except ImportError:
+    HAS_JOBLIB = False
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Pehla jo file mil jaye wahi load hota hai (train.py ka output pehle)
+MODEL_PATHS = [
+    os.path.join(BASE_DIR, "model.pkl"),
+    os.path.join(BASE_DIR, "model", "escc_model.pkl"),
+]
+
+
+# ================== MODEL REGISTRY ==================
+class ModelRegistry:
+    """
+    Process-wide cache of the trained model.
+
+    The pickle is deserialized once and kept resident. On access the file's
+    mtime/size is re-checked (at most every ``check_interval`` seconds) and
+    the model is reloaded if it was replaced on disk. A file that fails to
+    load is remembered, so a broken pickle is not re-read on every scan.
+    """
+
+    def __init__(self, paths=None, check_interval=2.0, loader=None):
+        self.paths = list(paths or MODEL_PATHS)
+        self.check_interval = check_interval
+        # Default joblib pickle; koi aur file type ho toh apna loader do
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._model = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def _current_signature(self):
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return (path, st.st_mtime_ns, st.st_size)
+        return None
+
+    def get(self):
+        """Return the loaded model, or ``None`` if no usable model exists."""
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < self.check_interval:
+            return self._model
+
+        signature = self._current_signature()
+        if signature == self._signature:
+            self._checked_at = now
+            return self._model
+
+        with self._lock:
+            if signature != self._signature:
+                self._model = self._load(signature)
+                self._signature = signature
+            self._checked_at = now
+            return self._model
+
+    def _load(self, signature):
+        if signature is None or (self.loader is None and not HAS_JOBLIB):
+            return None
+        path = signature[0]
+        try:
+            model = (self.loader or joblib.load)(path)
+        except Exception as e:
+            logger.warning(f"Model load failed ({path}): {type(e).__name__}: {e}")
+            return None
+        logger.info(f"Model loaded from {path}")
+        return model
+
+    @property
+    def version(self):
+        """Identifier of the currently loaded model file ("none" if absent)."""
+        self.get()
+        if self._signature is None or self._model is None:
+            return "none"
+        path, mtime_ns, size = self._signature
+        return f"{os.path.basename(path)}:{mtime_ns}:{size}"
+
+    def preload(self):
+        """
+        Load the model eagerly. Called from the gunicorn master before
+        workers fork, so they all share the same pages copy-on-write.
+        """
+        self._checked_at = 0.0
+        return self.get()
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,116 @@
+"""
+Static analysis rules.
+
+Every rule is folded into one alternation regex (``MATCHER``) compiled at
+import time, so a file is walked exactly once no matter how many rules
+exist. Each hit is reported as ``(rule_id, offset)``.
+
+Every branch of the alternation starts with a plain literal character.
+That lets ``re`` skip ahead on the first-character set instead of trying
+every rule at every offset, which is what keeps the single pass cheaper
+than the old per-check ``in`` / ``count`` passes.
+"""
+import re
+from collections import Counter, namedtuple
+
+# Rule set badle (pattern ya scoring) toh version bump karein
+RULESET_VERSION = "1"
+
+Rule = namedtuple("Rule", ["id", "severity", "branches"])
+
+
+def _caseless(words, suffix=""):
+    """Case-insensitive branches for ``words`` whose first char stays a literal."""
+    branches = []
+    for word in words:
+        rest = f"(?i:{re.escape(word[1:])})" if len(word) > 1 else ""
+        for first in sorted({word[0].lower(), word[0].upper()}):
+            branches.append(re.escape(first) + rest + suffix)
+    return branches
+
+
+RULES = (
+    # 1. CRITICAL: Hardcoded Secrets & Dangerous Functions
+    # Pattern for: api_key = "...", password: '...'
+    Rule("secret", "critical", _caseless(
+        ["password", "passwd", "secret", "api_key", "token", "auth_key"],
+        suffix=r"""\s*[:=]\s*["']""",
+    )),
+    Rule("dangerous_call", "critical", [r"eval\(", r"exec\(", r"os\.system\(", r"subprocess\.Popen\("]),
+
+    # 2. HIGH: Insecure Protocols & Data Leakage
+    Rule("insecure_http", "high", [r"http://"]),
+    # Simple Email: reported at the "@" (word char before, domain after)
+    Rule("email", "high", [r"@(?<=[\w.-]@)(?=[\w.-]+\.\w+)"]),
+    # Markers: local URLs are not an insecure-protocol finding
+    Rule("localhost", None, [r"localhost"]),
+    Rule("loopback", None, [r"127\.0\.0\.1"]),
+
+    # 3. MEDIUM: Coding Standards
+    Rule("console_log", "medium", [r"console\.log"]),
+    Rule("todo", "medium", [r"TODO"]),
+)
+
+RULES_BY_ID = {rule.id: rule for rule in RULES}
+
+# No two rules can match at the same offset, so branch order does not matter
+MATCHER = re.compile("|".join(branch for rule in RULES for branch in rule.branches))
+
+# Per-rule regexes, only used to label a hit the combined MATCHER found.
+# Keyed by first character; most characters belong to exactly one rule.
+_RULES_BY_FIRST_CHAR = {}
+for _rule in RULES:
+    _regex = re.compile("|".join(_rule.branches))
+    for _first in {branch.lstrip("\\")[0] for branch in _rule.branches}:
+        _RULES_BY_FIRST_CHAR.setdefault(_first, []).append((_rule.id, _regex))
+
+
+def _rule_at(text, pos, endpos):
+    candidates = _RULES_BY_FIRST_CHAR[text[pos]]
+    if len(candidates) == 1:
+        return candidates[0][0]
+    for rule_id, regex in candidates:
+        if regex.match(text, pos, endpos):
+            return rule_id
+    return None
+
+
+def iter_hits(text, pos=0, endpos=None):
+    """Yield ``(rule_id, offset)`` for every rule hit, in one pass over ``text``."""
+    if endpos is None:
+        endpos = len(text)
+    for m in MATCHER.finditer(text, pos, endpos):
+        yield _rule_at(text, m.start(), endpos), m.start()
+
+
+def find_hits(text):
+    return list(iter_hits(text))
+
+
+def count_hits(text):
+    """Hits per rule id."""
+    return Counter(rule_id for rule_id, _ in iter_hits(text))
+
+
+def score_counts(counts, loc):
+    """Turn per-rule hit counts into ``(critical, high, medium)``."""
+    critical = 0
+    high = 0
+    medium = 0
+
+    if counts.get("secret"):
+        critical += 2
+    if counts.get("dangerous_call"):
+        critical += 3
+
+    if counts.get("insecure_http") and not counts.get("localhost") and not counts.get("loopback"):
+        high += 2
+    if counts.get("email"):
+        high += 1
+
+    medium += counts.get("console_log", 0)
+    medium += counts.get("todo", 0)
+    if loc > 1000: # Very large files are a maintenance risk
+        medium += 1
+
+    return critical, high, medium
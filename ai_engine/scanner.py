@@ -0,0 +1,193 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import namedtuple
+
+from . import predict
+from .cache import LRUScanCache, analysis_key, file_digest
+from .feature_extractor import feature_context, feature_row, get_encoder
+from .inference import apply_prediction, predict_batch
+from .registry import model_registry
+
+
+class ScanError(Exception):
+    """Raised when the engine could not produce an analysis for a file."""
+
+
+# Ek scan ka input; framework/scan_mode model features mein jate hain.
+# lineage: same project ke uploads ka naam, incremental rescan ke liye (see blocks.py)
+ScanRequest = namedtuple(
+    "ScanRequest", ["file_path", "scan_mode", "framework", "progress", "lineage"],
+    defaults=["standard", None, None, None],
+)
+
+
+def _scan_error(e):
+    error = ScanError(str(e))
+    error.__cause__ = e
+    return error
+
+
+# ================== SCANNER ==================
+class Scanner:
+    """
+    Long-lived scan engine.
+
+    ``inprocess`` mode runs the static analysis directly inside the worker,
+    so numpy/joblib are imported once per process instead of once per
+    upload, and ``scan_batch`` scores many files with one model call.
+    ``subprocess`` mode keeps the old behaviour (fresh interpreter running
+    ``predict.py``) for when a crash or runaway scan must not take the worker
+    down with it.
+    """
+
+    INPROCESS = "inprocess"
+    SUBPROCESS = "subprocess"
+    MODES = (INPROCESS, SUBPROCESS)
+
+    # Seconds allowed per scan type (only enforced in subprocess mode)
+    TIMEOUTS = {"standard": 70, "deep": 150}
+
+    def __init__(self, mode=INPROCESS, workers=None, cache=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown scan mode: {mode}")
+        self.mode = mode
+        # Archive uploads ke liye process pool size (None = CPU count)
+        self.workers = workers
+        # Same content dobara scan nahi hota (see cache.py)
+        self.cache = cache if cache is not None else LRUScanCache()
+
+    def scan(self, file_path, scan_mode="standard", progress=None, framework=None, lineage=None):
+        """
+        Analyse ``file_path``. ``progress(bytes_scanned, bytes_total, rule_hits)``
+        is called while scanning (in-process mode only).
+        """
+        request = ScanRequest(file_path, scan_mode, framework, progress, lineage)
+        if self.mode == self.INPROCESS:
+            outcome = self.scan_batch([request])[0]
+            if isinstance(outcome, ScanError):
+                raise outcome
+            return outcome
+
+        try:
+            key = self._key(request, model_registry.version)
+        except OSError as e:
+            raise ScanError(str(e)) from e
+
+        cached = self.cache.get_many([key]).get(key)
+        if cached is not None:
+            return cached
+
+        result = self._scan_subprocess(file_path, scan_mode, framework)
+        # Engine ka error payload cache nahi karna
+        if "error" not in result.get("details", {}):
+            self.cache.set_many({key: result})
+        return result
+
+    def scan_batch(self, requests):
+        """
+        Analyse several files with a single model ``predict`` call.
+
+        ``requests`` are ``ScanRequest`` tuples. Returns one entry per
+        request: the result dict, or the ``ScanError`` that request hit.
+        """
+        if self.mode == self.SUBPROCESS:
+            # Har scan apne interpreter mein chalta hai, batching ka faida nahi
+            outcomes = []
+            for request in requests:
+                try:
+                    outcomes.append(self.scan(request.file_path, request.scan_mode, framework=request.framework))
+                except ScanError as e:
+                    outcomes.append(e)
+            return outcomes
+
+        version = model_registry.version
+        outcomes = [None] * len(requests)
+        keys = {}
+        for i, request in enumerate(requests):
+            try:
+                keys[i] = self._key(request, version)
+            except OSError as e:
+                outcomes[i] = _scan_error(e)
+        cached = self.cache.get_many(list(set(keys.values())))
+
+        # 1. Static analysis har file ki (cache miss wali)
+        pending = []
+        for i, key in keys.items():
+            if key in cached:
+                outcomes[i] = cached[key]
+                continue
+            request = requests[i]
+            try:
+                if request.progress is not None:
+                    # Scan ab shuru: "0 of N bytes" (batch mein har file apni baari par)
+                    request.progress(0, os.path.getsize(request.file_path), 0)
+                outcomes[i] = predict.static_analysis(
+                    request.file_path, workers=self.workers, cache=self.cache,
+                    progress=request.progress, lineage=request.lineage,
+                )
+            except Exception as e:
+                outcomes[i] = _scan_error(e)
+                continue
+            pending.append(i)
+
+        # 2. Model sirf ek dafa, poore batch par
+        encoder = get_encoder()
+        rows = [
+            feature_row(outcomes[i], requests[i].framework, requests[i].scan_mode, encoder)
+            for i in pending
+        ]
+        fresh = {}
+        for i, ml_pred in zip(pending, predict_batch(rows)):
+            result = apply_prediction(outcomes[i], ml_pred)
+            if "error" not in result.get("details", {}):
+                fresh[keys[i]] = result
+        if fresh:
+            self.cache.set_many(fresh)
+        return outcomes
+
+    def _key(self, request, model_version):
+        # Prediction framework/scan type par bhi depend karti hai
+        context = feature_context(request.framework, request.scan_mode)
+        return analysis_key(file_digest(request.file_path), model_version, context)
+
+    def _scan_subprocess(self, file_path, scan_mode, framework=None):
+        script_path = os.path.abspath(predict.__file__)
+        timeout = self.TIMEOUTS.get(scan_mode, self.TIMEOUTS["standard"])
+
+        try:
+            result = subprocess.run(
+                [sys.executable, script_path, file_path, scan_mode, framework or ""],
+                capture_output=True, text=True, timeout=timeout
+            )
+        except subprocess.TimeoutExpired as e:
+            raise ScanError(f"Scan timed out after {timeout}s") from e
+
+        if result.returncode != 0:
+            raise ScanError(result.stderr)
+
+        try:
+            return json.loads(result.stdout)
+        except ValueError as e:
+            raise ScanError(f"Invalid engine output: {result.stdout[:200]}") from e
+
+
+_scanners = {}
+_scanners_lock = threading.Lock()
+
+
+def get_scanner(mode=Scanner.INPROCESS, workers=None, cache=None):
+    """
+    Process-wide scanner instance for ``mode``/``workers``. ``cache`` is only
+    used when the instance is first created.
+    """
+    key = (mode, workers)
+    scanner = _scanners.get(key)
+    if scanner is None:
+        with _scanners_lock:
+            scanner = _scanners.get(key)
+            if scanner is None:
+                scanner = _scanners[key] = Scanner(mode, workers, cache)
+    return scanner
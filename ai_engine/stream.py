@@ -0,0 +1,122 @@
+"""
+Streaming rule scanner.
+
+Text is fed in fixed-size chunks and only a small overlap window is kept
+between them, so memory stays flat regardless of file size. A rule hit
+that straddles a chunk boundary is still found, because the tail of the
+previous chunk is rescanned together with the next one. Hits that were
+already counted are never counted twice.
+"""
+from collections import Counter
+
+from .rules import MATCHER, _rule_at
+
+CHUNK_SIZE = 256 * 1024
+
+# Rescanned tail per chunk. Hits longer than this that cross a boundary can
+# be missed (only possible for unbounded rules, e.g. huge whitespace runs).
+OVERLAP = 4096
+MIN_OVERLAP = 64
+
+# Chars of context kept before the resume point for lookbehind rules
+LOOKBEHIND = 1
+
+# Same line boundaries as str.splitlines()
+LINE_BREAKS = ("\n", "\r", "\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+
+# ================== RULE COUNTER ==================
+class RuleCounter:
+    """
+    Accumulates per-rule hit counts and the line count over a text stream.
+
+        counter = RuleCounter()
+        for chunk in chunks:
+            counter.feed(chunk)
+        counter.close()
+        counter.counts, counter.lines
+    """
+
+    def __init__(self, overlap=OVERLAP):
+        self.overlap = max(overlap, MIN_OVERLAP)
+        self.counts = Counter()
+        self.chars = 0
+        self._breaks = 0
+        self._last_char = ""
+        self._carry = ""
+        self._pos = 0
+        self._closed = False
+
+    @property
+    def hits(self):
+        """Total rule hits counted so far."""
+        return sum(self.counts.values())
+
+    @property
+    def lines(self):
+        if self._last_char and self._last_char not in LINE_BREAKS:
+            return self._breaks + 1
+        return self._breaks
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        if self._closed:
+            raise ValueError("feed() after close()")
+        self._count_lines(chunk)
+        self.chars += len(chunk)
+        self._scan(self._carry + chunk, final=False)
+
+    def close(self):
+        if not self._closed:
+            self._scan(self._carry, final=True)
+            self._carry = ""
+            self._closed = True
+        return self
+
+    def _count_lines(self, chunk):
+        breaks = sum(chunk.count(ch) for ch in LINE_BREAKS) - chunk.count("\r\n")
+        # "\r\n" split across two chunks is still one line break
+        if self._last_char == "\r" and chunk[0] == "\n":
+            breaks -= 1
+        self._breaks += breaks
+        self._last_char = chunk[-1]
+
+    def _scan(self, buf, final):
+        end = len(buf)
+        # Hits starting in the tail may still be incomplete (or a lookahead
+        # may still succeed), so they are left for the next window
+        safe_end = end if final else end - self.overlap
+        counts = self.counts
+        last_end = self._pos
+
+        for m in MATCHER.finditer(buf, self._pos):
+            if m.start() >= safe_end:
+                break
+            counts[_rule_at(buf, m.start(), end)] += 1
+            last_end = m.end()
+
+        if final:
+            return
+
+        resume = max(last_end, safe_end)
+        context_start = max(0, resume - LOOKBEHIND)
+        self._carry = buf[context_start:]
+        self._pos = resume - context_start
+
+
+def scan_stream(fileobj, chunk_size=CHUNK_SIZE, overlap=OVERLAP, on_chunk=None):
+    """
+    Scan a text file object chunk by chunk; returns the closed RuleCounter.
+    ``on_chunk(counter)`` is called after every chunk (progress reporting).
+    """
+    counter = RuleCounter(overlap=overlap)
+    read = fileobj.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        counter.feed(chunk)
+        if on_chunk is not None:
+            on_chunk(counter)
+    return counter.close()
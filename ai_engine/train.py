@@ -1,56 +1,26 @@
-<<<<<<< HEAD
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.ensemble import RandomForestRegressor
 import joblib
+import os
+import sys
 
-# Load dataset
-data = pd.read_csv("dataset/dataset.csv")
-
-# Encode categorical columns
-encoder = LabelEncoder()
-for col in ["compliance_framework", "scan_type"]:
-    data[col] = encoder.fit_transform(data[col])
-
-# Features & Target
-X = data.drop(["project_name", "description", "score"], axis=1)
-y = data["score"]
-
-# Train/Test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Model
-model = RandomForestRegressor(
-    n_estimators=200,
-    random_state=42
-)
-
-model.fit(X_train, y_train)
-
-# Save model
-joblib.dump(model, "model.pkl")
-
-print("✅ ESCC AI Model Trained Successfully")
-=======
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.ensemble import RandomForestRegressor
-import joblib
+# Script hai: ai_engine package ko importable banao
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai_engine.feature_extractor import ENCODED_COLUMNS, FEATURE_COLUMNS, FeatureEncoder
 
 # Load dataset
 data = pd.read_csv("dataset/dataset.csv")
 
-# Encode categorical columns
-encoder = LabelEncoder()
-for col in ["compliance_framework", "scan_type"]:
-    data[col] = encoder.fit_transform(data[col])
+# Encode categorical columns (har column ka apna encoder, predict time par wahi chahiye)
+encoders = {}
+for col in ENCODED_COLUMNS:
+    encoders[col] = LabelEncoder()
+    data[col] = encoders[col].fit_transform(data[col])
 
-# Features & Target
-X = data.drop(["project_name", "description", "score"], axis=1)
+# Features & Target (same order predict.py feed karta hai)
+X = data[FEATURE_COLUMNS]
 y = data["score"]
 
 # Train/Test split
@@ -68,6 +38,6 @@ model.fit(X_train, y_train)
 
 # Save model
 joblib.dump(model, "model.pkl")
+FeatureEncoder.from_label_encoders(encoders).save("encoders.json")
 
 print("✅ ESCC AI Model Trained Successfully")
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
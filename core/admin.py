@@ -1,9 +1,10 @@
-<<<<<<< HEAD
 from django.contrib import admin
+from .stats import rebuild_stats_on_commit
 from .models import (
     User,
     Project,
     ScanResult,
+    ScanJob,
     Framework,
     Stats,
     IssueCategory,
@@ -16,6 +17,8 @@ from .models import (
     SupportResource,
     ReleaseNote,
     ContactMessage,
+    OutboundEmail,
+    WebhookDelivery,
     # ===== New Reports Models =====
     Report,
     Issue,
@@ -44,173 +47,38 @@ class ProjectAdmin(admin.ModelAdmin):
 # =================== SCAN RESULT ===================
 @admin.register(ScanResult)
 class ScanResultAdmin(admin.ModelAdmin):
-    list_display = ("project", "ethical_score", "security_score", "scanned_at")
+    list_display = ("project", "ethical_score", "security_score", "critical", "high", "medium", "scanned_at")
     search_fields = ("project__name",)
     list_filter = ("project", "scanned_at")
-    readonly_fields = ("scanned_at",)
+    readonly_fields = ("scanned_at", "critical", "high", "medium", "total_issues", "lines_analyzed")
     ordering = ("-scanned_at",)
 
-# =================== FRAMEWORK ===================
-@admin.register(Framework)
-class FrameworkAdmin(admin.ModelAdmin):
-    list_display = ("title", "value")
-    search_fields = ("title",)
-
-# =================== STATS ===================
-@admin.register(Stats)
-class StatsAdmin(admin.ModelAdmin):
-    list_display = (
-        "projects_scanned",
-        "issues_detected",
-        "compliance_score",
-        "ethical_score",
-        "cybersecurity_score",
-        "ethical_issues",
-        "security_weaknesses",
-    )
-
-# =================== ISSUE CATEGORY ===================
-@admin.register(IssueCategory)
-class IssueCategoryAdmin(admin.ModelAdmin):
-    list_display = ('category_name', 'issue_count')
-
-# =================== COMPLIANCE TREND ===================
-@admin.register(ComplianceTrend)
-class ComplianceTrendAdmin(admin.ModelAdmin):
-    list_display = ("month", "score")
-    list_filter = ("month",)
-
-# =================== FRAMEWORK COMPLIANCE ===================
-@admin.register(FrameworkCompliance)
-class FrameworkComplianceAdmin(admin.ModelAdmin):
-    list_display = ("framework", "score")
-
-# =================== HELP CENTER MODELS ===================
-@admin.register(HelpHero)
-class HelpHeroAdmin(admin.ModelAdmin):
-    list_display = ("title", "subtitle")
-    fields = ("title", "subtitle", "search_placeholder", "quick_buttons")
-
-@admin.register(Documentation)
-class DocumentationAdmin(admin.ModelAdmin):
-    list_display = ("title", "description", "order")
-    list_editable = ("order",)
-    ordering = ("order",)
-
-@admin.register(FAQ)
-class FAQAdmin(admin.ModelAdmin):
-    list_display = ("question", "order")
-    list_editable = ("order",)
-    ordering = ("order",)
-
-@admin.register(SupportResource)
-class SupportResourceAdmin(admin.ModelAdmin):
-    list_display = ("title", "order")
-    list_editable = ("order",)
-    ordering = ("order",)
-
-@admin.register(ReleaseNote)
-class ReleaseNoteAdmin(admin.ModelAdmin):
-    list_display = ("title", "release_date", "order")
-    list_editable = ("order",)
-    ordering = ("-release_date", "order")
-
-@admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
-    list_display = ("user", "subject", "created_at", "is_read")
-    list_filter = ("is_read", "created_at")
-    search_fields = ("user__username", "subject", "message")
-    readonly_fields = ("created_at",)
-    ordering = ("-created_at",)
-
-# =================== REPORTS MODELS ===================
-@admin.register(Report)
-class ReportAdmin(admin.ModelAdmin):
-    list_display = ("title", "report_id", "compliance_score", "total_issues", "generated_at")
-    search_fields = ("title", "report_id")
-    readonly_fields = ("generated_at",)
-    ordering = ("-generated_at",)
-
-@admin.register(Issue)
-class IssueAdmin(admin.ModelAdmin):
-    list_display = ("title", "level", "report")
-    list_filter = ("level",)
-    search_fields = ("title", "report__title")
-
-@admin.register(Progress)
-class ProgressAdmin(admin.ModelAdmin):
-    list_display = ("framework", "value", "report")
-    list_filter = ("framework",)
-    search_fields = ("framework", "report__title")
-
-@admin.register(HistoricalReport)
-class HistoricalReportAdmin(admin.ModelAdmin):
-    list_display = ("date", "score", "report")
-    search_fields = ("report__title",)
-
-@admin.register(Recommendation)
-class RecommendationAdmin(admin.ModelAdmin):
-    list_display = ("text", "report")
-    search_fields = ("text", "report__title")
-
-
-
-from .models import GuestContactMessage
-
-@admin.register(GuestContactMessage)
-class GuestContactAdmin(admin.ModelAdmin):
-    list_display = ('name', 'email', 'subject', 'created_at', 'is_read')
-=======
-from django.contrib import admin
-from .models import (
-    User,
-    Project,
-    ScanResult,
-    Framework,
-    Stats,
-    IssueCategory,
-    ComplianceTrend,
-    FrameworkCompliance,
-    # Help Center Models
-    HelpHero,
-    Documentation,
-    FAQ,
-    SupportResource,
-    ReleaseNote,
-    ContactMessage,
-    # ===== New Reports Models =====
-    Report,
-    Issue,
-    Progress,
-    HistoricalReport,
-    Recommendation,
-)
-
-# =================== USER ===================
-@admin.register(User)
-class UserAdmin(admin.ModelAdmin):
-    list_display = ("username", "email", "role", "is_staff", "is_active", "date_joined")
-    search_fields = ("username", "email")
-    list_filter = ("role", "is_staff", "is_active")
-
-# =================== PROJECT ===================
-@admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
-    # 'framework' ko yahan shamil karein
-    list_display = ("name", "uploaded_by", "framework", "status", "uploaded_at") 
-    search_fields = ("name", "uploaded_by__username", "framework")
-    list_filter = ("status", "uploaded_at", "framework")
-    readonly_fields = ("uploaded_at",)
-    ordering = ("-uploaded_at",)
-
-# =================== SCAN RESULT ===================
-@admin.register(ScanResult)
-class ScanResultAdmin(admin.ModelAdmin):
-    list_display = ("project", "ethical_score", "security_score", "scanned_at")
+    # Admin edit / delete ke baad user ka dashboard rollup dobara
+    def save_model(self, request, obj, form, change):
+        previous_owner = None
+        if change:
+            previous_owner = ScanResult.objects.filter(pk=obj.pk).values_list("project__uploaded_by_id", flat=True).first()
+        super().save_model(request, obj, form, change)
+        rebuild_stats_on_commit([previous_owner, obj.project.uploaded_by_id])
+
+    def delete_model(self, request, obj):
+        owner = obj.project.uploaded_by_id
+        super().delete_model(request, obj)
+        rebuild_stats_on_commit([owner])
+
+    def delete_queryset(self, request, queryset):
+        owners = list(queryset.values_list("project__uploaded_by_id", flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        rebuild_stats_on_commit(owners)
+
+# =================== SCAN JOB ===================
+@admin.register(ScanJob)
+class ScanJobAdmin(admin.ModelAdmin):
+    list_display = ("project", "scan_mode", "status", "attempts", "worker", "created_at", "finished_at")
     search_fields = ("project__name",)
-    list_filter = ("project", "scanned_at")
-    readonly_fields = ("scanned_at",)
-    ordering = ("-scanned_at",)
+    list_filter = ("status", "scan_mode")
+    readonly_fields = ("created_at", "started_at", "finished_at", "heartbeat_at")
+    ordering = ("-id",)
 
 # =================== FRAMEWORK ===================
 @admin.register(Framework)
@@ -222,6 +90,7 @@ class FrameworkAdmin(admin.ModelAdmin):
 @admin.register(Stats)
 class StatsAdmin(admin.ModelAdmin):
     list_display = (
+        "user",
         "projects_scanned",
         "issues_detected",
         "compliance_score",
@@ -229,7 +98,9 @@ class StatsAdmin(admin.ModelAdmin):
         "cybersecurity_score",
         "ethical_issues",
         "security_weaknesses",
+        "updated_at",
     )
+    list_select_related = ("user",)
 
 # =================== ISSUE CATEGORY ===================
 @admin.register(IssueCategory)
@@ -239,8 +110,8 @@ class IssueCategoryAdmin(admin.ModelAdmin):
 # =================== COMPLIANCE TREND ===================
 @admin.register(ComplianceTrend)
 class ComplianceTrendAdmin(admin.ModelAdmin):
-    list_display = ("month", "score")
-    list_filter = ("month",)
+    list_display = ("user", "month", "score", "recorded_at")
+    list_filter = ("recorded_at",)
 
 # =================== FRAMEWORK COMPLIANCE ===================
 @admin.register(FrameworkCompliance)
@@ -285,6 +156,22 @@ class ContactMessageAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at",)
     ordering = ("-created_at",)
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "last_error")
+    readonly_fields = ("created_at", "sent_at", "claimed_at")
+    ordering = ("-id",)
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ("event", "url", "user", "status", "attempts", "response_status", "next_attempt_at", "delivered_at")
+    list_filter = ("status", "event")
+    search_fields = ("url", "user__email", "last_error")
+    readonly_fields = ("created_at", "delivered_at", "claimed_at")
+    ordering = ("-id",)
+
 # =================== REPORTS MODELS ===================
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
@@ -322,5 +209,4 @@ from .models import GuestContactMessage
 @admin.register(GuestContactMessage)
 class GuestContactAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'subject', 'created_at', 'is_read')
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
     list_filter = ('is_read', 'created_at')
\ No newline at end of file
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Signal receivers register karna (cache invalidation etc.)
+        from . import signals  # noqa: F401
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication
+
+from .models import ApiIntegration, User
+
+API_KEY_KEYWORD = "Api-Key"
+API_KEY_HEADER = "X-API-Key"
+
+
+class TTLCache:
+    """
+    Chhota in-process cache: har entry ``ttl`` seconds tak, ``maxsize`` se
+    zyada hon toh sabse purani nikal jati hai (LRU). Thread-safe.
+    """
+
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard_where(self, predicate):
+        with self._lock:
+            for key in [key for key, (value, _) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# key hash -> UserSnapshot (ya None: anjaan key, taake galat keys bhi DB par na jayein)
+_key_cache = TTLCache(settings.API_KEY_CACHE_SECONDS, settings.API_KEY_CACHE_SIZE)
+
+
+class UserSnapshot:
+    """
+    User ki field values (tuple, badal nahi sakti). Cache mein model instance
+    nahi rakhte: ek request ka kiya hua badlaav baaki parallel requests ko
+    dikh jata. Har request ``to_user()`` se apna naya instance banati hai.
+    """
+
+    __slots__ = ("user_id", "db", "attnames", "values")
+
+    def __init__(self, user):
+        self.user_id = user.pk
+        self.db = user._state.db
+        self.attnames = tuple(field.attname for field in User._meta.concrete_fields)
+        self.values = tuple(getattr(user, attname) for attname in self.attnames)
+
+    def to_user(self):
+        return User.from_db(self.db, self.attnames, self.values)
+
+
+def invalidate_user(user_id):
+    """Is user ki cached keys nikaalna (regenerate, user/integration save ya delete)."""
+    _key_cache.discard_where(lambda snapshot: snapshot is not None and snapshot.user_id == user_id)
+
+
+def get_raw_key(request):
+    header = request.headers.get("Authorization", "")
+    parts = header.split()
+    if len(parts) == 2 and parts[0] == API_KEY_KEYWORD:
+        return parts[1]
+    return request.headers.get(API_KEY_HEADER, "").strip() or None
+
+
+class ApiKeyAuthentication(BaseAuthentication):
+    """
+    ``Authorization: Api-Key sk_live_...`` (ya ``X-API-Key`` header) for CI
+    uploads. Lookup key ke SHA-256 se, in-process TTL cache ke through:
+    cache hit par koi DB query nahi. Doosre worker processes mein purani key
+    zyada se zyada API_KEY_CACHE_SECONDS tak chal sakti hai.
+    """
+
+    def authenticate(self, request):
+        raw_key = get_raw_key(request)
+        if raw_key is None:
+            return None
+        if not raw_key.startswith(ApiIntegration.API_KEY_PREFIX):
+            raise exceptions.AuthenticationFailed("Invalid API key.")
+
+        key_hash = ApiIntegration.hash_key(raw_key)
+        missing = object()
+        snapshot = _key_cache.get(key_hash, missing)
+        if snapshot is missing:
+            integration = (
+                ApiIntegration.objects.select_related("user")
+                .filter(api_key_hash=key_hash)
+                .first()
+            )
+            snapshot = UserSnapshot(integration.user) if integration else None
+            _key_cache.set(key_hash, snapshot)
+
+        if snapshot is None:
+            raise exceptions.AuthenticationFailed("Invalid API key.")
+        user = snapshot.to_user()
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("Invalid API key.")
+        return user, key_hash
+
+    def authenticate_header(self, request):
+        return API_KEY_KEYWORD
@@ -0,0 +1,67 @@
+import hashlib
+import html
+import re
+
+from django.template import Context, Template, engines
+from django.utils.html import strip_tags
+
+# <style>/<head> ka text plain version mein nahi chahiye (strip_tags sirf tags hatata hai)
+INVISIBLE_RE = re.compile(r"<(style|script|head)\b.*?</\1>", re.IGNORECASE | re.DOTALL)
+# Block tags / <br> ki jagah newline, table cell ke baad space (warna "Score:80")
+LINE_BREAK_RE = re.compile(r"<br\s*/?>|</(p|div|tr|li|table|h[1-6])>", re.IGNORECASE)
+CELL_END_RE = re.compile(r"</t[dh]>", re.IGNORECASE)
+BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+# template name -> (source hash, compiled plain-text Template); har naam ka sirf
+# latest version, taake template badalte rehne par dict na badhe
+_text_templates = {}
+
+
+def _html_template(name):
+    """
+    Compiled HTML template. Django ka engine cached loader use karta hai
+    (Django 4.1+ mein default), toh file ek hi dafa parse hoti hai.
+    """
+    return engines["django"].get_template(name).template
+
+
+def text_source(source):
+    """HTML template source -> plain-text template source (template tags bache rehte hain)."""
+    text = INVISIBLE_RE.sub("", source)
+    text = CELL_END_RE.sub(" ", LINE_BREAK_RE.sub("\n", text))
+    text = strip_tags(text)
+    text = "\n".join(line.strip() for line in html.unescape(text).splitlines())
+    text = BLANK_LINES_RE.sub("\n\n", text).strip()
+    # Plain text mein HTML escaping nahi ("O'Brien" ko &#x27; nahi banana)
+    return "{% autoescape off %}" + text + "{% endautoescape %}\n"
+
+
+def _text_template(name, html_template):
+    """
+    Plain-text alternative har template version ke liye ek dafa compile
+    hota hai; version = source ka hash (template badle toh naya).
+    """
+    version = hashlib.sha256(html_template.source.encode("utf-8")).hexdigest()[:16]
+    cached_version, template = _text_templates.get(name, (None, None))
+    if cached_version != version:
+        template = Template(text_source(html_template.source), engine=html_template.engine)
+        _text_templates[name] = (version, template)
+    return template
+
+
+def render_email(name, context):
+    """``(html, text)`` for one email."""
+    html_template = _html_template(name)
+    text_template = _text_template(name, html_template)
+    return html_template.render(Context(context)), text_template.render(Context(context))
+
+
+def render_many(name, contexts):
+    """
+    Bulk rendering: template lookup ek dafa, phir har context sirf render
+    hota hai. Yields ``(html, text)`` in the same order.
+    """
+    html_template = _html_template(name)
+    text_template = _text_template(name, html_template)
+    for context in contexts:
+        yield html_template.render(Context(context)), text_template.render(Context(context))
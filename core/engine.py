@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ai_engine import get_scanner
+from ai_engine.cache import LRUScanCache
+
+from .models import ScanCacheEntry
+
+
+# ================== DATABASE SCAN CACHE ==================
+class DatabaseScanCache:
+    """
+    Scan cache stored in ``ScanCacheEntry`` so every web/worker process
+    shares it. Size-bounded: once it grows past ``max_entries`` the least
+    recently used rows are deleted.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or settings.AI_ENGINE_CACHE_MAX_ENTRIES
+
+    def get_many(self, keys):
+        if not keys:
+            return {}
+        found = dict(ScanCacheEntry.objects.filter(key__in=keys).values_list("key", "value"))
+        if found:
+            ScanCacheEntry.objects.filter(key__in=list(found)).update(last_used_at=timezone.now())
+        return found
+
+    def set_many(self, items):
+        if not items:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            ScanCacheEntry.objects.bulk_create(
+                [ScanCacheEntry(key=key, value=value, last_used_at=now) for key, value in items.items()],
+                update_conflicts=True,
+                unique_fields=["key"],
+                update_fields=["value", "last_used_at"],
+            )
+        self.evict()
+
+    def evict(self):
+        overflow = ScanCacheEntry.objects.count() - self.max_entries
+        if overflow > 0:
+            stale = ScanCacheEntry.objects.order_by("last_used_at").values_list("id", flat=True)[:overflow]
+            ScanCacheEntry.objects.filter(id__in=list(stale)).delete()
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+
+def build_scan_cache():
+    """Cache backend from ``settings.AI_ENGINE_CACHE`` ("database" / "memory")."""
+    if settings.AI_ENGINE_CACHE == "database":
+        return DatabaseScanCache()
+    return LRUScanCache(max_entries=settings.AI_ENGINE_CACHE_MAX_ENTRIES)
+
+
+def get_engine():
+    """Process-wide Scanner configured from the AI_ENGINE_* settings."""
+    return get_scanner(settings.AI_ENGINE_MODE, settings.AI_ENGINE_WORKERS, build_scan_cache())
@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import json
+import secrets
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .authentication import ApiKeyAuthentication
+from .models import ScanJob, ScanResult, StreamTicket
+
+# Browser EventSource ko reconnect se pehle kitna rukna hai (ms)
+RETRY_MS = 3000
+KEEPALIVE_SECONDS = 15
+# Connect hone se pehle khatam hui jobs bhi ek dafa bhej do
+RECENT_SECONDS = 60
+FINAL_EVENTS = {ScanJob.DONE: "completed", ScanJob.FAILED: "failed"}
+
+
+# ================== TICKETS ==================
+def _hash_ticket(raw_ticket):
+    return hashlib.sha256(raw_ticket.encode("utf-8")).hexdigest()
+
+
+def issue_ticket(user):
+    """Naya stream ticket (raw value sirf response mein, DB mein hash)."""
+    now = timezone.now()
+    # Purane (expired) tickets yahin saaf
+    StreamTicket.objects.filter(expires_at__lt=now).delete()
+    raw_ticket = secrets.token_urlsafe(32)
+    StreamTicket.objects.create(
+        ticket_hash=_hash_ticket(raw_ticket),
+        user=user,
+        expires_at=now + timedelta(seconds=settings.SCAN_EVENTS_TICKET_SECONDS),
+    )
+    return raw_ticket
+
+
+def redeem_ticket(raw_ticket):
+    """Ticket ka user, ya None. Delete karke: doosri dafa (ya replay par) kaam nahi karta."""
+    ticket = (
+        StreamTicket.objects.select_related("user")
+        .filter(ticket_hash=_hash_ticket(raw_ticket), expires_at__gt=timezone.now())
+        .first()
+    )
+    if ticket is None:
+        return None
+    # Do requests ek saath aayein toh sirf ek ka delete 1 row hatata hai
+    deleted, _ = StreamTicket.objects.filter(pk=ticket.pk).delete()
+    if not deleted or not ticket.user.is_active:
+        return None
+    return ticket.user
+
+
+class ScanEventsTicketAPIView(APIView):
+    """
+    POST /api/projects/events/ticket/ — EventSource ke liye ek-baar wala
+    ticket (JWT, API key ya session se). Phir
+    ``GET /api/projects/events/?ticket=<ticket>``.
+    """
+
+    def post(self, request):
+        return Response({
+            "ticket": issue_ticket(request.user),
+            "expires_in": settings.SCAN_EVENTS_TICKET_SECONDS,
+        }, status=status.HTTP_201_CREATED)
+
+
+# ================== AUTH ==================
+def _authenticate_headers(request):
+    """Headers bhej sakne wale clients: JWT ya API key (CI)."""
+    for authenticator in (JWTAuthentication(), ApiKeyAuthentication()):
+        try:
+            result = authenticator.authenticate(request)
+        except (exceptions.AuthenticationFailed, InvalidToken, TokenError):
+            return None
+        if result is not None:
+            return result[0]
+    return None
+
+
+async def _authenticate(request):
+    """
+    ``?ticket=`` (browser EventSource), warna Authorization / X-API-Key
+    header, phir session. URL mein JWT nahi liya jata.
+    """
+    raw_ticket = request.GET.get("ticket")
+    if raw_ticket:
+        return await sync_to_async(redeem_ticket)(raw_ticket)
+
+    user = await sync_to_async(_authenticate_headers)(request)
+    if user is not None:
+        return user
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+# ================== PAYLOAD ==================
+def _progress(job):
+    percent = 0
+    if job.status == ScanJob.DONE:
+        # Cache hit par bytes count hi nahi hote
+        percent = 100
+    elif job.bytes_total:
+        percent = min(100, int(job.bytes_scanned * 100 / job.bytes_total))
+    return {
+        "job": job.id,
+        "project": job.project_id,
+        "project_name": job.project.name,
+        "scan_mode": job.scan_mode,
+        "status": job.status,
+        "bytes_scanned": job.bytes_scanned,
+        "bytes_total": job.bytes_total,
+        "rules_hit": job.rules_hit,
+        "percent": percent,
+    }
+
+
+def _final(job):
+    data = _progress(job)
+    if job.status == ScanJob.FAILED:
+        data["error"] = job.error
+        return data
+
+    scan = ScanResult.objects.filter(project_id=job.project_id).order_by("-scanned_at").first()
+    if scan:
+        details = scan.details.get("details", {}) if isinstance(scan.details, dict) else {}
+        data.update({
+            "ethical_score": scan.ethical_score,
+            "security_score": scan.security_score,
+            "critical": details.get("critical", 0),
+            "high": details.get("high", 0),
+            "medium": details.get("medium", 0),
+            "total_issues": details.get("total_issues", 0),
+        })
+    return data
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+# ================== STREAM ==================
+class _Poller:
+    """Ek stream ka state; ``poll()`` naye events deta hai (sync ORM)."""
+
+    def __init__(self, user, project_id):
+        self.user = user
+        self.project_id = project_id
+        self.since = timezone.now() - timedelta(seconds=RECENT_SECONDS)
+        self.deadline = time.monotonic() + settings.SCAN_EVENTS_MAX_SECONDS
+        self.last_write = time.monotonic()
+        self.sent = {}
+
+    def alive(self):
+        return time.monotonic() < self.deadline
+
+    def poll(self):
+        events = []
+        jobs = ScanJob.objects.filter(project__uploaded_by=self.user).filter(
+            Q(status__in=[ScanJob.QUEUED, ScanJob.RUNNING]) | Q(finished_at__gte=self.since)
+        )
+        if self.project_id:
+            jobs = jobs.filter(project_id=self.project_id)
+
+        for job in jobs.select_related("project").order_by("id"):
+            state = (job.status, job.bytes_scanned, job.rules_hit)
+            if self.sent.get(job.id) == state:
+                continue
+            self.sent[job.id] = state
+
+            if job.status in FINAL_EVENTS:
+                events.append(_event(FINAL_EVENTS[job.status], _final(job)))
+            else:
+                events.append(_event("progress", _progress(job)))
+
+        if events:
+            self.last_write = time.monotonic()
+        elif time.monotonic() - self.last_write >= KEEPALIVE_SECONDS:
+            # Comment line: proxies connection band na karein
+            events.append(": keepalive\n\n")
+            self.last_write = time.monotonic()
+        return events
+
+
+async def _async_stream(poller):
+    yield f"retry: {RETRY_MS}\n\n"
+    while poller.alive():
+        for event in await sync_to_async(poller.poll)():
+            yield event
+        await asyncio.sleep(settings.SCAN_EVENTS_POLL_SECONDS)
+
+
+def _sync_stream(poller):
+    # WSGI: Django async iterator ko poora padh kar hi bhejta hai, is liye
+    # yahan sync generator (har event turant jata hai, par worker thread
+    # stream khatam hone tak ruka rehta hai)
+    yield f"retry: {RETRY_MS}\n\n"
+    while poller.alive():
+        yield from poller.poll()
+        time.sleep(settings.SCAN_EVENTS_POLL_SECONDS)
+
+
+async def scan_events(request):
+    """
+    GET /api/projects/events/ — Server-Sent Events stream.
+
+    Har scan job ke liye ``progress`` (queued/running, bytes scanned, rules
+    hit) aur aakhir mein ``completed``/``failed`` (final scores) bhejta hai.
+    ``?project=<id>`` se sirf ek project. Ek connection list polling ki
+    jagah le leta hai; server SCAN_EVENTS_MAX_SECONDS baad band karta hai
+    aur EventSource khud reconnect kar leta hai (naya ticket le kar).
+    """
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    project_id = request.GET.get("project")
+    if project_id and not project_id.isdigit():
+        return JsonResponse({"detail": "Invalid project id."}, status=400)
+
+    poller = _Poller(user, project_id)
+    if isinstance(request, ASGIRequest):
+        stream = _async_stream(poller)
+    else:
+        stream = _sync_stream(poller)
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Nginx buffering band, warna events ruk ke aate hain
+    response["X-Accel-Buffering"] = "no"
+    return response
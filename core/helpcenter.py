@@ -0,0 +1,62 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import FAQ, Documentation, HelpHero, ReleaseNote, SupportResource
+from .serializers import (
+    DocumentationSerializer, FAQSerializer, HelpHeroSerializer,
+    ReleaseNoteSerializer, SupportResourceSerializer,
+)
+
+# Inme se kuch bhi save/delete ho toh cache version badal jata hai (core/signals.py)
+HELP_CENTER_MODELS = (HelpHero, Documentation, FAQ, SupportResource, ReleaseNote)
+
+VERSION_KEY = "helpcenter:version"
+
+
+def _cache():
+    return caches[settings.HELP_CENTER_CACHE]
+
+
+# ================== VERSION ==================
+def current_version():
+    """
+    Content version token (ETag bhi yahi). Cache mein rehta hai, taake
+    file backend par sab worker processes ek hi version dekhein.
+    """
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """Naya version: purana payload key ab kabhi nahi padha jayega (timeout par khud nikal jata hai)."""
+    _cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+# ================== PAYLOAD ==================
+def build_payload():
+    hero = HelpHero.objects.first()
+    return {
+        "hero": HelpHeroSerializer(hero).data if hero else {},
+        "documentation": DocumentationSerializer(Documentation.objects.all(), many=True).data,
+        "faq": FAQSerializer(FAQ.objects.all(), many=True).data,
+        "support": SupportResourceSerializer(SupportResource.objects.all(), many=True).data,
+        "releases": ReleaseNoteSerializer(ReleaseNote.objects.all(), many=True).data,
+    }
+
+
+def get_payload(version=None):
+    """``(version, payload)``: cache hit par koi DB query nahi."""
+    version = version or current_version()
+    cache = _cache()
+    key = f"helpcenter:payload:{version}"
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_payload()
+        cache.set(key, payload, settings.HELP_CENTER_CACHE_TIMEOUT)
+    return version, payload
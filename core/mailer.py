@@ -0,0 +1,184 @@
+import logging
+import smtplib
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+# Inka dobara bhejna bekaar hai (address hi galat hai)
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused,)
+
+
+# ================== QUEUE ==================
+def _outbound(subject, body, to, html_body="", from_email=None):
+    return OutboundEmail(
+        subject=subject[:300],
+        body=body,
+        html_body=html_body or "",
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[address for address in to if address],
+    )
+
+
+def queue_email(subject, body, to, html_body="", from_email=None):
+    """
+    ``send_mail`` ki jagah: outbox mein row, SMTP ka intezar nahi. Caller ki
+    transaction ke saath commit hoti hai (rollback par email bhi gayab).
+    """
+    email = _outbound(subject, body, to, html_body, from_email)
+    email.save()
+    return email
+
+
+def queue_emails(messages, batch_size=500):
+    """
+    Bulk version: ``messages`` is an iterable of ``queue_email`` kwargs.
+    ``batch_size`` rows per INSERT. Returns number queued.
+    """
+    queued, batch = 0, []
+    for message in messages:
+        batch.append(_outbound(**message))
+        if len(batch) >= batch_size:
+            OutboundEmail.objects.bulk_create(batch)
+            queued, batch = queued + len(batch), []
+    if batch:
+        OutboundEmail.objects.bulk_create(batch)
+        queued += len(batch)
+    return queued
+
+
+# ================== CLAIM ==================
+def claim_emails(limit):
+    """Due emails ko ``sending`` mein le jana (claim_jobs wala tareeqa)."""
+    token = uuid.uuid4().hex
+    now = timezone.now()
+
+    with transaction.atomic():
+        due = OutboundEmail.objects.filter(
+            status=OutboundEmail.QUEUED, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("id", flat=True)[:limit])
+        if not ids:
+            return []
+        OutboundEmail.objects.filter(id__in=ids, status=OutboundEmail.QUEUED).update(
+            status=OutboundEmail.SENDING, claim_token=token, claimed_at=now
+        )
+    return list(OutboundEmail.objects.filter(claim_token=token).order_by("id"))
+
+
+def requeue_stale_emails():
+    """Sender process beech mein mar gaya: ``sending`` wali emails wapas queue mein."""
+    cutoff = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    return OutboundEmail.objects.filter(status=OutboundEmail.SENDING, claimed_at__lt=cutoff).update(
+        status=OutboundEmail.QUEUED, claim_token=""
+    )
+
+
+# ================== SEND ==================
+def open_connection():
+    """Ek SMTP (ya file/locmem) connection, poore batch ke liye."""
+    mail_connection = get_connection(fail_silently=False)
+    mail_connection.open()
+    return mail_connection
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base ... EMAIL_OUTBOX_RETRY_MAX_SECONDS tak."""
+    delay = settings.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _message(email, mail_connection):
+    message = EmailMultiAlternatives(
+        email.subject, email.body, email.from_email, email.to, connection=mail_connection
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def _mark_sent(email):
+    OutboundEmail.objects.filter(pk=email.pk).update(
+        status=OutboundEmail.SENT, attempts=email.attempts + 1, sent_at=timezone.now(),
+        last_error="", claim_token="",
+    )
+
+
+def _mark_failed(email, error, permanent=False):
+    attempts = email.attempts + 1
+    if permanent or attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        status, next_attempt_at = OutboundEmail.FAILED, timezone.now()
+        logger.error("Email %s failed after %s attempts: %s", email.pk, attempts, error)
+    else:
+        status, next_attempt_at = OutboundEmail.QUEUED, timezone.now() + retry_delay(attempts)
+    OutboundEmail.objects.filter(pk=email.pk).update(
+        status=status, attempts=attempts, last_error=str(error)[:1000],
+        next_attempt_at=next_attempt_at, claim_token="",
+    )
+
+
+def deliver(emails, mail_connection=None):
+    """
+    Claimed emails ko ek hi connection par bhejna. Send fail ho toh wo email
+    retry/backoff par aur agli email naya connection kholti hai. Returns
+    ``(sent count, connection)``: caller agle batch ke liye connection rakh
+    sakta hai (None matlab band ho gaya).
+    """
+    sent = 0
+    for index, email in enumerate(emails):
+        if mail_connection is None:
+            try:
+                mail_connection = open_connection()
+            except Exception as e:
+                # Server hi nahi mil raha: poora baqi batch baad mein
+                for pending in emails[index:]:
+                    _mark_failed(pending, e)
+                return sent, None
+        try:
+            _message(email, mail_connection).send()
+        except PERMANENT_ERRORS as e:
+            _mark_failed(email, e, permanent=True)
+            continue
+        except Exception as e:
+            # Connection ka bharosa nahi: band karo, agli email naya kholegi
+            _mark_failed(email, e)
+            close_connection(mail_connection)
+            mail_connection = None
+            continue
+        _mark_sent(email)
+        sent += 1
+    return sent, mail_connection
+
+
+def close_connection(mail_connection):
+    if mail_connection is None:
+        return
+    try:
+        mail_connection.close()
+    except Exception:
+        pass
+
+
+def send_queued(limit=None):
+    """Queue ek dafa khali karna (mailworker --once aur shell ke liye). Returns sent count."""
+    limit = limit or settings.EMAIL_OUTBOX_BATCH_SIZE
+    requeue_stale_emails()
+    total, mail_connection = 0, None
+    try:
+        while True:
+            emails = claim_emails(limit)
+            if not emails:
+                return total
+            sent, mail_connection = deliver(emails, mail_connection)
+            total += sent
+    finally:
+        close_connection(mail_connection)
@@ -0,0 +1,231 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+from core.models import ComplianceTrend, Project, ScanResult
+
+User = get_user_model()
+
+BENCH_PREFIX = "bench-idx-"
+SEED_BATCH_SIZE = 5000
+# Write cost: itni uploads (project + scan + trend) insert karke rollback
+WRITE_SAMPLE_ROWS = 20000
+
+# Jaanchne wale indexes, sirf benchmark ke dauran bante hain (schema mein nahi).
+# Migration 0008 mein the; 1M rows par faida nahi dikha, 0018 ne hata diye.
+CANDIDATE_INDEXES = [
+    (Project, models.Index(fields=['uploaded_by', '-id'], name='bench_project_user_recent_idx')),
+    (ScanResult, models.Index(fields=['project', '-scanned_at'], name='bench_scan_project_recent_idx')),
+    (ComplianceTrend, models.Index(fields=['user', 'id'], name='bench_trend_user_id_idx')),
+]
+
+
+def _hot_queries(user, alias):
+    """Wahi queries jo dashboard / list APIs har request par chalati hain."""
+    return {
+        "projects (uploaded_by, -id)": Project.objects.using(alias).filter(uploaded_by=user)
+        .order_by('-id').values_list('id', flat=True)[:20],
+        "latest scans (project, -scanned_at)": ScanResult.objects.using(alias).filter(project__uploaded_by=user)
+        .order_by('project_id', '-scanned_at').values_list('id', 'ethical_score'),
+        "trend (user, id)": ComplianceTrend.objects.using(alias).filter(user=user)
+        .order_by('id').values_list('id', 'score'),
+    }
+
+
+def is_scratch_database(alias):
+    """
+    Django ka test DB ("test_...") ya in-memory SQLite. DEBUG kaafi nahi:
+    galti se DEBUG=True deploy par asli DB mein rows seed ho jati.
+    """
+    name = str(connections[alias].settings_dict.get("NAME") or "")
+    return name.startswith("test_") or name == ":memory:" or "mode=memory" in name
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database with N scans and time the hot per-user queries "
+        "and the insert cost with and without the candidate composite indexes "
+        "(created for the run, dropped afterwards). Outside a test DB it needs "
+        "--database and --i-know-this-is-scratch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default=None,
+            help="Database alias to benchmark (a scratch copy, never production).",
+        )
+        parser.add_argument(
+            "--i-know-this-is-scratch", action="store_true", dest="confirmed",
+            help="Confirm --database is a scratch copy: 1M rows are seeded and indexes built on it.",
+        )
+        parser.add_argument("--scans", type=int, default=1_000_000, help="ScanResult rows to seed.")
+        parser.add_argument("--users", type=int, default=1000, help="Users the scans are spread over.")
+        parser.add_argument("--scans-per-project", type=int, default=4)
+        parser.add_argument("--samples", type=int, default=50, help="Users sampled per measurement.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows afterwards.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["scans"] < options["users"]:
+            raise CommandError("--scans must be >= --users >= 1")
+
+        self.alias = options["database"] or DEFAULT_DB_ALIAS
+        if self.alias not in connections.databases:
+            raise CommandError(f"Unknown database alias: {self.alias}")
+        # Lakhon rows aur bade index builds: production par kabhi nahi
+        explicit = options["database"] is not None and options["confirmed"]
+        if not (explicit or is_scratch_database(self.alias)):
+            raise CommandError(
+                "Refusing to seed rows and build indexes on this database. Use a test database, "
+                "or pass --database <scratch alias> --i-know-this-is-scratch."
+            )
+        self.connection = connections[self.alias]
+
+        users = list(User.objects.using(self.alias).filter(username__startswith=BENCH_PREFIX).order_by('id'))
+        if ScanResult.objects.using(self.alias).filter(project__uploaded_by__in=users).count() < options["scans"]:
+            self._cleanup()
+            users = self._seed(options["scans"], options["users"], max(1, options["scans_per_project"]))
+
+        sample = random.Random(42).sample(users, min(options["samples"], len(users)))
+        self._drop_indexes()
+        without = self._measure(sample)
+        writes_without = self._measure_writes(users)
+        self._explain(sample[0])
+        try:
+            self._create_indexes()
+            with_idx = self._measure(sample)
+            writes_with = self._measure_writes(users)
+            self._explain(sample[0])
+        finally:
+            self._drop_indexes()
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"Database: {self.alias} ({self.connection.vendor}), {len(sample)} users sampled (median per query)"
+        )
+        self.stdout.write(f"{'query':40} {'no index (ms)':>14} {'index (ms)':>12} {'speedup':>8}")
+        for name in without:
+            before = statistics.median(without[name]) * 1000
+            after = statistics.median(with_idx[name]) * 1000
+            speedup = before / after if after else 0
+            self.stdout.write(f"{name:40} {before:14.2f} {after:12.2f} {speedup:7.1f}x")
+        # Indexes ki keemat: har upload par teen index entries zyada (speedup < 1 = mehnga)
+        before, after = writes_without * 1e6, writes_with * 1e6
+        self.stdout.write(f"{'insert per upload (us)':40} {before:14.1f} {after:12.1f} {before / after:7.2f}x")
+
+        if not options["keep"]:
+            self._cleanup()
+
+    # ================== SEED ==================
+    def _seed(self, scans, user_count, scans_per_project):
+        started = time.perf_counter()
+        self.stdout.write(f"Seeding {scans} scans for {user_count} users...")
+        User.objects.using(self.alias).bulk_create(
+            [User(username=f"{BENCH_PREFIX}{i}", email=f"{BENCH_PREFIX}{i}@example.com") for i in range(user_count)],
+            batch_size=SEED_BATCH_SIZE,
+        )
+        users = list(User.objects.using(self.alias).filter(username__startswith=BENCH_PREFIX).order_by('id'))
+
+        # Users round-robin: sab ke projects ids mein bikhre hue (real upload order jaisa)
+        project_count = max(user_count, scans // scans_per_project)
+        for start in range(0, project_count, SEED_BATCH_SIZE):
+            Project.objects.using(self.alias).bulk_create([
+                Project(name=f"bench {i}", uploaded_by=users[i % user_count], file="projects/bench.py",
+                        framework="GDPR", status="Completed")
+                for i in range(start, min(project_count, start + SEED_BATCH_SIZE))
+            ])
+        project_ids = list(
+            Project.objects.using(self.alias).filter(uploaded_by__in=users).order_by('id').values_list('id', 'uploaded_by_id')
+        )
+
+        rng = random.Random(7)
+        for start in range(0, scans, SEED_BATCH_SIZE):
+            end = min(scans, start + SEED_BATCH_SIZE)
+            picks = [project_ids[rng.randrange(len(project_ids))] for _ in range(end - start)]
+            scores = [rng.randint(30, 100) for _ in picks]
+            with transaction.atomic(using=self.alias):
+                ScanResult.objects.using(self.alias).bulk_create([
+                    ScanResult(project_id=project_id, ethical_score=score, security_score=max(5, score - 5),
+                               details={}, critical=score % 3, high=score % 5, medium=score % 7)
+                    for (project_id, _), score in zip(picks, scores)
+                ])
+                ComplianceTrend.objects.using(self.alias).bulk_create([
+                    ComplianceTrend(user_id=user_id, month="bench", score=score)
+                    for (_, user_id), score in zip(picks, scores)
+                ])
+        self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s")
+        return users
+
+    def _cleanup(self):
+        # Lakhon rows: ORM delete har row collect karta, isliye seedha DELETE (sirf bench users ke)
+        qn = self.connection.ops.quote_name
+        bench_user_ids = f"SELECT id FROM {qn(User._meta.db_table)} WHERE username LIKE %s"
+        bench_project_ids = f"SELECT id FROM {qn(Project._meta.db_table)} WHERE uploaded_by_id IN ({bench_user_ids})"
+        pattern = [BENCH_PREFIX + "%"]
+        with transaction.atomic(using=self.alias), self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {qn(ComplianceTrend._meta.db_table)} WHERE user_id IN ({bench_user_ids})", pattern)
+            cursor.execute(f"DELETE FROM {qn(ScanResult._meta.db_table)} WHERE project_id IN ({bench_project_ids})", pattern)
+            cursor.execute(f"DELETE FROM {qn(Project._meta.db_table)} WHERE id IN ({bench_project_ids})", pattern)
+        User.objects.using(self.alias).filter(username__startswith=BENCH_PREFIX).delete()
+
+    # ================== MEASURE ==================
+    def _measure(self, users, repeat=3):
+        timings = {}
+        for user in users:
+            for name, qs in _hot_queries(user, self.alias).items():
+                # Pehli run page cache garam karti hai; best of ``repeat``
+                list(qs.all())
+                best = None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    list(qs.all())
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                timings.setdefault(name, []).append(best)
+        return timings
+
+    def _measure_writes(self, users, rows=WRITE_SAMPLE_ROWS):
+        """Ek upload ke inserts (project + scan + trend) ka average time; sab rollback."""
+        rng = random.Random(11)
+        started = time.perf_counter()
+        with transaction.atomic(using=self.alias):
+            for start in range(0, rows, SEED_BATCH_SIZE):
+                owners = [users[rng.randrange(len(users))] for _ in range(min(rows - start, SEED_BATCH_SIZE))]
+                projects = Project.objects.using(self.alias).bulk_create([
+                    Project(name="bench write", uploaded_by=user, file="projects/bench.py") for user in owners
+                ])
+                ScanResult.objects.using(self.alias).bulk_create([
+                    ScanResult(project=project, ethical_score=70, security_score=65, details={}) for project in projects
+                ])
+                ComplianceTrend.objects.using(self.alias).bulk_create([
+                    ComplianceTrend(user=user, month="bench", score=70) for user in owners
+                ])
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True, using=self.alias)
+        return elapsed / rows
+
+    def _explain(self, user):
+        for name, qs in _hot_queries(user, self.alias).items():
+            plan = " | ".join(line.strip() for line in qs.explain().splitlines())
+            self.stdout.write(f"  {name}: {plan}")
+
+    def _existing(self, model):
+        with self.connection.cursor() as cursor:
+            return self.connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+    def _drop_indexes(self):
+        # Pichli run beech mein ruki ho toh bhi: sirf bench_ wale, schema ke nahi
+        with self.connection.schema_editor() as editor:
+            for model, index in CANDIDATE_INDEXES:
+                if index.name in self._existing(model):
+                    editor.remove_index(model, index)
+        self.stdout.write("Candidate indexes dropped")
+
+    def _create_indexes(self):
+        with self.connection.schema_editor() as editor:
+            for model, index in CANDIDATE_INDEXES:
+                editor.add_index(model, index)
+        self.stdout.write("Candidate indexes created")
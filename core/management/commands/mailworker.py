@@ -0,0 +1,60 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.mailer import claim_emails, close_connection, deliver, requeue_stale_emails, send_queued
+
+# Har kitne loops baad atki hui emails check hon
+STALE_CHECK_EVERY = 30
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails in batches over one reused SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Emails claimed and sent per batch.",
+        )
+        parser.add_argument(
+            "--poll", type=float, default=settings.EMAIL_OUTBOX_POLL_SECONDS,
+            help="Seconds to sleep when nothing is due.",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Send everything that is due and exit.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        if options["once"]:
+            sent = send_queued(batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} emails"))
+            return
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+        self.stdout.write("Mail worker started")
+
+        mail_connection = None
+        loops = 0
+        try:
+            while not stopping:
+                if loops % STALE_CHECK_EVERY == 0:
+                    requeue_stale_emails()
+                loops += 1
+
+                emails = claim_emails(batch_size)
+                if not emails:
+                    # Idle: SMTP server waise bhi idle connection kaat deta hai
+                    close_connection(mail_connection)
+                    mail_connection = None
+                    time.sleep(options["poll"])
+                    continue
+                _, mail_connection = deliver(emails, mail_connection)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_connection(mail_connection)
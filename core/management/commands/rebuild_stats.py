@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.stats import REBUILD_BATCH_SIZE, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user dashboard rollups (Stats) from scan history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", type=int, action="append", dest="user_ids",
+            help="Only rebuild this user id (repeatable). Default: all users.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=REBUILD_BATCH_SIZE,
+            help="Rollup rows written per bulk upsert.",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_stats(options["user_ids"], batch_size=max(1, options["batch_size"]))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} user rollups"))
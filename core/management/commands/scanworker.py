@@ -0,0 +1,141 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.scanning import claim_batch, requeue_stale_jobs, run_jobs
+
+logger = logging.getLogger(__name__)
+
+# Har kitne loops baad stale jobs check hon
+STALE_CHECK_EVERY = 30
+
+# Loop fail ho (DB gaya, lock timeout) toh itna ruk kar dobara; har fail par double
+ERROR_BACKOFF_SECONDS = 1.0
+ERROR_BACKOFF_MAX_SECONDS = 60.0
+
+# Child process mar jaye toh itni der baad naya (crash loop mein CPU na jale)
+RESTART_DELAY_SECONDS = 1.0
+
+
+def work(worker_id, poll_interval, once=False, batch_size=1, batch_window=0):
+    """
+    Claim -> scan -> save loop for one worker process. A failing loop
+    (connection drop, lock timeout) is logged and retried with backoff
+    instead of killing the process.
+    """
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+
+    loops = 0
+    failures = 0
+    while not stopping:
+        try:
+            if loops % STALE_CHECK_EVERY == 0:
+                requeue_stale_jobs()
+            loops += 1
+
+            jobs = claim_batch(worker_id, batch_size, batch_window)
+            failures = 0
+            if not jobs:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            run_jobs(jobs)
+        except Exception:
+            if once:
+                raise
+            failures += 1
+            logger.exception(f"Scan worker {worker_id} loop failed ({failures} in a row)")
+            # Toota connection band: agla loop naya kholega
+            connections.close_all()
+            time.sleep(min(ERROR_BACKOFF_SECONDS * 2 ** (failures - 1), ERROR_BACKOFF_MAX_SECONDS))
+
+
+class Command(BaseCommand):
+    help = "Run the scan job queue worker (no external broker needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=settings.SCAN_WORKER_CONCURRENCY,
+            help="Number of worker processes scanning in parallel.",
+        )
+        parser.add_argument(
+            "--poll", type=float, default=settings.SCAN_WORKER_POLL_SECONDS,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.SCAN_BATCH_SIZE,
+            help="Max jobs scored with one model predict call.",
+        )
+        parser.add_argument(
+            "--batch-window", type=float, default=settings.SCAN_BATCH_WINDOW_SECONDS,
+            help="Seconds to wait for more jobs once one is claimed.",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the queue and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        batch = (max(1, options["batch_size"]), max(0.0, options["batch_window"]))
+        base_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        if concurrency == 1:
+            self.stdout.write(f"Scan worker {base_id} started")
+            work(base_id, options["poll"], options["once"], *batch)
+            return
+
+        # Fork se pehle DB connections band karo, har child apna connection khole
+        connections.close_all()
+        ctx = multiprocessing.get_context("fork")
+
+        def spawn(slot):
+            proc = ctx.Process(
+                target=work,
+                args=(f"{base_id}/{slot}", options["poll"], options["once"], *batch),
+                daemon=False,
+            )
+            proc.start()
+            return proc
+
+        procs = {slot: spawn(slot) for slot in range(concurrency)}
+        self.stdout.write(f"Scan worker {base_id} started with {concurrency} processes")
+
+        stopping = []
+
+        def shutdown(*args):
+            stopping.append(True)
+            for proc in procs.values():
+                if proc.is_alive():
+                    proc.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        try:
+            # Supervisor: jo child bina wajah mar jaye (exit code != 0) uski jagah naya
+            while procs:
+                wait([proc.sentinel for proc in procs.values()])
+                for slot, proc in list(procs.items()):
+                    if proc.is_alive():
+                        continue
+                    proc.join()
+                    if stopping or proc.exitcode == 0 or options["once"]:
+                        del procs[slot]
+                        continue
+                    logger.error(f"Scan worker {base_id}/{slot} exited with code {proc.exitcode}, restarting")
+                    time.sleep(RESTART_DELAY_SECONDS)
+                    procs[slot] = spawn(slot)
+        except KeyboardInterrupt:
+            shutdown()
+            for proc in procs.values():
+                proc.join()
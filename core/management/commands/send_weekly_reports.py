@@ -0,0 +1,87 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, F
+from django.utils import timezone
+
+from core.emails import render_many
+from core.mailer import queue_emails
+from core.models import ScanResult
+
+User = get_user_model()
+
+TEMPLATE = "emails/weekly_report.html"
+SUBJECT = "Your weekly compliance report - Ethical Software Compliance"
+
+
+def _weekly_scans(user_ids, since):
+    """Is hafte ki scans: user -> (count, avg score). Poore chunk ke liye ek GROUP BY."""
+    rows = (
+        ScanResult.objects.filter(project__uploaded_by_id__in=user_ids, scanned_at__gte=since)
+        .values(user_id=F("project__uploaded_by_id"))
+        .annotate(scans=Count("id"), score=Avg("ethical_score"))
+        .order_by()
+    )
+    return {row["user_id"]: (row["scans"], round(row["score"] or 0)) for row in rows}
+
+
+def _context(user, weekly, period_start, period_end):
+    stats = getattr(user, "stats", None)
+    week_scans, week_score = weekly.get(user.id, (0, 0))
+    return {
+        "name": user.first_name or user.username,
+        "period_start": period_start,
+        "period_end": period_end,
+        "week_scans": week_scans,
+        "week_score": week_score,
+        "compliance_score": stats.compliance_score if stats else 0,
+        "projects_scanned": stats.projects_scanned if stats else 0,
+        "critical": stats.critical if stats else 0,
+        "high": stats.high if stats else 0,
+        "medium": stats.medium if stats else 0,
+    }
+
+
+class Command(BaseCommand):
+    help = "Queue the weekly report email for every user with weekly_reports turned on."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users rendered and queued per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Render everything but queue nothing.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        period_end = timezone.now()
+        period_start = period_end - timedelta(days=7)
+
+        users = (
+            User.objects.filter(notification_settings__weekly_reports=True, is_active=True)
+            .exclude(email="")
+            .select_related("stats")
+            .order_by("id")
+        )
+
+        started = time.perf_counter()
+        total = 0
+        last_id = 0
+        while True:
+            chunk = list(users.filter(id__gt=last_id)[:batch_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            weekly = _weekly_scans([user.id for user in chunk], period_start)
+            contexts = [_context(user, weekly, period_start, period_end) for user in chunk]
+            messages = [
+                {"subject": SUBJECT, "body": text, "html_body": html_content, "to": [user.email]}
+                for user, (html_content, text) in zip(chunk, render_many(TEMPLATE, contexts))
+            ]
+            if not options["dry_run"]:
+                queue_emails(messages)
+            total += len(messages)
+
+        elapsed = time.perf_counter() - started
+        action = "Rendered" if options["dry_run"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"{action} {total} weekly reports in {elapsed:.2f}s"))
@@ -0,0 +1,54 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.webhooks import claim_deliveries, deliver, requeue_stale_deliveries, send_due
+
+# Har kitne loops baad atki hui deliveries check hon
+STALE_CHECK_EVERY = 30
+
+
+class Command(BaseCommand):
+    help = "Deliver queued webhook events, batched per endpoint, with retries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.WEBHOOK_BATCH_SIZE,
+            help="Events claimed per loop (grouped per endpoint before sending).",
+        )
+        parser.add_argument(
+            "--poll", type=float, default=settings.WEBHOOK_POLL_SECONDS,
+            help="Seconds to sleep when nothing is due.",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Deliver everything that is due and exit.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        if options["once"]:
+            delivered = send_due(batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Delivered {delivered} webhook events"))
+            return
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+        self.stdout.write("Webhook worker started")
+
+        loops = 0
+        try:
+            while not stopping:
+                if loops % STALE_CHECK_EVERY == 0:
+                    requeue_stale_deliveries()
+                loops += 1
+
+                deliveries = claim_deliveries(batch_size)
+                if not deliveries:
+                    time.sleep(options["poll"])
+                    continue
+                deliver(deliveries)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_scanjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanjob',
+            name='bytes_scanned',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scanjob',
+            name='bytes_total',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scanjob',
+            name='rules_hit',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def _severity_counts(details):
+    # ScanResult.counts_from_details jaisa; is migration tak count columns nahi hain
+    inner = details.get('details', details) if isinstance(details, dict) else {}
+    if not isinstance(inner, dict):
+        inner = {}
+    counts = []
+    for field in ('critical', 'high', 'medium'):
+        try:
+            counts.append(int(inner.get(field, 0) or 0))
+        except (TypeError, ValueError):
+            counts.append(0)
+    return counts
+
+
+def backfill_rollups(apps, schema_editor):
+    # Purane users ke rollups scan history se (core/stats.py rebuild_stats jaisa),
+    # warna pehli nayi scan zero row bana kar sirf khud ko ginti
+    ScanResult = apps.get_model('core', 'ScanResult')
+    Stats = apps.get_model('core', 'Stats')
+    db_alias = schema_editor.connection.alias
+
+    totals = {}
+    scans = ScanResult.objects.using(db_alias).order_by().values_list(
+        'project__uploaded_by_id', 'project_id', 'ethical_score', 'security_score', 'details'
+    )
+    for user_id, project_id, ethical, security, details in scans.iterator(chunk_size=BATCH_SIZE):
+        row = totals.setdefault(user_id, {
+            'projects': set(), 'scans': 0, 'ethical': 0, 'security': 0, 'critical': 0, 'high': 0, 'medium': 0,
+        })
+        critical, high, medium = _severity_counts(details)
+        row['projects'].add(project_id)
+        row['scans'] += 1
+        row['ethical'] += ethical
+        row['security'] += security
+        row['critical'] += critical
+        row['high'] += high
+        row['medium'] += medium
+
+    for user_id, row in totals.items():
+        ethical_avg = row['ethical'] // row['scans']
+        security_avg = row['security'] // row['scans']
+        Stats.objects.using(db_alias).update_or_create(user_id=user_id, defaults={
+            'projects_scanned': len(row['projects']),
+            'issues_detected': row['critical'] + row['high'] + row['medium'],
+            'compliance_score': (ethical_avg + security_avg) // 2,
+            'ethical_score': ethical_avg,
+            'cybersecurity_score': security_avg,
+            'critical': row['critical'],
+            'high': row['high'],
+            'medium': row['medium'],
+            'scans_count': row['scans'],
+            'ethical_total': row['ethical'],
+            'security_total': row['security'],
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_scanjob_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stats',
+            name='critical',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='ethical_total',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='high',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='medium',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='scans_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='security_total',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='stats',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stats', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
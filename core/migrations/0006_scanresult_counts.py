@@ -0,0 +1,38 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_stats_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanresult',
+            name='critical',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scanresult',
+            name='high',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scanresult',
+            name='lines_analyzed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scanresult',
+            name='medium',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scanresult',
+            name='total_issues',
+            field=models.IntegerField(default=0),
+        ),
+    ]
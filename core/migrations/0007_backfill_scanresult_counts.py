@@ -0,0 +1,49 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+COUNT_FIELDS = ('critical', 'high', 'medium', 'total_issues', 'lines_analyzed')
+
+
+def _counts(details):
+    # ScanResult.counts_from_details ki copy (migrations mein model methods nahi milte)
+    inner = details.get('details', details) if isinstance(details, dict) else {}
+    if not isinstance(inner, dict):
+        inner = {}
+    counts = {}
+    for field in COUNT_FIELDS:
+        try:
+            counts[field] = int(inner.get(field, 0) or 0)
+        except (TypeError, ValueError):
+            counts[field] = 0
+    if not inner.get('total_issues'):
+        counts['total_issues'] = counts['critical'] + counts['high'] + counts['medium']
+    return counts
+
+
+def backfill_counts(apps, schema_editor):
+    ScanResult = apps.get_model('core', 'ScanResult')
+    db_alias = schema_editor.connection.alias
+    last_id = 0
+    # Primary key ke hisaab se batches: poori table memory mein nahi aati
+    while True:
+        batch = list(
+            ScanResult.objects.using(db_alias).filter(id__gt=last_id).order_by('id').only('id', 'details')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for scan in batch:
+            for field, value in _counts(scan.details).items():
+                setattr(scan, field, value)
+        ScanResult.objects.using(db_alias).bulk_update(batch, COUNT_FIELDS)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_scanresult_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_backfill_scanresult_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='compliancetrend',
+            index=models.Index(fields=['user', 'id'], name='trend_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['uploaded_by', '-id'], name='project_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scanresult',
+            index=models.Index(fields=['project', '-scanned_at'], name='scan_project_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:27
+
+from datetime import datetime, timezone as dt_timezone
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_recorded_at(apps, schema_editor):
+    """
+    Purani rows ka time ``month`` label ("%b %d - %H:%M", UTC) se: saal label
+    mein nahi hai, is liye is saal ka (future ho toh pichle saal ka).
+    Jo label parse na ho wo migration time par rehti hai.
+    """
+    ComplianceTrend = apps.get_model('core', 'ComplianceTrend')
+    db_alias = schema_editor.connection.alias
+    now = timezone.now()
+    last_id = 0
+    while True:
+        batch = list(
+            ComplianceTrend.objects.using(db_alias).filter(id__gt=last_id).order_by('id').only('id', 'month')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        changed = []
+        for trend in batch:
+            try:
+                # Label timezone.now() (UTC) se bana tha
+                recorded_at = datetime.strptime(
+                    f"{now.year} {trend.month}", "%Y %b %d - %H:%M"
+                ).replace(tzinfo=dt_timezone.utc)
+                if recorded_at > now:
+                    recorded_at = recorded_at.replace(year=now.year - 1)
+            except (TypeError, ValueError):
+                continue
+            trend.recorded_at = recorded_at
+            changed.append(trend)
+        ComplianceTrend.objects.using(db_alias).bulk_update(changed, ['recorded_at'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='compliancetrend',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_recorded_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='compliancetrend',
+            name='month',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='compliancetrend',
+            index=models.Index(fields=['user', 'recorded_at'], name='trend_user_time_idx'),
+        ),
+    ]
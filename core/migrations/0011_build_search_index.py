@@ -0,0 +1,67 @@
+import re
+from collections import Counter
+
+from django.db import migrations
+
+# core/search.py ki is waqt ki copy: migration live code import nahi karti,
+# warna search module / models badalne par fresh DB par migrate toot jata
+SOURCES = {
+    'documentation': ('Documentation', 'title', 'description'),
+    'faq': ('FAQ', 'question', 'answer'),
+    'support': ('SupportResource', 'title', 'description'),
+    'release': ('ReleaseNote', 'title', 'description'),
+}
+TITLE_WEIGHT = 3
+TERM_MAX_LENGTH = 64
+TOKEN_RE = re.compile(r'\w+')
+STOPWORDS = frozenset(
+    'a an and are as at be by can do for from how i in is it my of on or '
+    'the to what when where with you your'.split()
+)
+BATCH_SIZE = 1000
+
+
+def _tokenize(text):
+    return [
+        token[:TERM_MAX_LENGTH]
+        for token in TOKEN_RE.findall((text or '').lower())
+        if token not in STOPWORDS
+    ]
+
+
+def build_index(apps, schema_editor):
+    # Pehle se maujood help center content index mein (aage save signals sambhalte hain)
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    SearchPosting = apps.get_model('core', 'SearchPosting')
+    db_alias = schema_editor.connection.alias
+
+    SearchDocument.objects.using(db_alias).all().delete()
+    for kind, (model_name, title_field, body_field) in SOURCES.items():
+        model = apps.get_model('core', model_name)
+        for obj in model.objects.using(db_alias).all().iterator():
+            title = getattr(obj, title_field) or ''
+            body = getattr(obj, body_field) or ''
+            counts = Counter()
+            for token in _tokenize(title):
+                counts[token] += TITLE_WEIGHT
+            for token in _tokenize(body):
+                counts[token] += 1
+
+            document = SearchDocument.objects.using(db_alias).create(
+                kind=kind, object_id=obj.pk, title=title[:300], body=body, length=sum(counts.values()),
+            )
+            SearchPosting.objects.using(db_alias).bulk_create(
+                [SearchPosting(term=term, document=document, frequency=frequency) for term, frequency in counts.items()],
+                batch_size=BATCH_SIZE,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.10 on 2026-10-17 03:40
+
+import secrets
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_webhook_secrets(apps, schema_editor):
+    # Purani integrations ko bhi signing secret (model.save wala format)
+    ApiIntegration = apps.get_model('core', 'ApiIntegration')
+    for integration in ApiIntegration.objects.using(schema_editor.connection.alias).filter(webhook_secret=''):
+        integration.webhook_secret = 'whsec_' + secrets.token_hex(24)
+        integration.save(update_fields=['webhook_secret'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_outbound_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apiintegration',
+            name='webhook_secret',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField()),
+                ('event', models.CharField(max_length=50)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('delivered', 'Delivered'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('response_status', models.PositiveIntegerField(blank=True, null=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claim_token', models.CharField(blank=True, db_index=True, max_length=32)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='webhook_deliveries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='webhook_due_idx')],
+            },
+        ),
+        migrations.RunPython(fill_webhook_secrets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.10 on 2026-10-17 04:10
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_keys(apps, schema_editor):
+    # Purani raw keys ka hash + preview (ApiIntegration.hash_key / preview_key ki copy)
+    ApiIntegration = apps.get_model('core', 'ApiIntegration')
+    for integration in ApiIntegration.objects.using(schema_editor.connection.alias).exclude(api_key=''):
+        raw_key = integration.api_key
+        integration.api_key_hash = hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+        integration.api_key_preview = f"{raw_key[:12]}...{raw_key[-4:]}"
+        integration.save(update_fields=['api_key_hash', 'api_key_preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_webhooks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apiintegration',
+            name='api_key_hash',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='apiintegration',
+            name='api_key_preview',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.RunPython(hash_existing_keys, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='apiintegration',
+            name='api_key',
+        ),
+    ]
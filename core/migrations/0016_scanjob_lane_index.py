@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-17 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_ratelimitbucket'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scanjob',
+            index=models.Index(fields=['status', 'scan_mode', 'id'], name='scanjob_lane_queue_idx'),
+        ),
+    ]
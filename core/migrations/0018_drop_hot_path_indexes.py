@@ -0,0 +1,25 @@
+# Generated by Django 5.2.10 on 2026-10-17 03:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_streamticket'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='compliancetrend',
+            name='trend_user_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_user_recent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='scanresult',
+            name='scan_project_recent_idx',
+        ),
+    ]
@@ -1,7 +1,8 @@
-<<<<<<< HEAD
+import hashlib
 import secrets
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
 # ================== USER MODEL ==================
@@ -75,359 +76,119 @@ class ScanResult(models.Model):
     
     # Nayi Field: Direct AI ki taraf se mashwara
     ai_recommendation = models.TextField(blank=True, null=True)
+
+    # details JSON se nikle hue counts (save() par bharte hain): SQL mein
+    # filter/aggregate bina JSON parse kiye
+    critical = models.IntegerField(default=0)
+    high = models.IntegerField(default=0)
+    medium = models.IntegerField(default=0)
+    total_issues = models.IntegerField(default=0)
+    lines_analyzed = models.IntegerField(default=0)
     
     scanned_at = models.DateTimeField(auto_now_add=True)
 
-    def __str__(self):
-        return f"Scan for {self.project.name} - {self.scanned_at}"
-
-# ================== FRAMEWORK MODEL ==================
-class Framework(models.Model):
-    title = models.CharField(max_length=100)
-    value = models.IntegerField(default=0)  # % compliance
-
-    def __str__(self):
-        return self.title
-
-
-# ================== DASHBOARD STATS MODEL ==================
-class Stats(models.Model):
-    projects_scanned = models.IntegerField(default=0)
-    issues_detected = models.IntegerField(default=0)
-    compliance_score = models.IntegerField(default=0)
-
-    ethical_score = models.IntegerField(default=0)
-    cybersecurity_score = models.IntegerField(default=0)
-
-    ethical_issues = models.IntegerField(default=0)
-    security_weaknesses = models.IntegerField(default=0)
+    COUNT_FIELDS = ('critical', 'high', 'medium', 'total_issues', 'lines_analyzed')
 
     def __str__(self):
-        return "Dashboard Stats"
-
-
-# ================== CHART MODELS ==================
-
-# 🟡 Compliance Trend Chart
-class ComplianceTrend(models.Model):
-    # 👇 Ye line lazmi add karein taaki data user-specific ho
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trends', null=True)
-    month = models.CharField(max_length=10)
-    score = models.IntegerField()
-
-    def __str__(self):
-        return f"{self.user.username if self.user else 'Global'} - {self.month}"
-
-# 🔴 Issues by Category Chart
-class IssueCategory(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
-    category_name = models.CharField(max_length=255)
-    issue_count = models.IntegerField(default=0)
-
-# 🔵 Framework Compliance (Donut Chart)
-class FrameworkCompliance(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='framework_scores') # 👈 Ye line add karein
-    framework = models.CharField(max_length=50)
-    score = models.IntegerField()
-# ================== NOTIFICATION SETTINGS ==================
-class NotificationSettings(models.Model):
-    user = models.OneToOneField(
-        User,
-        on_delete=models.CASCADE,
-        related_name="notification_settings"
-    )
-
-    email_notifications = models.BooleanField(default=True)
-    sms_alerts = models.BooleanField(default=False)
-    system_updates = models.BooleanField(default=True)
-    weekly_reports = models.BooleanField(default=False)
-
-    def __str__(self):
-        return f"Notifications - {self.user.email}"
-
-
-# ================== DISPLAY SETTINGS MODEL ==================
-class DisplaySettings(models.Model):
-    THEME_CHOICES = (
-        ('dark', 'Dark'),
-        ('light', 'Light'),
-        ('system', 'System'),
-    )
-
-    FONT_CHOICES = (
-        ('small', 'Small'),
-        ('medium', 'Medium'),
-        ('large', 'Large'),
-    )
-
-    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="display_settings")
-    theme = models.CharField(max_length=10, choices=THEME_CHOICES, default='dark')
-    font_size = models.CharField(max_length=10, choices=FONT_CHOICES, default='medium')
-
-    def __str__(self):
-        return f"{self.user.email} Display Settings"
-
+        return f"Scan for {self.project.name} - {self.scanned_at}"
 
-# ================== API INTEGRATION MODEL ==================
-class ApiIntegration(models.Model):
-    user = models.OneToOneField(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
-        related_name="api_integration"
-    )
-    api_key = models.CharField(max_length=255, unique=True, blank=True)
-    webhook_url = models.URLField(blank=True, null=True)
+    @staticmethod
+    def counts_from_details(details):
+        """Engine output {"details": {...}} (ya purana flat format) se counts."""
+        inner = details.get("details", details) if isinstance(details, dict) else {}
+        if not isinstance(inner, dict):
+            inner = {}
+        counts = {}
+        for field in ScanResult.COUNT_FIELDS:
+            try:
+                counts[field] = int(inner.get(field, 0) or 0)
+            except (TypeError, ValueError):
+                counts[field] = 0
+        if not inner.get('total_issues'):
+            counts['total_issues'] = counts['critical'] + counts['high'] + counts['medium']
+        return counts
 
     def save(self, *args, **kwargs):
-        if not self.api_key:
-            self.api_key = "sk_live_" + secrets.token_hex(24)
+        for field, value in self.counts_from_details(self.details).items():
+            setattr(self, field, value)
         super().save(*args, **kwargs)
 
-    def __str__(self):
-        return f"{self.user.email} API Integration"
-
-
-
-# ================== API COMPLIANCESSETTINGS MODEL ==================
-class ComplianceSettings(models.Model):
-    user = models.OneToOneField(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
-        related_name="compliance_settings"
+# ================== SCAN JOB QUEUE ==================
+class ScanJob(models.Model):
+    # Durable queue: web request job banata hai, `manage.py scanworker` chalata hai
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
     )
 
-    iso_27001 = models.BooleanField(default=False)
-    gdpr = models.BooleanField(default=False)
-    hipaa = models.BooleanField(default=False)
-    soc2 = models.BooleanField(default=False)
-
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    def __str__(self):
-        return f"Compliance Settings - {self.user.email}"
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='scan_jobs')
+    scan_mode = models.CharField(max_length=20, default='standard')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
 
+    # Kis worker ne claim kiya (stale jobs dobara queue karne ke liye)
+    worker = models.CharField(max_length=100, blank=True)
+    claim_token = models.CharField(max_length=32, blank=True, db_index=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
 
-#___________password
-
-
-class SecuritySettings(models.Model):
-    user = models.OneToOneField(User, on_delete=models.CASCADE)
-    two_factor_enabled = models.BooleanField(default=False)
-    otp_code = models.CharField(max_length=6, blank=True)
-    otp_created_at = models.DateTimeField(null=True, blank=True)
-
-#---------------helpcenter
-
-# HERO SECTION
-class HelpHero(models.Model):
-    title = models.CharField(max_length=200, default="ESCC Help & Support Center")
-    subtitle = models.TextField(default="Find answers, guides, and support for your compliance checking needs")
-    search_placeholder = models.CharField(max_length=200, default="Search for help topics, documentation, or FAQs...")
-    quick_buttons = models.JSONField(default=list)  # ["Getting Started", "Upload Files", ...]
-
-    def __str__(self):
-        return self.title
-
-# DOCUMENTATION / GUIDES
-class Documentation(models.Model):
-    title = models.CharField(max_length=200)
-    description = models.TextField()
-    order = models.PositiveIntegerField(default=0)
-
-    class Meta:
-        ordering = ["order"]
-
-# FAQ
-class FAQ(models.Model):
-    question = models.CharField(max_length=300)
-    answer = models.TextField(blank=True)
-    order = models.PositiveIntegerField(default=0)
-
-    class Meta:
-        ordering = ["order"]
-
-# SUPPORT RESOURCES
-class SupportResource(models.Model):
-    title = models.CharField(max_length=200)
-    description = models.TextField()
-    order = models.PositiveIntegerField(default=0)
-
-    class Meta:
-        ordering = ["order"]
-
-# RELEASE NOTES
-class ReleaseNote(models.Model):
-    title = models.CharField(max_length=200)
-    description = models.TextField()
-    release_date = models.DateField(null=True, blank=True)
-    order = models.PositiveIntegerField(default=0)
-
-    class Meta:
-        ordering = ["-release_date", "order"]
-
-# CONTACT MESSAGES
-class ContactMessage(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    subject = models.CharField(max_length=200)
-    message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
-
-    def __str__(self):
-        return f"{self.user.username} - {self.subject}"
-
-#guest
+    # Live progress (projects/events/ stream isko padhta hai)
+    bytes_total = models.BigIntegerField(default=0)
+    bytes_scanned = models.BigIntegerField(default=0)
+    rules_hit = models.PositiveIntegerField(default=0)
 
-# GUEST CONTACT MESSAGES
-class GuestContactMessage(models.Model):
-    name = models.CharField(max_length=100)
-    email = models.EmailField()
-    subject = models.CharField(max_length=200)
-    message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
-
-    def __str__(self):
-        return f"Guest: {self.name} - {self.subject}"
-#______________report
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
 
-class Report(models.Model):
-    report_id = models.CharField(max_length=50, unique=True)
-    title = models.CharField(max_length=200)
-    description = models.TextField()
-    compliance_score = models.IntegerField()
-    total_issues = models.IntegerField()
-    critical_issues = models.IntegerField()
-    high_issues = models.IntegerField()
-    medium_issues = models.IntegerField()
-    generated_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        return self.title
-
-class Issue(models.Model):
-    LEVEL_CHOICES = [
-        ("CRITICAL", "Critical"),
-        ("HIGH", "High"),
-        ("MEDIUM", "Medium"),
-    ]
-    report = models.ForeignKey(Report, related_name="issues", on_delete=models.CASCADE)
-    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
-    title = models.CharField(max_length=200)
-    description = models.TextField(blank=True)
-
-    def __str__(self):
-        return f"{self.level} - {self.title}"
-
-class Progress(models.Model):
-    report = models.ForeignKey(Report, related_name="progresses", on_delete=models.CASCADE)
-    framework = models.CharField(max_length=50)
-    value = models.IntegerField()  # store as 0-100
-
-    def __str__(self):
-        return f"{self.framework} - {self.value}%"
-
-class HistoricalReport(models.Model):
-    report = models.ForeignKey(Report, related_name="history", on_delete=models.CASCADE)
-    date = models.DateField()
-    score = models.IntegerField()
-
-    def __str__(self):
-        return f"{self.date} - {self.score}"
-
-class Recommendation(models.Model):
-    report = models.ForeignKey(Report, related_name="recommendations", on_delete=models.CASCADE)
-    text = models.TextField()
+    class Meta:
+        indexes = [
+            # Scheduler: har lane ki queued jobs purani pehle
+            models.Index(fields=['status', 'scan_mode', 'id'], name='scanjob_lane_queue_idx'),
+        ]
 
     def __str__(self):
-        return self.text[:50]
-
-
-
-
-=======
-import secrets
-from django.conf import settings
-from django.db import models
-from django.contrib.auth.models import AbstractUser
-
-# ================== USER MODEL ==================
-from django.db import models
-from django.contrib.auth.models import AbstractUser
-
-class User(AbstractUser):
-    ROLE_CHOICES = (
-        ('developer', 'Developer'),
-        ('student', 'Student'),
-        ('admin', 'Admin'),
-    )
-   
-    # Existing Fields
-    email = models.EmailField(unique=True)
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='developer')
-    two_factor_enabled = models.BooleanField(default=False)
-    
-    # Settings.jsx Fields
-    organization = models.CharField(max_length=150, blank=True)
-    job_title = models.CharField(max_length=150, blank=True)
-    avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
-
-    # 🔹 Social Auth Dynamic Fields
-    # Agar Google se image aati hai toh URL save karne ke liye
-    social_avatar_url = models.URLField(max_length=500, blank=True, null=True)
-    
-    auth_provider = models.CharField(
-        max_length=50, 
-        default='email',
-        choices=[
-            ('email', 'email'), 
-            ('google', 'google'), 
-            ('linkedin', 'linkedin')
-        ]
-    )
+        return f"Job {self.id} - {self.project.name} ({self.status})"
 
-    USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = ['username']
+# ================== SCAN EVENTS TICKET ==================
+class StreamTicket(models.Model):
+    # EventSource headers nahi bhej sakta: POST se ek chhota, ek-baar wala ticket,
+    # URL mein JWT nahi (logs / history mein token leak hota). Sirf hash save hota hai.
+    ticket_hash = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='stream_tickets')
+    expires_at = models.DateTimeField(db_index=True)
 
     def __str__(self):
-        return self.email
-
-# ================== PROJECT MODEL (UPDATED) ==================
-class Project(models.Model):
-    STATUS_CHOICES = (
-        ('Completed', 'Completed'),
-        ('In Progress', 'In Progress'),
-        ('Failed', 'Failed'),
-        ('Pending', 'Pending'),
-    )
+        return f"Ticket for {self.user_id} (expires {self.expires_at})"
 
-    name = models.CharField(max_length=200)
-    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
-    file = models.FileField(upload_to='projects/')
-    framework = models.CharField(max_length=100, default='General Standard') # <--- Missing Field Added
-    uploaded_at = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+# ================== SCAN CACHE MODEL ==================
+class ScanCacheEntry(models.Model):
+    # Content-addressed key: "analysis:<sha256>:<ruleset>:<model>" ya "file:<sha256>:<ruleset>";
+    # "blocks:<lineage hash>:<ruleset>" = ek project lineage ka line-block index
+    # "archive:<lineage hash>:<ruleset>" = is lineage ka archive pehle scan ho chuka
+    key = models.CharField(max_length=200, unique=True)
+    value = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
-        return f"{self.name} - {self.framework}"
+        return self.key
 
-# ================== SCAN RESULT MODEL ==================
-class ScanResult(models.Model):
-    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='scan_results')
-    ethical_score = models.IntegerField(default=0)
-    security_score = models.IntegerField(default=0)
-    
-    # Isme hum detail vulnerabilities, line numbers aur AI suggestions rakhenge
-    details = models.JSONField(default=dict) 
-    
-    # Nayi Field: Direct AI ki taraf se mashwara
-    ai_recommendation = models.TextField(blank=True, null=True)
-    
-    scanned_at = models.DateTimeField(auto_now_add=True)
+# ================== RATE LIMIT BUCKETS ==================
+class RateLimitBucket(models.Model):
+    # Token bucket ka state, RATE_LIMIT_STORE = "database" ho toh (core/throttling.py)
+    key = models.CharField(max_length=200, unique=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()  # unix time (refill ka hisaab)
 
     def __str__(self):
-        return f"Scan for {self.project.name} - {self.scanned_at}"
+        return f"{self.key}: {self.tokens:.1f}"
 
 # ================== FRAMEWORK MODEL ==================
 class Framework(models.Model):
@@ -440,6 +201,9 @@ class Framework(models.Model):
 
 # ================== DASHBOARD STATS MODEL ==================
 class Stats(models.Model):
+    # Per-user rollup: har ScanResult ke saath usi transaction mein update (core/stats.py)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='stats', null=True, blank=True)
+
     projects_scanned = models.IntegerField(default=0)
     issues_detected = models.IntegerField(default=0)
     compliance_score = models.IntegerField(default=0)
@@ -450,8 +214,20 @@ class Stats(models.Model):
     ethical_issues = models.IntegerField(default=0)
     security_weaknesses = models.IntegerField(default=0)
 
+    # Severity counts
+    critical = models.IntegerField(default=0)
+    high = models.IntegerField(default=0)
+    medium = models.IntegerField(default=0)
+
+    # Running averages ke liye totals (avg = total / scans_count)
+    scans_count = models.IntegerField(default=0)
+    ethical_total = models.BigIntegerField(default=0)
+    security_total = models.BigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
-        return "Dashboard Stats"
+        return f"Dashboard Stats - {self.user.username if self.user else 'Global'}"
 
 
 # ================== CHART MODELS ==================
@@ -460,8 +236,17 @@ class Stats(models.Model):
 class ComplianceTrend(models.Model):
     # 👇 Ye line lazmi add karein taaki data user-specific ho
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trends', null=True)
-    month = models.CharField(max_length=10)
+    # Display label ("%b %d - %H:%M" = 14 chars, is liye 20)
+    month = models.CharField(max_length=20)
     score = models.IntegerField()
+    # Asli time: series isi par bucket/downsample hoti hai (core/trends.py)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Time range + buckets per user
+            models.Index(fields=['user', 'recorded_at'], name='trend_user_time_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username if self.user else 'Global'} - {self.month}"
@@ -523,18 +308,80 @@ class ApiIntegration(models.Model):
         on_delete=models.CASCADE,
         related_name="api_integration"
     )
-    api_key = models.CharField(max_length=255, unique=True, blank=True)
+    # Raw key kabhi save nahi hoti: sirf SHA-256 (lookup ke liye) aur masked preview.
+    # Raw key user ko sirf regenerate par ek dafa dikhti hai.
+    api_key_hash = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    api_key_preview = models.CharField(max_length=32, blank=True)
     webhook_url = models.URLField(blank=True, null=True)
+    # Webhook payloads isse HMAC-SHA256 sign hote hain (core/webhooks.py)
+    webhook_secret = models.CharField(max_length=64, blank=True)
+
+    API_KEY_PREFIX = "sk_live_"
+
+    @staticmethod
+    def hash_key(raw_key):
+        # Key 192-bit random hai, isliye plain SHA-256 kaafi hai (bcrypt ki zaroorat nahi)
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def preview_key(raw_key):
+        return f"{raw_key[:12]}...{raw_key[-4:]}"
+
+    def set_api_key(self):
+        """Nayi key banana (save caller karega). Returns the raw key."""
+        raw_key = self.API_KEY_PREFIX + secrets.token_hex(24)
+        self.api_key_hash = self.hash_key(raw_key)
+        self.api_key_preview = self.preview_key(raw_key)
+        return raw_key
 
     def save(self, *args, **kwargs):
-        if not self.api_key:
-            self.api_key = "sk_live_" + secrets.token_hex(24)
+        if not self.webhook_secret:
+            self.webhook_secret = "whsec_" + secrets.token_hex(24)
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.email} API Integration"
 
 
+# ================== WEBHOOK DELIVERY QUEUE ==================
+class WebhookDelivery(models.Model):
+    # Ek event ek row; `manage.py webhookworker` endpoint ke hisaab se batch karke bhejta hai
+    QUEUED = 'queued'
+    SENDING = 'sending'
+    DELIVERED = 'delivered'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (SENDING, 'Sending'),
+        (DELIVERED, 'Delivered'),
+        (FAILED, 'Failed'),
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="webhook_deliveries")
+    url = models.URLField()
+    event = models.CharField(max_length=50)  # scan.completed / scan.failed
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    response_status = models.PositiveIntegerField(null=True, blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    claim_token = models.CharField(max_length=32, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="webhook_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event} -> {self.url} ({self.status})"
+
+
 
 # ================== API COMPLIANCESSETTINGS MODEL ==================
 class ComplianceSettings(models.Model):
@@ -614,6 +461,34 @@ class ReleaseNote(models.Model):
     class Meta:
         ordering = ["-release_date", "order"]
 
+# HELP CENTER SEARCH INDEX (core/search.py)
+class SearchDocument(models.Model):
+    # Ek indexed help item: kind + source row ki id
+    kind = models.CharField(max_length=20)  # documentation / faq / support / release
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    length = models.PositiveIntegerField(default=0)  # weighted token count (ranking ke liye)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="search_doc_kind_object_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+
+class SearchPosting(models.Model):
+    # Inverted index: term -> documents (frequency mein title ka weight shamil)
+    # db_index: Postgres par LIKE 'abc%' ke liye pattern_ops index bhi banta hai
+    term = models.CharField(max_length=64, db_index=True)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name="postings")
+    frequency = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return self.term
+
 # CONTACT MESSAGES
 class ContactMessage(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -638,6 +513,45 @@ class GuestContactMessage(models.Model):
 
     def __str__(self):
         return f"Guest: {self.name} - {self.subject}"
+
+# ================== EMAIL OUTBOX ==================
+class OutboundEmail(models.Model):
+    # Request sirf row likhta hai, `manage.py mailworker` bhejta hai (core/mailer.py)
+    QUEUED = 'queued'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=300)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=200)
+    to = models.JSONField(default=list)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Retry backoff: is waqt se pehle dobara claim nahi hoti
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    claim_token = models.CharField(max_length=32, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
 #______________report
 
 class Report(models.Model):
@@ -694,4 +608,3 @@ class Recommendation(models.Model):
 
 
 
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
@@ -0,0 +1,20 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+# ================== CURSOR PAGINATION ==================
+# Keyset pagination: "WHERE id < cursor ORDER BY -id LIMIT n", OFFSET scan nahi.
+# ?page_size= se size (API_MAX_PAGE_SIZE tak), ?cursor= agla page.
+class ApiCursorPagination(CursorPagination):
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class ProjectCursorPagination(ApiCursorPagination):
+    ordering = '-id'
+
+
+class ScanResultCursorPagination(ApiCursorPagination):
+    # Same second ke scans id se tie-break
+    ordering = ('-scanned_at', '-id')
@@ -0,0 +1,263 @@
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ai_engine import ScanRequest
+
+from .engine import get_engine
+from .models import ComplianceTrend, Project, ScanJob, ScanResult
+from .scheduler import fair_candidates, pick_lane, remaining_capacity
+from .stats import record_scan_stats
+from .webhooks import queue_scan_event
+
+logger = logging.getLogger(__name__)
+
+# Batch window ke andar queue kitni der baad dobara dekhni hai
+BATCH_POLL_SECONDS = 0.05
+
+
+# ================== ENQUEUE ==================
+def enqueue_scan(project, scan_mode="standard"):
+    return ScanJob.objects.create(project=project, scan_mode=scan_mode)
+
+
+# ================== CLAIM ==================
+def claim_jobs(worker_id, limit=1, lane=None):
+    """
+    Atomically move up to ``limit`` queued jobs of one lane to ``running``
+    for this worker. The lane comes from the weighted scheduler unless
+    given; jobs inside it are picked fairly across users (core/scheduler.py).
+    Never claims past the lane's SCAN_LANE_MAX_RUNNING cap, re-checked on
+    every call. Uses SKIP LOCKED where the database has it (Postgres); on
+    SQLite the conditional UPDATE alone makes the claim safe.
+    ``started_at`` is set later, when the job's scan actually begins.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+
+    with transaction.atomic():
+        lane = lane or pick_lane()
+        if lane is None:
+            return []
+        remaining = remaining_capacity(lane)
+        if remaining is not None:
+            limit = min(limit, remaining)
+        if limit <= 0:
+            return []
+        ids = fair_candidates(lane, limit)
+        if ids and connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                ScanJob.objects.filter(id__in=ids, status=ScanJob.QUEUED)
+                .select_for_update(skip_locked=True).values_list("id", flat=True)
+            )
+        if not ids:
+            return []
+        ScanJob.objects.filter(id__in=ids, status=ScanJob.QUEUED).update(
+            status=ScanJob.RUNNING,
+            worker=worker_id,
+            claim_token=token,
+            attempts=F("attempts") + 1,
+            started_at=None,
+            # Lease claim se shuru (batch window mein worker mar jaye toh bhi requeue ho)
+            heartbeat_at=now,
+        )
+
+    return list(
+        ScanJob.objects.filter(claim_token=token)
+        .select_related("project", "project__uploaded_by")
+        .order_by("id")
+    )
+
+
+def claim_batch(worker_id, size=1, window=0):
+    """
+    Micro-batch: pehli claim ke baad ``window`` seconds tak aur jobs uthao
+    (``size`` tak), taake model ek hi predict call mein sab score kare.
+    """
+    jobs = claim_jobs(worker_id, size)
+    if not jobs or window <= 0:
+        return jobs
+
+    # Batch ek hi lane ka: deep scan standard results ko na rokay
+    lane = jobs[0].scan_mode
+    deadline = time.monotonic() + window
+    while len(jobs) < size and time.monotonic() < deadline:
+        time.sleep(min(BATCH_POLL_SECONDS, window))
+        jobs += claim_jobs(worker_id, size - len(jobs), lane=lane)
+    return jobs
+
+
+def requeue_stale_jobs():
+    """
+    Jobs whose worker died mid-scan: back to the queue, or failed once they
+    used up SCAN_JOB_MAX_ATTEMPTS.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.SCAN_JOB_LEASE_SECONDS)
+    stale = ScanJob.objects.filter(status=ScanJob.RUNNING, heartbeat_at__lt=cutoff)
+
+    exhausted = list(stale.filter(attempts__gte=settings.SCAN_JOB_MAX_ATTEMPTS).values_list("id", "project_id"))
+    if exhausted:
+        ScanJob.objects.filter(id__in=[job_id for job_id, _ in exhausted]).update(
+            status=ScanJob.FAILED, error="Worker lost", finished_at=timezone.now()
+        )
+        Project.objects.filter(id__in=[project_id for _, project_id in exhausted]).update(status="Failed")
+
+    requeued = stale.filter(attempts__lt=settings.SCAN_JOB_MAX_ATTEMPTS).update(
+        status=ScanJob.QUEUED, worker="", claim_token=""
+    )
+    return requeued + len(exhausted)
+
+
+# ================== RUN ==================
+def record_scan_result(project, ai_json):
+    """
+    Scan output ko ScanResult + ComplianceTrend + user rollup mein save
+    karna. Caller transaction.atomic() ke andar call kare.
+    """
+    ethical = int(ai_json.get("ethical_score", 0))
+    security = int(ai_json.get("security_score", 0))
+
+    first_scan = not ScanResult.objects.filter(project=project).exists()
+    scan = ScanResult.objects.create(
+        project=project,
+        ethical_score=ethical,
+        security_score=security,
+        details=ai_json
+    )
+    # Dashboard rollup isi transaction mein
+    record_scan_stats(scan, first_scan)
+
+    now = timezone.now()
+    ComplianceTrend.objects.create(
+        user=project.uploaded_by,
+        # Time add karne se har scan alag bar dikhayega
+        month=now.strftime("%b %d - %H:%M"),
+        score=(ethical + security) // 2,
+        recorded_at=now,
+    )
+    return scan
+
+
+class ProgressReporter:
+    """
+    Engine ka ``progress(bytes_scanned, bytes_total, rules_hit)`` callback.
+    DB writes SCAN_PROGRESS_INTERVAL tak throttle hote hain; heartbeat bhi
+    saath mein refresh hota hai.
+    """
+
+    def __init__(self, job, interval=None):
+        self.job = job
+        self.interval = settings.SCAN_PROGRESS_INTERVAL if interval is None else interval
+        self._last = 0.0
+        self._started = False
+
+    def __call__(self, bytes_scanned, bytes_total, rules_hit):
+        now = time.monotonic()
+        if self._started and now - self._last < self.interval and bytes_scanned < bytes_total:
+            return
+        self._last = now
+        fields = {}
+        if not self._started:
+            # Pehli report = is job ka scan ab shuru hua (batch mein baaki jobs baad mein)
+            fields["started_at"] = timezone.now()
+            self._started = True
+        ScanJob.objects.filter(id=self.job.id, claim_token=self.job.claim_token).update(
+            bytes_scanned=bytes_scanned,
+            bytes_total=bytes_total,
+            rules_hit=rules_hit,
+            heartbeat_at=timezone.now(),
+            **fields,
+        )
+
+
+def project_lineage(project):
+    """
+    Har upload naya Project hai; same user + same project naam wale uploads
+    ek lineage hain, taake re-upload par sirf badle hue blocks scan hon.
+    """
+    return f"{project.uploaded_by_id}:{project.name}"
+
+
+def run_job(job):
+    return run_jobs([job])[0]
+
+
+def run_jobs(jobs):
+    """
+    Claimed jobs ka ek batch: har file ka static scan, model ek dafa
+    (Scanner.scan_batch), phir har job apni transaction mein save.
+    """
+    Project.objects.filter(id__in=[job.project_id for job in jobs]).update(status="In Progress")
+
+    ready = []
+    for job in jobs:
+        try:
+            ready.append((job, job.project.file.path))
+        except Exception as e:
+            logger.error(f"Scan Crash (job {job.id}): {str(e)}")
+            _finish(job, ScanJob.FAILED, "Failed", error=str(e))
+
+    requests = [
+        ScanRequest(path, job.scan_mode, job.project.framework, ProgressReporter(job), project_lineage(job.project))
+        for job, path in ready
+    ]
+    try:
+        outcomes = get_engine().scan_batch(requests)
+    except Exception as e:
+        logger.error(f"Scan Crash (jobs {[job.id for job, _ in ready]}): {str(e)}")
+        outcomes = [e] * len(ready)
+
+    for (job, _), outcome in zip(ready, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"AI Error (job {job.id}): {str(outcome)}")
+            _finish(job, ScanJob.FAILED, "Failed", error=str(outcome))
+            continue
+        with transaction.atomic():
+            if not _lock_claim(job):
+                # Job stale hokar requeue ho gayi (doosra worker chala raha hoga):
+                # result yahan save kiya toh ScanResult / trend / stats do dafa
+                logger.warning(f"Scan result dropped (job {job.id}): claim lost")
+                continue
+            scan = record_scan_result(job.project, outcome)
+            _finish(job, ScanJob.DONE, "Completed", scan=scan)
+    return jobs
+
+
+def _lock_claim(job):
+    """
+    Job row lock karna, agar ye claim abhi bhi is worker ka hai. Lock
+    transaction ke end tak rehta hai, toh beech mein requeue_stale_jobs ise
+    nahi chheen sakta.
+    """
+    return bool(list(
+        ScanJob.objects.select_for_update()
+        .filter(id=job.id, claim_token=job.claim_token, status=ScanJob.RUNNING)
+        .values_list("id", flat=True)
+    ))
+
+
+def _finish(job, job_status, project_status, error="", scan=None):
+    now = timezone.now()
+    # claim_token check: agar job stale hokar kisi aur worker ke paas chali gayi ho
+    fields = {}
+    if job_status == ScanJob.DONE:
+        fields["bytes_scanned"] = F("bytes_total")
+    updated = ScanJob.objects.filter(id=job.id, claim_token=job.claim_token).update(
+        status=job_status, error=error, finished_at=now, heartbeat_at=now,
+        # Cache hit wali jobs progress report nahi karti: wo abhi shuru hokar khatam
+        started_at=Coalesce("started_at", Value(now)), **fields
+    )
+    if updated:
+        Project.objects.filter(id=job.project_id).update(status=project_status)
+        # Webhook sirf queue hota hai; bhejta webhookworker hai
+        event = "scan.completed" if job_status == ScanJob.DONE else "scan.failed"
+        queue_scan_event(job.project, event, scan=scan, error=error)
+    job.status = job_status
+    return job
@@ -0,0 +1,173 @@
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import ScanJob
+
+# ================== SETTINGS ==================
+# ScanJob.scan_mode hi lane hai (standard / deep)
+def lane_weights():
+    return settings.SCAN_LANE_WEIGHTS
+
+
+def lane_cap(lane):
+    """Lane ki max running jobs (None = koi cap nahi)."""
+    return settings.SCAN_LANE_MAX_RUNNING.get(lane)
+
+
+# pg_advisory_xact_lock(namespace, lane hash) ka pehla hissa
+LANE_LOCK_NAMESPACE = 7024
+
+
+# ================== LANES ==================
+class LanePicker:
+    """
+    Smooth weighted round robin (nginx wala): weights 4:1 par 5 claims mein
+    4 standard, 1 deep, aur deep ek saath ikatthe nahi aate. Sirf wo lanes
+    ginti mein jinke paas kaam hai.
+    """
+
+    def __init__(self):
+        self._current = {}
+        self._lock = threading.Lock()
+
+    def pick(self, eligible):
+        if not eligible:
+            return None
+        weights = lane_weights()
+        total = sum(weights.get(lane, 1) for lane in eligible)
+        with self._lock:
+            for lane in eligible:
+                self._current[lane] = self._current.get(lane, 0) + weights.get(lane, 1)
+            chosen = max(eligible, key=lambda lane: self._current[lane])
+            self._current[chosen] -= total
+        return chosen
+
+
+_picker = LanePicker()
+
+
+def eligible_lanes():
+    """Lanes with queued work whose running count is under the lane cap."""
+    queued = dict(
+        ScanJob.objects.filter(status=ScanJob.QUEUED)
+        .values_list("scan_mode").annotate(count=Count("id")).order_by()
+    )
+    running = dict(
+        ScanJob.objects.filter(status=ScanJob.RUNNING)
+        .values_list("scan_mode").annotate(count=Count("id")).order_by()
+    )
+    eligible = []
+    for lane in lane_weights():
+        cap = lane_cap(lane)
+        if queued.get(lane) and (cap is None or running.get(lane, 0) < cap):
+            eligible.append(lane)
+    return eligible
+
+
+def pick_lane():
+    return _picker.pick(eligible_lanes())
+
+
+def _lock_lane(lane):
+    # Postgres: transaction khatam hone tak ek lane ke claims ek ek karke.
+    # SQLite mein writes waise hi ek waqt mein ek hote hain.
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [LANE_LOCK_NAMESPACE, zlib.crc32(lane.encode("utf-8")) & 0x7FFFFFFF],
+            )
+
+
+def remaining_capacity(lane):
+    """
+    Lane mein abhi kitni aur jobs chal sakti hain (None = koi cap nahi).
+    Claim ki transaction ke andar call karein: lane lock ho jati hai, taake
+    do workers dono cap ke neeche na dekhein.
+    """
+    cap = lane_cap(lane)
+    if cap is None:
+        return None
+    _lock_lane(lane)
+    running = ScanJob.objects.filter(status=ScanJob.RUNNING, scan_mode=lane).count()
+    return max(0, cap - running)
+
+
+# ================== FAIRNESS ==================
+def fair_candidates(lane, limit):
+    """
+    Lane ki queued jobs mein se ``limit`` ids, users ke beech baari baari:
+    jis user ki kam jobs chal rahi hain (ya is claim mein kam mili hain) wo
+    pehle, barabari par purani job pehle. Ek user ki 50 uploads baaki sab
+    ko nahi rok sakti.
+    """
+    candidates = list(
+        ScanJob.objects.filter(status=ScanJob.QUEUED, scan_mode=lane)
+        .order_by("id")
+        .values_list("id", "project__uploaded_by_id")[:settings.SCAN_FAIR_WINDOW]
+    )
+    if not candidates:
+        return []
+    in_service = Counter(dict(
+        ScanJob.objects.filter(status=ScanJob.RUNNING)
+        .values_list("project__uploaded_by_id").annotate(count=Count("id")).order_by()
+    ))
+
+    # user -> uski queued ids (purani pehle), user order pehli job ke hisaab se
+    per_user = OrderedDict()
+    for job_id, user_id in candidates:
+        per_user.setdefault(user_id, []).append(job_id)
+
+    picked = []
+    while len(picked) < limit and per_user:
+        user_id = min(per_user, key=lambda user: (in_service[user], per_user[user][0]))
+        picked.append(per_user[user_id].pop(0))
+        in_service[user_id] += 1
+        if not per_user[user_id]:
+            del per_user[user_id]
+    return picked
+
+
+# ================== METRICS ==================
+def _percentile(values, fraction):
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return round(values[index], 2)
+
+
+def lane_metrics(window_seconds=3600):
+    """
+    Har lane: queue depth, running, sabse purani queued job ka intezar, aur
+    pichle ``window_seconds`` mein shuru hui jobs ka wait time (created ->
+    started) avg / p50 / p95 seconds.
+    """
+    now = timezone.now()
+    since = now - timedelta(seconds=window_seconds)
+    metrics = {}
+    for lane, weight in lane_weights().items():
+        jobs = ScanJob.objects.filter(scan_mode=lane)
+        queued = jobs.filter(status=ScanJob.QUEUED).aggregate(depth=Count("id"), oldest=Min("created_at"))
+        waits = sorted(
+            (started - created).total_seconds()
+            for created, started in jobs.filter(started_at__gte=since).values_list("created_at", "started_at")
+        )
+        metrics[lane] = {
+            "weight": weight,
+            "max_running": lane_cap(lane),
+            "queued": queued["depth"],
+            "running": jobs.filter(status=ScanJob.RUNNING).count(),
+            "oldest_wait_seconds": round((now - queued["oldest"]).total_seconds(), 2) if queued["oldest"] else 0,
+            "started_in_window": len(waits),
+            "wait_avg_seconds": round(sum(waits) / len(waits), 2) if waits else None,
+            "wait_p50_seconds": _percentile(waits, 0.5),
+            "wait_p95_seconds": _percentile(waits, 0.95),
+        }
+    return {"window_seconds": window_seconds, "lanes": metrics}
@@ -0,0 +1,191 @@
+import math
+import re
+from collections import Counter
+
+from django.apps import apps as django_apps
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models import Avg, Count, Q
+
+# Index kin models ka: kind -> (model, title field, body field)
+SOURCES = {
+    "documentation": ("Documentation", "title", "description"),
+    "faq": ("FAQ", "question", "answer"),
+    "support": ("SupportResource", "title", "description"),
+    "release": ("ReleaseNote", "title", "description"),
+}
+KIND_BY_MODEL = {model: kind for kind, (model, _, _) in SOURCES.items()}
+
+# Title ka har token body ke token se itna bhaari
+TITLE_WEIGHT = 3
+# "uplo" -> "upload": exact match se kam score
+PREFIX_WEIGHT = 0.6
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+MAX_QUERY_TERMS = 8
+MAX_LIMIT = 50
+TERM_MAX_LENGTH = 64
+SNIPPET_CHARS = 160
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it my of on or "
+    "the to what when where with you your".split()
+)
+
+
+def tokenize(text):
+    """Lowercase word tokens, stopwords nikal ke (index aur query dono yahi use karte hain)."""
+    return [
+        token[:TERM_MAX_LENGTH]
+        for token in TOKEN_RE.findall((text or "").lower())
+        if token not in STOPWORDS
+    ]
+
+
+def source_models(apps=None):
+    registry = apps or django_apps
+    return {kind: registry.get_model("core", model) for kind, (model, _, _) in SOURCES.items()}
+
+
+# ================== INDEXING ==================
+def index_object(obj, apps=None, using=None):
+    """
+    Ek help item ko (dobara) index karna: uska SearchDocument update aur
+    postings replace. ``using``: woh database jahan item save hua (default
+    ``obj._state.db``). Save signal ise commit ke baad chalata hai.
+    """
+    kind = KIND_BY_MODEL[type(obj).__name__]
+    _, title_field, body_field = SOURCES[kind]
+    title = getattr(obj, title_field) or ""
+    body = getattr(obj, body_field) or ""
+
+    counts = Counter()
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    for token in tokenize(body):
+        counts[token] += 1
+
+    db = using or obj._state.db or DEFAULT_DB_ALIAS
+    registry = apps or django_apps
+    SearchDocument = registry.get_model("core", "SearchDocument")
+    SearchPosting = registry.get_model("core", "SearchPosting")
+    with transaction.atomic(using=db):
+        document, _ = SearchDocument.objects.using(db).update_or_create(
+            kind=kind, object_id=obj.pk,
+            defaults={"title": title[:300], "body": body, "length": sum(counts.values())},
+        )
+        SearchPosting.objects.using(db).filter(document=document).delete()
+        SearchPosting.objects.using(db).bulk_create([
+            SearchPosting(term=term, document=document, frequency=frequency)
+            for term, frequency in counts.items()
+        ])
+
+
+def remove_document(kind, object_id, apps=None, using=DEFAULT_DB_ALIAS):
+    registry = apps or django_apps
+    SearchDocument = registry.get_model("core", "SearchDocument")
+    SearchDocument.objects.using(using).filter(kind=kind, object_id=object_id).delete()
+
+
+def remove_object(obj, apps=None, using=None):
+    remove_document(
+        KIND_BY_MODEL[type(obj).__name__], obj.pk, apps,
+        using=using or obj._state.db or DEFAULT_DB_ALIAS,
+    )
+
+
+def rebuild_index(apps=None):
+    """Poora index shuru se (rebuild_search_index command). Returns documents indexed."""
+    registry = apps or django_apps
+    indexed = 0
+    with transaction.atomic():
+        registry.get_model("core", "SearchDocument").objects.all().delete()
+        for model in source_models(registry).values():
+            for obj in model.objects.all().iterator():
+                index_object(obj, registry)
+                indexed += 1
+    return indexed
+
+
+# ================== SEARCH ==================
+def _term_filter(tokens):
+    """Har token ke liye prefix match (token khud bhi isi mein aata hai)."""
+    condition = Q()
+    for token in tokens:
+        match = Q(term__startswith=token)
+        if connection.vendor == "sqlite":
+            # SQLite LIKE par index use nahi karta; binary range karta hai
+            match &= Q(term__gte=token, term__lt=token + "\U0010ffff")
+        condition |= match
+    return condition
+
+
+def _bm25(frequency, length, avg_length, df, total):
+    idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (avg_length or 1))
+    return idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+
+def search(query, kinds=None, limit=20):
+    """
+    Ranked help center results for ``query``. Har query word ko (prefix ke
+    taur par) match karna zaroori hai; score BM25, prefix match thoda kam.
+    """
+    from .models import SearchDocument, SearchPosting
+
+    tokens = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not tokens:
+        return []
+
+    postings = list(
+        SearchPosting.objects.filter(_term_filter(tokens))
+        .values_list("term", "document_id", "frequency", "document__length", "document__kind")
+    )
+    if not postings:
+        return []
+
+    stats = SearchDocument.objects.aggregate(total=Count("id"), avg_length=Avg("length"))
+    df = Counter(term for term, *_ in postings)
+
+    # doc -> token -> best score (ek token ke kai prefix terms ho sakte hain)
+    matches = {}
+    for term, document_id, frequency, length, kind in postings:
+        if kinds and kind not in kinds:
+            continue
+        score = _bm25(frequency, length, stats["avg_length"], df[term], stats["total"])
+        for token in tokens:
+            if not term.startswith(token):
+                continue
+            weighted = score if term == token else score * PREFIX_WEIGHT
+            best = matches.setdefault(document_id, {})
+            best[token] = max(best.get(token, 0), weighted)
+
+    ranked = sorted(
+        ((sum(best.values()), document_id) for document_id, best in matches.items() if len(best) == len(tokens)),
+        key=lambda item: (-item[0], item[1]),
+    )[:limit]
+    documents = SearchDocument.objects.in_bulk([document_id for _, document_id in ranked])
+    return [
+        {
+            "type": documents[document_id].kind,
+            "id": documents[document_id].object_id,
+            "title": documents[document_id].title,
+            "snippet": snippet(documents[document_id].body, tokens),
+            "score": round(score, 3),
+        }
+        for score, document_id in ranked
+    ]
+
+
+def snippet(text, tokens):
+    """Body ka chhota hissa, pehle matching word ke aas paas."""
+    text = " ".join((text or "").split())
+    if len(text) <= SNIPPET_CHARS:
+        return text
+    lowered = text.lower()
+    positions = [lowered.find(token) for token in tokens]
+    first = min((pos for pos in positions if pos >= 0), default=0)
+    start = max(0, first - SNIPPET_CHARS // 4)
+    excerpt = text[start:start + SNIPPET_CHARS]
+    return ("..." if start else "") + excerpt + ("..." if start + SNIPPET_CHARS < len(text) else "")
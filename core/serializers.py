@@ -1,10 +1,12 @@
 from django.conf import settings
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.utils import timezone
 from datetime import timedelta
 import random
-from django.core.mail import send_mail
 
+from .mailer import queue_email
+from .webhooks import UnsafeWebhookURL, check_webhook_url
 from .models import (
     SecuritySettings,
     User,
@@ -69,7 +71,33 @@ class RegisterSerializer(serializers.ModelSerializer):
 
 
 # ================== PROJECT SERIALIZER ==================
-class ProjectSerializer(serializers.ModelSerializer):
+# ================== SPARSE FIELDSETS ==================
+def requested_fields(request):
+    """
+    ``?fields=id,name,status`` -> set of names (None = sab fields). Sirf
+    GET/HEAD/OPTIONS par: writes mein field hatane se validated input gum
+    ho jata (ya required field errors aate).
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    raw = request.query_params.get('fields')
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Serializer sirf ``?fields=`` wale fields bhejta hai (list views halki)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'))
+        if wanted:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     uploaded_by = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -78,15 +106,17 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'file', 'framework', 'status', 'uploaded_at', 'uploaded_by']
 
 # ================== SCAN RESULT SERIALIZER ==================
-class ScanResultSerializer(serializers.ModelSerializer):
+class ScanResultSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     project_name = serializers.CharField(source='project.name', read_only=True)
 
     class Meta:
         model = ScanResult
         fields = [
             'id', 'project', 'project_name', 'ethical_score', 
-            'security_score', 'details', 'ai_recommendation', 'scanned_at'
+            'security_score', 'details', 'ai_recommendation', 'scanned_at',
+            'critical', 'high', 'medium', 'total_issues', 'lines_analyzed'
         ]
+        read_only_fields = ['critical', 'high', 'medium', 'total_issues', 'lines_analyzed']
 
 # ================== FRAMEWORK SERIALIZER ==================
 # ================== FRAMEWORK SERIALIZER (FIXED) ==================
@@ -136,7 +166,10 @@ class StatsSerializer(serializers.ModelSerializer):
             'ethical_score',
             'cybersecurity_score',
             'ethical_issues',
-            'security_weaknesses'
+            'security_weaknesses',
+            'critical',
+            'high',
+            'medium',
         ]
 
 
@@ -156,10 +189,21 @@ class DisplaySettingsSerializer(serializers.ModelSerializer):
 
 # ================== API INTEGRATION SERIALIZER ==================
 class ApiIntegrationSerializer(serializers.ModelSerializer):
+    # Sirf masked preview; poori key regenerate response mein hi milti hai
+    api_key = serializers.CharField(source="api_key_preview", read_only=True)
+
     class Meta:
         model = ApiIntegration
-        fields = ["api_key", "webhook_url"]
-        read_only_fields = ["api_key"]
+        fields = ["api_key", "webhook_url", "webhook_secret"]
+        read_only_fields = ["api_key", "webhook_secret"]
+
+    def validate_webhook_url(self, value):
+        if value:
+            try:
+                check_webhook_url(value, resolve=False)
+            except UnsafeWebhookURL as e:
+                raise serializers.ValidationError(str(e))
+        return value
 
 
 # ================== COMPLIANCE SETTINGS SERIALIZER ==================
@@ -198,11 +242,10 @@ class SecuritySettingsSerializer(serializers.ModelSerializer):
                 instance.otp_created_at = timezone.now()
                 instance.save()
 
-            send_mail(
+            queue_email(
                 subject="Your 2FA OTP Code",
-                message=f"Your OTP code is: {otp_code}",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
+                body=f"Your OTP code is: {otp_code}",
+                to=[user.email],
             )
             raise serializers.ValidationError({"otp": "OTP sent to your email"})
 
@@ -260,11 +303,10 @@ class ContactMessageSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         contact = ContactMessage.objects.create(user=user, **validated_data)
 
-        send_mail(
+        queue_email(
             subject=f"New Help Center Message: {validated_data['subject']}",
-            message=f"From: {user.username} ({user.email})\n\n{validated_data['message']}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[settings.ADMIN_EMAIL],
+            body=f"From: {user.username} ({user.email})\n\n{validated_data['message']}",
+            to=[settings.ADMIN_EMAIL],
         )
 
         return contact
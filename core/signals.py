@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import helpcenter, search
+from .authentication import invalidate_user
+from .models import ApiIntegration, User
+
+
+# ================== HELP CENTER CACHE ==================
+def invalidate_help_center(sender, **kwargs):
+    # Commit ke baad: warna beech mein koi request purana data naye version par cache kar de
+    transaction.on_commit(helpcenter.invalidate)
+
+
+for model in helpcenter.HELP_CENTER_MODELS:
+    post_save.connect(invalidate_help_center, sender=model, dispatch_uid=f"helpcenter_save_{model.__name__}")
+    post_delete.connect(invalidate_help_center, sender=model, dispatch_uid=f"helpcenter_delete_{model.__name__}")
+
+
+# ================== HELP CENTER SEARCH INDEX ==================
+def index_help_item(sender, instance, using, **kwargs):
+    # Commit ke baad, usi database par jahan item save hua (rollback hua toh index bhi nahi badalta)
+    transaction.on_commit(lambda: search.index_object(instance, using=using), using=using)
+
+
+def unindex_help_item(sender, instance, using, **kwargs):
+    # Delete ke baad instance.pk None ho jata hai, is liye kind/pk abhi le lo
+    kind, object_id = search.KIND_BY_MODEL[sender.__name__], instance.pk
+    transaction.on_commit(lambda: search.remove_document(kind, object_id, using=using), using=using)
+
+
+for model in search.source_models().values():
+    post_save.connect(index_help_item, sender=model, dispatch_uid=f"search_index_{model.__name__}")
+    post_delete.connect(unindex_help_item, sender=model, dispatch_uid=f"search_unindex_{model.__name__}")
+
+
+# ================== API KEY CACHE ==================
+def invalidate_integration_keys(sender, instance, **kwargs):
+    # Regenerate / delete: purani key cache se foran bahar (is process mein)
+    invalidate_user(instance.user_id)
+
+
+def invalidate_user_keys(sender, instance, **kwargs):
+    # User deactivate / delete hua toh cached user object bhi purana
+    invalidate_user(instance.id)
+
+
+post_save.connect(invalidate_integration_keys, sender=ApiIntegration, dispatch_uid="api_key_cache_save")
+post_delete.connect(invalidate_integration_keys, sender=ApiIntegration, dispatch_uid="api_key_cache_delete")
+post_save.connect(invalidate_user_keys, sender=User, dispatch_uid="api_key_cache_user_save")
+post_delete.connect(invalidate_user_keys, sender=User, dispatch_uid="api_key_cache_user_delete")
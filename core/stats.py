@@ -0,0 +1,144 @@
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ScanResult, Stats
+
+# Bulk rebuild mein ek dafa kitne users ke rows likhne hain
+REBUILD_BATCH_SIZE = 1000
+
+ROLLUP_FIELDS = [
+    "projects_scanned", "issues_detected", "compliance_score",
+    "ethical_score", "cybersecurity_score",
+    "critical", "high", "medium",
+    "scans_count", "ethical_total", "security_total",
+]
+
+
+# ================== INCREMENTAL ==================
+def record_scan_stats(scan, first_scan=False):
+    """
+    Naye ScanResult ko user ke rollup mein jodna. ScanResult create karne
+    wali transaction ke andar call karein, taake dono saath commit hon.
+    Ek UPDATE, F() expressions se (parallel workers ka count nahi khota).
+    """
+    user_id = scan.project.uploaded_by_id
+    critical, high, medium = scan.critical, scan.high, scan.medium
+    stats, created = Stats.objects.get_or_create(user_id=user_id)
+    if created:
+        # Naya rollup poori history se banta hai (ye scan bhi usi mein aa jata
+        # hai); sirf +1 karne se purani scans kabhi count na hotin
+        rebuild_stats([user_id])
+        return
+
+    scans = F("scans_count") + 1
+    ethical_avg = (F("ethical_total") + scan.ethical_score) / scans
+    security_avg = (F("security_total") + scan.security_score) / scans
+    Stats.objects.filter(pk=stats.pk).update(
+        projects_scanned=F("projects_scanned") + (1 if first_scan else 0),
+        critical=F("critical") + critical,
+        high=F("high") + high,
+        medium=F("medium") + medium,
+        issues_detected=F("issues_detected") + critical + high + medium,
+        scans_count=scans,
+        ethical_total=F("ethical_total") + scan.ethical_score,
+        security_total=F("security_total") + scan.security_score,
+        ethical_score=ethical_avg,
+        cybersecurity_score=security_avg,
+        compliance_score=(ethical_avg + security_avg) / 2,
+        updated_at=timezone.now(),
+    )
+
+
+# ================== REBUILD ==================
+def _rollup_values(row):
+    scans = row["scans_count"]
+    ethical_avg = row["ethical_total"] // scans if scans else 0
+    security_avg = row["security_total"] // scans if scans else 0
+    critical, high, medium = row["critical"], row["high"], row["medium"]
+    return {
+        "projects_scanned": row["projects_scanned"],
+        "issues_detected": critical + high + medium,
+        "compliance_score": (ethical_avg + security_avg) // 2,
+        "ethical_score": ethical_avg,
+        "cybersecurity_score": security_avg,
+        "critical": critical,
+        "high": high,
+        "medium": medium,
+        "scans_count": scans,
+        "ethical_total": row["ethical_total"],
+        "security_total": row["security_total"],
+    }
+
+
+def rebuild_stats(user_ids=None, batch_size=REBUILD_BATCH_SIZE):
+    """
+    Rollups ko ScanResult history se dobara banana (GROUP BY user, ek
+    aggregate query) aur batches mein upsert karna. ``user_ids`` na ho toh
+    sab users. Returns number of rollups written.
+    """
+    scans = ScanResult.objects.all()
+    if user_ids is not None:
+        scans = scans.filter(project__uploaded_by_id__in=user_ids)
+
+    rows = (
+        scans.values(user_id=F("project__uploaded_by_id"))
+        .annotate(
+            scans_count=Count("id"),
+            projects_scanned=Count("project_id", distinct=True),
+            ethical_total=Coalesce(Sum("ethical_score"), 0),
+            security_total=Coalesce(Sum("security_score"), 0),
+            critical=Coalesce(Sum("critical"), 0),
+            high=Coalesce(Sum("high"), 0),
+            medium=Coalesce(Sum("medium"), 0),
+        )
+        .order_by("user_id")
+    )
+
+    written = 0
+    with transaction.atomic():
+        # Pehle target rollups zero (jin users ki koi scan nahi bachi wo zero hi rahenge)
+        reset = Stats.objects.filter(user__isnull=False)
+        if user_ids is not None:
+            reset = reset.filter(user_id__in=user_ids)
+        reset.update(updated_at=timezone.now(), **{field: 0 for field in ROLLUP_FIELDS})
+
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(Stats(user_id=row["user_id"], **_rollup_values(row)))
+            if len(batch) >= batch_size:
+                written += _upsert(batch)
+                batch = []
+        if batch:
+            written += _upsert(batch)
+    return written
+
+
+def _upsert(batch):
+    Stats.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=ROLLUP_FIELDS + ["updated_at"],
+    )
+    return len(batch)
+
+
+def rebuild_stats_on_commit(user_ids):
+    """
+    ScanResult seedha badla (API edit / admin) toh rollup history se dobara,
+    transaction commit hone ke baad (rollback par kuch nahi).
+    """
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if user_ids:
+        transaction.on_commit(lambda: rebuild_stats(user_ids))
+
+
+def get_user_stats(user):
+    """User ka rollup; pehli dafa (ya migration ke baad) history se ban jata hai."""
+    stats = Stats.objects.filter(user=user).first()
+    if stats is None:
+        rebuild_stats([user.id])
+        stats = Stats.objects.filter(user=user).first() or Stats(user=user)
+    return stats
@@ -1,3 +1,1252 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import importlib
+import io
+import json
+import os
+import random
+import re
+import shutil
+import smtplib
+import tarfile
+import tempfile
+import threading
+import zipfile
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.core.files.base import ContentFile
+from django.core import mail
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+from django.test import AsyncClient, Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from sklearn.preprocessing import LabelEncoder
+
+from ai_engine import Scanner, ScanError, ScanRequest, archive, inference, predict
+from ai_engine.blocks import LONG_LINE_CHARS, MAX_BLOCK_CHARS, scan_blocks, scan_file_blocks, split_blocks
+from ai_engine.cache import LRUScanCache
+from ai_engine.feature_extractor import (
+    FEATURE_COLUMNS, FeatureEncoder, feature_context, feature_matrix, feature_row, get_encoder,
+)
+from ai_engine.rules import score_counts
+from ai_engine.stream import scan_stream
+
+from .authentication import ApiKeyAuthentication, _key_cache
+from . import emails, helpcenter, search
+from .mailer import queue_email, send_queued
+from .models import (
+    FAQ, ApiIntegration, ComplianceTrend, OutboundEmail, Project, ScanJob, ScanResult, Stats, StreamTicket, User,
+    SearchDocument, WebhookDelivery,
+)
+from .scanning import claim_batch, claim_jobs, record_scan_result, requeue_stale_jobs, run_jobs
+from .trends import trend_series
+from .throttling import DatabaseBucketStore, MemoryBucketStore
+from .stats import ROLLUP_FIELDS, get_user_stats, rebuild_stats
+from .webhooks import SIGNATURE_HEADER, UnsafeWebhookURL, check_webhook_url, queue_scan_event, send_due
+
+
+def make_user(email="dev@example.com"):
+    return User.objects.create_user(username=email.split("@")[0], email=email, password="pw123456")
+
+
+def make_project(user, name="app"):
+    return Project.objects.create(name=name, uploaded_by=user, file="projects/app.py")
+
+
+def engine_output(critical=0, high=0, medium=0, ethical=80):
+    return {
+        "ethical_score": ethical,
+        "security_score": max(5, ethical - 5),
+        "details": {"critical": critical, "high": high, "medium": medium, "lines_analyzed": 10},
+    }
+
+
+def rollup(user):
+    stats = Stats.objects.get(user=user)
+    return {field: getattr(stats, field) for field in ROLLUP_FIELDS}
+
+
+# ================== STATS ROLLUP ==================
+class StatsRollupTests(TestCase):
+    def test_incremental_rollup_matches_rebuild(self):
+        user = make_user()
+        first, second = make_project(user, "a"), make_project(user, "b")
+        record_scan_result(first, engine_output(critical=2, ethical=70))
+        record_scan_result(first, engine_output(high=1, medium=3, ethical=91))
+        record_scan_result(second, engine_output(medium=1, ethical=55))
+
+        incremental = rollup(user)
+        rebuild_stats([user.id])
+        self.assertEqual(incremental, rollup(user))
+        self.assertEqual(incremental["scans_count"], 3)
+        self.assertEqual(incremental["projects_scanned"], 2)
+
+    def test_first_rollup_includes_older_history(self):
+        # Rollup row ke bagair purani scans (rollup aane se pehle ki)
+        user = make_user()
+        projects = [make_project(user, f"p{i}") for i in range(6)]
+        for project in projects:
+            ScanResult.objects.create(project=project, ethical_score=60, security_score=55, details=engine_output())
+        self.assertFalse(Stats.objects.filter(user=user).exists())
+
+        record_scan_result(projects[0], engine_output(critical=1))
+
+        stats = Stats.objects.get(user=user)
+        self.assertEqual(stats.scans_count, 7)
+        self.assertEqual(stats.projects_scanned, 6)
+        incremental = rollup(user)
+        rebuild_stats([user.id])
+        self.assertEqual(incremental, rollup(user))
+
+    def test_api_edits_refresh_rollup(self):
+        user = make_user()
+        project = make_project(user)
+        first = record_scan_result(project, engine_output(critical=2, ethical=70))
+        record_scan_result(project, engine_output(high=1, ethical=90))
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f"/api/scan-results/{first.id}/", {"ethical_score": 20}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_user_stats(user).ethical_score, 55)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(f"/api/scan-results/{first.id}/")
+        self.assertEqual(response.status_code, 204)
+        stats = get_user_stats(user)
+        self.assertEqual((stats.ethical_score, stats.scans_count, stats.critical), (90, 1, 0))
+
+
+# ================== SEVERITY COUNTS ==================
+class SeverityCountTests(TestCase):
+    def setUp(self):
+        self.project = make_project(make_user())
+
+    def counts(self, scan):
+        scan.refresh_from_db()
+        return [getattr(scan, field) for field in ScanResult.COUNT_FIELDS]
+
+    def test_save_fills_columns_from_details(self):
+        nested = ScanResult.objects.create(project=self.project, details=engine_output(critical=2, high=1, medium=4))
+        flat = ScanResult.objects.create(project=self.project, details={"critical": 1, "high": "3", "total_issues": 9})
+        junk = ScanResult.objects.create(project=self.project, details={"details": {"critical": "many"}, "high": 2})
+        text = ScanResult.objects.create(project=self.project, details="scan failed")
+
+        self.assertEqual(self.counts(nested), [2, 1, 4, 7, 10])
+        self.assertEqual(self.counts(flat), [1, 3, 0, 9, 0])
+        self.assertEqual(self.counts(junk), [0, 0, 0, 0, 0])
+        self.assertEqual(self.counts(text), [0, 0, 0, 0, 0])
+
+        nested.details = engine_output(medium=1)
+        nested.save()
+        self.assertEqual(self.counts(nested), [0, 0, 1, 1, 10])
+
+    def test_backfill_migration_in_batches(self):
+        scans = [
+            ScanResult.objects.create(project=self.project, details=engine_output(critical=i, high=1))
+            for i in range(5)
+        ]
+        scans.append(ScanResult.objects.create(project=self.project, details={"medium": 6}))
+        # Migration se pehle wali rows: columns khaali
+        ScanResult.objects.update(**{field: 0 for field in ScanResult.COUNT_FIELDS})
+
+        backfill = importlib.import_module("core.migrations.0007_backfill_scanresult_counts")
+        with mock.patch.object(backfill, "BATCH_SIZE", 2):
+            backfill.backfill_counts(django_apps, mock.Mock(connection=connection))
+
+        for i, scan in enumerate(scans[:5]):
+            self.assertEqual(self.counts(scan), [i, 1, 0, i + 1, 10])
+        self.assertEqual(self.counts(scans[5]), [0, 0, 6, 6, 0])
+
+
+# ================== DASHBOARD ==================
+class DashboardTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_projects(self, count):
+        for i in range(count):
+            project = make_project(self.user, f"p{i}")
+            record_scan_result(project, engine_output(critical=1, ethical=60))
+            record_scan_result(project, engine_output(high=2, ethical=80))
+
+    def dashboard_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_query_count_does_not_grow_with_history(self):
+        self.add_projects(2)
+        # Pehli request rate limit bucket bhi banati hai
+        self.dashboard_queries()
+        small = self.dashboard_queries()
+        self.add_projects(10)
+        self.assertEqual(self.dashboard_queries(), small)
+
+    def test_totals_and_latest_scan_per_card(self):
+        old, new = make_project(self.user, "old"), make_project(self.user, "new")
+        record_scan_result(old, engine_output(critical=2, ethical=40))
+        record_scan_result(old, engine_output(medium=3, ethical=90))
+        # Purana flat layout bhi ginna hai
+        record_scan_result(new, {"ethical_score": 70, "security_score": 60, "critical": 1, "high": 4})
+
+        data = self.client.get("/api/dashboard/").data
+        self.assertEqual(
+            {key: data["stats"][key] for key in ("critical", "high", "medium", "issues_detected")},
+            {"critical": 3, "high": 4, "medium": 3, "issues_detected": 10},
+        )
+        self.assertEqual(data["stats"]["projects_scanned"], 2)
+        # Har card us project ki aakhri scan dikhata hai: (90 + 85) / 2, (70 + 60) / 2
+        self.assertEqual([(card["id"], card["score"]) for card in data["frameworks"]], [(new.id, 65), (old.id, 87)])
+        self.assertEqual([project["id"] for project in data["projects"]], [new.id, old.id])
+
+
+# ================== COMPLIANCE TREND ==================
+class TrendSeriesTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add(self, when, score):
+        ComplianceTrend.objects.create(user=self.user, month="x", score=score, recorded_at=when)
+
+    def add_two_weeks(self):
+        monday = timezone.make_aware(datetime(2026, 3, 2, 9))
+        self.add(monday, 60)
+        self.add(monday + timedelta(hours=6), 80)
+        self.add(monday + timedelta(days=1), 50)
+        self.add(monday + timedelta(days=8), 90)
+
+    def series(self, **params):
+        response = self.client.get("/api/compliance-trend/", params)
+        self.assertEqual(response.status_code, 200)
+        return [(point["label"], point["score"], point["count"]) for point in response.data["points"]]
+
+    def test_calendar_buckets(self):
+        self.add_two_weeks()
+        self.assertEqual(self.series(), [("Mar 02", 70.0, 2), ("Mar 03", 50.0, 1), ("Mar 10", 90.0, 1)])
+        self.assertEqual(self.series(bucket="week"), [("Mar 02", 63.3, 3), ("Mar 09", 90.0, 1)])
+        self.assertEqual(self.series(bucket="month"), [("Mar 2026", 70.0, 4)])
+        self.assertEqual(self.series(since="2026-03-03", until="2026-03-10"), [("Mar 03", 50.0, 1)])
+
+    def test_points_downsample_keeps_ends_and_peaks(self):
+        # Januari: beech mein DST ka ghanta nahi
+        start = timezone.make_aware(datetime(2026, 1, 5))
+        ComplianceTrend.objects.bulk_create([
+            ComplianceTrend(
+                user=self.user, month="x", score=100 if i == 250 else 50, recorded_at=start + timedelta(hours=i),
+            )
+            for i in range(500)
+        ])
+
+        points = trend_series(self.user, points=20)
+        self.assertEqual(len(points), 20)
+        self.assertEqual(points[0]["time"], start.isoformat())
+        self.assertEqual(points[-1]["time"], (start + timedelta(hours=499)).isoformat())
+        self.assertIn(100, [point["score"] for point in points])
+        self.assertEqual(len(trend_series(self.user, points=1000)), 500)
+
+    def test_bad_params(self):
+        for params in ({"bucket": "year"}, {"points": "1"}, {"points": "x"}, {"since": "yesterday"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/compliance-trend/", params).status_code, 400)
+
+
+# ================== SCAN LANES ==================
+@override_settings(SCAN_LANE_WEIGHTS={"standard": 4, "deep": 1}, SCAN_LANE_MAX_RUNNING={"deep": 1})
+class LaneCapTests(TestCase):
+    def test_batch_claim_respects_deep_cap(self):
+        user = make_user()
+        for i in range(8):
+            ScanJob.objects.create(project=make_project(user, f"deep{i}"), scan_mode="deep")
+
+        jobs = claim_batch("worker-1", size=8, window=0.05)
+
+        self.assertEqual([job.scan_mode for job in jobs], ["deep"])
+        self.assertEqual(ScanJob.objects.filter(status=ScanJob.RUNNING).count(), 1)
+        self.assertEqual(claim_jobs("worker-2", 8, lane="deep"), [])
+
+    def test_standard_lane_not_blocked_by_deep_cap(self):
+        user = make_user()
+        for i in range(3):
+            ScanJob.objects.create(project=make_project(user, f"deep{i}"), scan_mode="deep")
+            ScanJob.objects.create(project=make_project(user, f"std{i}"), scan_mode="standard")
+
+        claimed = [job for _ in range(4) for job in claim_jobs("worker-1", 8)]
+
+        modes = sorted(job.scan_mode for job in claimed)
+        self.assertEqual(modes, ["deep"] + ["standard"] * 3)
+        # Claim par sirf lease; scan shuru hone par started_at
+        self.assertTrue(all(job.started_at is None and job.heartbeat_at for job in claimed))
+
+
+# ================== SCAN QUEUE ==================
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AI_ENGINE_MODE="inprocess")
+class StaleClaimTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_stale_claim_does_not_save_twice(self):
+        user = make_user()
+        project = Project(name="app", uploaded_by=user)
+        project.file.save("app.py", ContentFile(b'password = "x"\neval(1)\n'))
+        job = ScanJob.objects.create(project=project)
+        [stale] = claim_jobs("worker-1")
+
+        # worker-1 ki lease khatam: job requeue hokar worker-2 ke paas
+        ScanJob.objects.filter(id=job.id).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        requeue_stale_jobs()
+        [fresh] = claim_jobs("worker-2")
+
+        run_jobs([fresh])
+        run_jobs([stale])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScanJob.DONE)
+        self.assertEqual(job.worker, "worker-2")
+        self.assertEqual(ScanResult.objects.filter(project=project).count(), 1)
+        self.assertEqual(ComplianceTrend.objects.filter(user=user).count(), 1)
+        self.assertEqual(Stats.objects.get(user=user).scans_count, 1)
+
+
+# ================== SCAN EVENTS ==================
+@override_settings(SCAN_EVENTS_POLL_SECONDS=0, SCAN_EVENTS_MAX_SECONDS=0.2)
+class ScanEventsTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.job = ScanJob.objects.create(project=make_project(self.user), status=ScanJob.RUNNING, bytes_total=100, bytes_scanned=40)
+
+    def read_events(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def ticket(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post("/api/projects/events/ticket/")
+        self.assertEqual(response.status_code, 201)
+        return response.data["ticket"]
+
+    def test_ticket_works_once(self):
+        ticket = self.ticket()
+        self.assertNotIn(ticket, StreamTicket.objects.values_list("ticket_hash", flat=True))
+
+        body = self.read_events(Client().get("/api/projects/events/", {"ticket": ticket}))
+        self.assertIn("event: progress", body)
+        self.assertIn('"percent": 40', body)
+        self.assertEqual(Client().get("/api/projects/events/", {"ticket": ticket}).status_code, 401)
+
+    def test_expired_ticket_rejected(self):
+        ticket = self.ticket()
+        StreamTicket.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(Client().get("/api/projects/events/", {"ticket": ticket}).status_code, 401)
+
+    def test_jwt_in_query_string_rejected(self):
+        token = str(AccessToken.for_user(self.user))
+        self.assertEqual(Client().get("/api/projects/events/", {"token": token}).status_code, 401)
+        response = Client().get("/api/projects/events/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertIn("event: progress", self.read_events(response))
+
+    def test_api_key_accepted(self):
+        integration = ApiIntegration(user=self.user)
+        raw_key = integration.set_api_key()
+        integration.save()
+
+        response = Client().get("/api/projects/events/", HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+        self.assertIn("event: progress", self.read_events(response))
+        bad = Client().get("/api/projects/events/", HTTP_AUTHORIZATION="Api-Key sk_live_nope")
+        self.assertEqual(bad.status_code, 401)
+
+    def test_wsgi_stream_is_sync_iterator(self):
+        ticket = self.ticket()
+        response = Client().get("/api/projects/events/", {"ticket": ticket})
+        # Async iterator hota toh WSGI handler poora stream ruk kar bhejta
+        self.assertFalse(response.is_async)
+        first = next(iter(response.streaming_content))
+        self.assertEqual(first, b"retry: 3000\n\n")
+
+    async def test_asgi_stream(self):
+        ticket = await sync_to_async(self.ticket)()
+        response = await AsyncClient().get("/api/projects/events/", {"ticket": ticket})
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn("event: progress", body)
+
+
+# ================== SCAN ENGINE ==================
+SAMPLES = [
+    'password = "hunter2"\n',
+    "API_KEY:'x'\n",
+    "token\n  =\n 'abc'\n",
+    "secret = os.environ['S']\n",
+    "eval(data)\n",
+    "os.system('ls')\n",
+    "subprocess.Popen(cmd)\n",
+    "url = 'http://example.com'\n",
+    "local = 'http://localhost:8000'\n",
+    "loop = '127.0.0.1'\n",
+    "mail me: dev.ops@example.co.uk\n",
+    "@decorator\n",
+    "a@b\n",
+    "console.log(x); console.log(y)\n",
+    "# TODO: TODOTODO\n",
+    "def f():\n    return 1\n",
+    "\n",
+    "\r\n",
+    "line\rwith\x0bodd\x0cbreaks\u2028\n",
+    "caf\u00e9 = 'na\u00efve'\n",
+]
+
+
+def legacy_scan(content):
+    """user-003 se pehle wala per-rule scan (predict.scan_file_for_issues ki copy)."""
+    critical = high = medium = 0
+    loc = len(content.splitlines())
+    if re.search(r'(password|passwd|secret|api_key|token|auth_key)\s*[:=]\s*["\']', content, re.I):
+        critical += 2
+    if any(func in content for func in ["eval(", "exec(", "os.system(", "subprocess.Popen("]):
+        critical += 3
+    if "http://" in content and "localhost" not in content and "127.0.0.1" not in content:
+        high += 2
+    if re.search(r'[\w\.-]+@[\w\.-]+\.\w+', content):
+        high += 1
+    medium += content.count("console.log")
+    medium += content.count("TODO")
+    if loc > 1000:
+        medium += 1
+    return critical, high, medium, loc
+
+
+def random_sources(seed, count=150, max_lines=300):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(SAMPLES) for _ in range(rng.randint(0, max_lines))) for _ in range(count)]
+
+
+class MatcherEquivalenceTests(SimpleTestCase):
+    def scan_file(self, content):
+        fd, path = tempfile.mkstemp(suffix=".py")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        try:
+            return predict.scan_file_for_issues(path)
+        finally:
+            os.remove(path)
+
+    def test_each_sample_matches_legacy_scan(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                # File text mode mein padhi jati hai (\r\n -> \n), legacy bhi wahi dekhta tha
+                content = sample.replace("\r\n", "\n").replace("\r", "\n")
+                self.assertEqual(self.scan_file(sample), legacy_scan(content))
+
+    def test_random_files_match_legacy_scan(self):
+        sources = random_sources(3) + ["console.log\n" * 1200]
+        for source in sources:
+            content = source.replace("\r\n", "\n").replace("\r", "\n")
+            self.assertEqual(self.scan_file(source), legacy_scan(content))
+
+    def test_chunk_boundaries_do_not_change_counts(self):
+        for source in random_sources(5, count=40):
+            whole = scan_stream(io.StringIO(source))
+            for chunk_size in (1, 7, 64):
+                counter = scan_stream(io.StringIO(source), chunk_size=chunk_size, overlap=64)
+                self.assertEqual(+counter.counts, +whole.counts)
+                self.assertEqual(counter.lines, whole.lines)
+                self.assertEqual(score_counts(counter.counts, counter.lines), legacy_scan(source)[:3])
+
+
+class IncrementalRescanTests(SimpleTestCase):
+    def full_scan(self, text):
+        counter = scan_stream(io.StringIO(text))
+        return +counter.counts, counter.lines
+
+    def edit(self, rng, lines):
+        lines = list(lines)
+        for _ in range(rng.randint(1, 5)):
+            at = rng.randint(0, len(lines))
+            roll = rng.random()
+            if roll < 0.4 or not lines:
+                lines.insert(at, rng.choice(SAMPLES))
+            elif roll < 0.7:
+                del lines[min(at, len(lines) - 1)]
+            else:
+                lines[min(at, len(lines) - 1)] = rng.choice(SAMPLES)
+        return lines
+
+    def test_incremental_rescan_matches_full_scan(self):
+        rng = random.Random(11)
+        for _ in range(100):
+            lines = [rng.choice(SAMPLES) for _ in range(rng.randint(0, 400))]
+            _, _, index = scan_blocks("".join(lines))
+            for _ in range(4):
+                lines = self.edit(rng, lines)
+                text = "".join(lines)
+                counts, loc, index = scan_blocks(text, index)
+                self.assertEqual((+counts, loc), self.full_scan(text))
+
+    def test_small_edit_reuses_other_blocks(self):
+        text = "".join(f"def f{i}():\n    return {i}\n\n" for i in range(2000))
+        _, _, index = scan_blocks(text)
+        edited = text.replace("return 1000\n", "password = 'x'  # TODO\n")
+
+        rescanned = []
+        counts, loc, _ = scan_blocks(edited, index, progress=lambda done, total, hits: rescanned.append(done))
+
+        self.assertEqual((+counts, loc), self.full_scan(edited))
+        self.assertEqual(len(rescanned), 1)
+        self.assertGreater(len(split_blocks(edited)), 50)
+
+    def minified(self, rng, parts):
+        # Ek hi line: samples ";" / "," / "{" se jude (jaise minified bundle)
+        return "".join(rng.choice(SAMPLES).rstrip("\n") + rng.choice(";,{} ") for _ in range(parts))
+
+    def test_long_line_is_cut_into_bounded_blocks(self):
+        rng = random.Random(17)
+        text = self.minified(rng, 40000)
+        _, _, index = scan_blocks(text)
+        blocks = split_blocks(text)
+
+        self.assertEqual("".join(blocks), text)
+        self.assertGreater(len(blocks), 20)
+        self.assertLessEqual(max(map(len, blocks)), MAX_BLOCK_CHARS + LONG_LINE_CHARS)
+
+        # Beech mein chhota edit: baaki blocks dobara scan nahi hote
+        middle = len(text) // 2
+        edited = text[:middle] + "eval(x);" + text[middle:]
+        rescanned = []
+        counts, loc, _ = scan_blocks(edited, index, progress=lambda done, total, hits: rescanned.append(done))
+        self.assertEqual((+counts, loc), self.full_scan(edited))
+        self.assertLessEqual(len(rescanned), 3)
+
+    def test_long_lines_match_full_scan(self):
+        rng = random.Random(23)
+        for _ in range(20):
+            lines = [self.minified(rng, rng.randint(0, 3000)) + "\n" for _ in range(rng.randint(1, 4))]
+            lines += [rng.choice(SAMPLES) for _ in range(rng.randint(0, 200))]
+            rng.shuffle(lines)
+            text = "".join(lines)
+            counts, loc, index = scan_blocks(text)
+            self.assertEqual((+counts, loc), self.full_scan(text))
+            text = "".join(self.edit(rng, lines))
+            counts, loc, _ = scan_blocks(text, index)
+            self.assertEqual((+counts, loc), self.full_scan(text))
+
+    def test_uncuttable_file_falls_back_to_stream(self):
+        fd, path = tempfile.mkstemp(suffix=".js")
+        with os.fdopen(fd, "w") as f:
+            f.write("a" * (2 * 1024 * 1024) + " password = 'x'\n")
+        self.addCleanup(os.remove, path)
+
+        self.assertIsNone(scan_file_blocks(path, LRUScanCache(), "7:big"))
+        self.assertEqual(predict.scan_file_for_issues(path, cache=LRUScanCache(), lineage="7:big"), (2, 0, 0, 1))
+
+    def test_static_analysis_with_lineage_matches_plain_scan(self):
+        cache = LRUScanCache()
+        fd, path = tempfile.mkstemp(suffix=".py")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        base = "".join(SAMPLES) * 50
+        for version in (base, base.replace("eval(data)", "safe(data)", 3), base + "console.log(1)\n"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(version)
+            self.assertEqual(
+                predict.static_analysis(path, cache=cache, lineage="7:app"),
+                predict.static_analysis(path),
+            )
+
+
+class FakeModel:
+    """model.pkl ki jagah: har row ko ``score`` deta hai, calls yaad rakhta hai."""
+
+    def __init__(self, score=90, error=None):
+        self.score = score
+        self.error = error
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(X.shape)
+        if self.error:
+            raise self.error
+        return [self.score] * len(X)
+
+
+class BatchPredictTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.paths = []
+        for i, source in enumerate(["eval(x)\n", "password = 'x'\n" * 3, "console.log(1)\n" * 5]):
+            path = os.path.join(self.dir, f"f{i}.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            self.paths.append(path)
+
+    def scan(self, scanner, model, paths):
+        with mock.patch.object(inference.model_registry, "get", return_value=model):
+            return scanner.scan_batch([ScanRequest(path, "standard", "GDPR") for path in paths])
+
+    def test_one_predict_call_per_batch(self):
+        model = FakeModel(score=90)
+        scanner = Scanner(cache=LRUScanCache())
+        missing = os.path.join(self.dir, "gone.py")
+        outcomes = self.scan(scanner, model, self.paths + [missing])
+
+        self.assertEqual(model.calls, [(3, 8)])
+        self.assertIsInstance(outcomes[3], ScanError)
+        for path, result in zip(self.paths, outcomes):
+            static = predict.static_analysis(path)["ethical_score"]
+            self.assertEqual(result["ethical_score"], int((static + 90) / 2))
+            self.assertEqual(result["security_score"], max(5, result["ethical_score"] - 5))
+
+        # Dobara wahi files: sab cache se, model nahi chalta
+        self.assertEqual(self.scan(scanner, model, self.paths), outcomes[:3])
+        self.assertEqual(model.calls, [(3, 8)])
+
+    def test_model_failure_keeps_static_scores(self):
+        model = FakeModel(error=ValueError("bad input"))
+        outcomes = self.scan(Scanner(cache=LRUScanCache()), model, self.paths)
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(
+            [result["ethical_score"] for result in outcomes],
+            [predict.static_analysis(path)["ethical_score"] for path in self.paths],
+        )
+
+
+class FeatureRowTests(SimpleTestCase):
+    result = {"details": {"lines_analyzed": 120, "total_issues": 9, "critical": 2, "high": 3, "medium": 4}}
+
+    def test_row_follows_train_columns(self):
+        self.assertEqual(
+            feature_row(self.result, "PCI DSS", "deep", FeatureEncoder()),
+            [3, 0, 1, 120, 9, 2, 3, 4],
+        )
+        archive_result = {"details": dict(self.result["details"], file_count=7)}
+        self.assertEqual(feature_row(archive_result, "owasp", "standard", FeatureEncoder())[:3], [2, 1, 7])
+
+    def test_unknown_values_fall_back(self):
+        # "General AI" (Project.framework default) aur scan type na ho: GDPR / standard
+        self.assertEqual(feature_row(self.result, "General AI", None, FeatureEncoder())[:2], [0, 1])
+
+    def test_encoder_matches_label_encoders(self):
+        encoders = {
+            "compliance_framework": LabelEncoder().fit(["OWASP", "GDPR", "PCI-DSS", "ISO 27001", "GDPR"]),
+            "scan_type": LabelEncoder().fit(["standard", "deep"]),
+        }
+        encoder = FeatureEncoder.from_label_encoders(encoders)
+        self.assertEqual(encoder.to_dict(), FeatureEncoder().to_dict())
+        self.assertEqual(get_encoder().to_dict(), encoder.to_dict())
+        for value in ["GDPR", "ISO 27001", "OWASP", "PCI-DSS"]:
+            self.assertEqual(
+                encoder.encode("compliance_framework", value),
+                encoders["compliance_framework"].transform([value])[0],
+            )
+
+    def test_matrix_has_training_columns(self):
+        rows = [feature_row(self.result, "GDPR", "deep"), feature_row(self.result, "OWASP", "standard")]
+        matrix = feature_matrix(rows)
+        self.assertEqual(list(matrix.columns), FEATURE_COLUMNS)
+        self.assertEqual(matrix.shape, (2, 8))
+
+    def test_cache_key_depends_on_encoded_inputs(self):
+        self.assertEqual(feature_context("PCI DSS", "deep"), feature_context("pci-dss", "deep"))
+        self.assertNotEqual(feature_context("GDPR", "deep"), feature_context("OWASP", "deep"))
+        self.assertNotEqual(feature_context("GDPR", "deep"), feature_context("GDPR", "standard"))
+
+
+# ================== ARCHIVES ==================
+ARCHIVE_MEMBERS = {
+    "app/settings.py": 'SECRET = 1\npassword = "hunter2"\n',
+    "app/views.py": "def run(cmd):\n    eval(cmd)  # TODO\n",
+    "web/main.js": "console.log('http://example.com'); mail('dev@example.com')\n",
+    "logo.png": b"\x89PNG\x00\x00binary",
+}
+
+
+def build_archive(directory, kind, members, name="project"):
+    path = os.path.join(directory, f"{name}.{'zip' if kind == archive.ZIP else 'tar.gz'}")
+    if kind == archive.ZIP:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for member, content in members.items():
+                zf.writestr(member, content)
+    else:
+        with tarfile.open(path, "w:gz") as tf:
+            for member, content in members.items():
+                data = content if isinstance(content, bytes) else content.encode()
+                info = tarfile.TarInfo(member)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+class ParallelArchiveTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.members = dict(ARCHIVE_MEMBERS)
+        for i, source in enumerate(random_sources(9, count=12, max_lines=80)):
+            self.members[f"src/module{i}.py"] = source
+        self.members["src/deep/config.py"] = 'api_key = "sk_live_planted"\n'
+
+    def single_file_scan(self, name):
+        """Member ko alag file bana kar purana single-file scan."""
+        path = os.path.join(self.directory, "member.txt")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(self.members[name])
+        return predict.scan_file_for_issues(path)
+
+    def test_pool_matches_serial_and_single_file_scans(self):
+        self.addCleanup(lambda: archive._pool and archive._pool.shutdown())
+        for kind in (archive.ZIP, archive.TAR):
+            path = build_archive(self.directory, kind, self.members)
+            serial = archive.scan_archive(path, workers=1)
+            # Chhote archive ko bhi pool par, kai batches mein
+            with mock.patch.multiple(archive, SERIAL_MAX_MEMBERS=0, SERIAL_MAX_BYTES=0, BATCH_BYTES=2048):
+                parallel = archive.scan_archive(path, workers=2)
+            self.assertIsNotNone(archive._pool)
+
+            self.assertEqual(parallel, serial)
+            self.assertEqual(serial["skipped"], ["logo.png"])
+            by_path = {f["path"]: f for f in serial["files"]}
+            self.assertEqual(set(by_path), set(self.members) - {"logo.png"})
+            for name, result in by_path.items():
+                expected = self.single_file_scan(name)
+                self.assertEqual((result["critical"], result["high"], result["medium"], result["lines_analyzed"]), expected)
+            self.assertEqual(by_path["src/deep/config.py"]["critical"], 2)
+
+
+class ArchiveCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def test_first_upload_reads_members_once(self):
+        for kind in (archive.ZIP, archive.TAR):
+            path = build_archive(self.directory, kind, ARCHIVE_MEMBERS)
+            with mock.patch.object(archive, "iter_member_streams", wraps=archive.iter_member_streams) as reads:
+                result = archive.scan_archive(path, workers=1, cache=LRUScanCache(), lineage="7:app")
+            # Hash aur scan ek hi read mein
+            self.assertEqual(reads.call_count, 1)
+            self.assertEqual(result, archive.scan_archive(path, workers=1))
+
+    def test_unchanged_rescan_scans_nothing(self):
+        cache = LRUScanCache()
+        for kind in (archive.ZIP, archive.TAR):
+            path = build_archive(self.directory, kind, ARCHIVE_MEMBERS)
+            first = archive.scan_archive(path, workers=1, cache=cache, lineage="7:app")
+
+            scanned = []
+            with mock.patch.object(archive, "scan_member_stream", side_effect=lambda raw: scanned.append(raw)):
+                again = archive.scan_archive(path, workers=1, cache=cache, lineage="7:app")
+            self.assertEqual(scanned, [])
+            self.assertEqual(again, first)
+            self.assertEqual(again["skipped"], ["logo.png"])
+
+    def test_changed_member_is_the_only_rescan(self):
+        cache = LRUScanCache()
+        archive.scan_archive(build_archive(self.directory, archive.ZIP, ARCHIVE_MEMBERS), workers=1, cache=cache, lineage="7:app")
+        changed = dict(ARCHIVE_MEMBERS, **{"app/views.py": "def run(cmd):\n    return cmd\n"})
+        path = build_archive(self.directory, archive.ZIP, changed, name="v2")
+
+        scanned = []
+        real = archive.scan_member_stream
+        with mock.patch.object(archive, "scan_member_stream", side_effect=lambda raw: scanned.append(raw) or real(raw)):
+            result = archive.scan_archive(path, workers=1, cache=cache, lineage="7:app")
+        self.assertEqual(len(scanned), 1)
+        self.assertEqual(result, archive.scan_archive(path, workers=1))
+
+    def test_total_uncompressed_size_is_capped(self):
+        members = {f"part{i}.txt": "x" * 1000 for i in range(5)}
+        path = build_archive(self.directory, archive.ZIP, members)
+        with mock.patch.object(archive, "MAX_TOTAL_BYTES", 3000):
+            kept, skipped = archive.list_members(path, archive.ZIP)
+        self.assertEqual([name for name, _ in kept], ["part0.txt", "part1.txt", "part2.txt"])
+        self.assertEqual(skipped, ["part3.txt", "part4.txt"])
+
+
+# ================== WEBHOOKS ==================
+class WebhookReceiver(BaseHTTPRequestHandler):
+    """Local stand-in endpoint: har POST ``server.requests`` mein, jawab ``server.status``."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((dict(self.headers), body))
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(WEBHOOK_ALLOW_PRIVATE_URLS=True, WEBHOOK_COALESCE_SECONDS=0, WEBHOOK_RETRY_SECONDS=30)
+class WebhookDeliveryTests(TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), WebhookReceiver)
+        self.server.requests = []
+        self.server.status = 200
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.user = make_user()
+        self.project = make_project(self.user)
+        self.integration = ApiIntegration.objects.create(
+            user=self.user, webhook_url=f"http://127.0.0.1:{self.server.server_port}/hook",
+        )
+
+    def test_burst_is_one_signed_post(self):
+        for _ in range(3):
+            queue_scan_event(self.project, "scan.completed", scan=record_scan_result(self.project, engine_output()))
+
+        self.assertEqual(send_due(), 3)
+
+        [(headers, body)] = self.server.requests
+        self.assertEqual(headers["X-ESCC-Event-Count"], "3")
+        self.assertEqual(len(json.loads(body)["events"]), 3)
+        timestamp, signature = [part.split("=", 1)[1] for part in headers[SIGNATURE_HEADER].split(",")]
+        expected = hmac.new(self.integration.webhook_secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256)
+        self.assertTrue(hmac.compare_digest(signature, expected.hexdigest()))
+        self.assertEqual(WebhookDelivery.objects.filter(status=WebhookDelivery.DELIVERED).count(), 3)
+
+    def test_server_error_backs_off(self):
+        self.server.status = 500
+        delivery = queue_scan_event(self.project, "scan.failed", error="boom")
+
+        before = timezone.now()
+        self.assertEqual(send_due(), 0)
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.attempts, delivery.response_status), (WebhookDelivery.QUEUED, 1, 500))
+        self.assertGreaterEqual(delivery.next_attempt_at, before + timedelta(seconds=30))
+
+        # Backoff khatam hone se pehle dobara nahi bheji jati
+        self.assertEqual(send_due(), 0)
+        self.assertEqual(len(self.server.requests), 1)
+
+        self.server.status = 204
+        WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_due(), 1)
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.attempts), (WebhookDelivery.DELIVERED, 1))
+
+    def test_private_url_fails_without_request(self):
+        delivery = queue_scan_event(self.project, "scan.completed")
+        with override_settings(WEBHOOK_ALLOW_PRIVATE_URLS=False), self.assertLogs("core.webhooks", "ERROR"):
+            self.assertEqual(send_due(), 0)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, WebhookDelivery.FAILED)
+        self.assertEqual(self.server.requests, [])
+
+
+@override_settings(WEBHOOK_ALLOW_PRIVATE_URLS=False)
+class WebhookURLTests(SimpleTestCase):
+    def test_private_addresses_rejected(self):
+        for url in [
+            "https://127.0.0.1/hook",
+            "https://169.254.169.254/latest/meta-data/",
+            "https://[::ffff:127.0.0.1]/hook",
+            "https://[::ffff:169.254.169.254]/hook",
+            "https://[::1]/hook",
+            "https://10.0.0.5/hook",
+            "https://localhost/hook",
+            "http://93.184.216.34/hook",
+        ]:
+            with self.subTest(url=url):
+                with self.assertRaises(UnsafeWebhookURL):
+                    check_webhook_url(url, resolve=False)
+
+    def test_public_https_allowed(self):
+        check_webhook_url("https://93.184.216.34/hook", resolve=False)
+        check_webhook_url("https://hooks.example.com/escc", resolve=False)
+
+
+# ================== API KEYS ==================
+class ApiKeyAuthenticationTests(TestCase):
+    def setUp(self):
+        _key_cache.clear()
+        self.addCleanup(_key_cache.clear)
+        self.user = make_user()
+        self.integration = ApiIntegration(user=self.user)
+        self.raw_key = self.integration.set_api_key()
+        self.integration.save()
+
+    def authenticate(self, raw_key):
+        request = RequestFactory().get("/api/profile/", HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+        return ApiKeyAuthentication().authenticate(request)
+
+    def test_only_hash_is_stored(self):
+        self.integration.refresh_from_db()
+        self.assertEqual(self.integration.api_key_hash, ApiIntegration.hash_key(self.raw_key))
+        self.assertNotIn(self.raw_key, str(ApiIntegration.objects.values().get()))
+
+        response = APIClient().get("/api/profile/", HTTP_X_API_KEY=self.raw_key)
+        self.assertEqual(response.status_code, 200)
+
+    def test_cache_hit_makes_no_queries(self):
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(self.raw_key)
+        with self.assertNumQueries(0):
+            again, _ = self.authenticate(self.raw_key)
+        self.assertEqual(again.pk, user.pk)
+
+        # Anjaan key bhi cache hoti hai
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate("sk_live_unknown")
+        with self.assertNumQueries(0), self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate("sk_live_unknown")
+
+    def test_each_request_gets_its_own_user(self):
+        first, _ = self.authenticate(self.raw_key)
+        first.first_name = "changed by request one"
+        first.is_staff = True
+        with self.assertNumQueries(0):
+            second, _ = self.authenticate(self.raw_key)
+        self.assertIsNot(second, first)
+        self.assertEqual((second.first_name, second.is_staff), ("", False))
+
+    def test_regenerate_invalidates_old_key(self):
+        self.authenticate(self.raw_key)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post("/api/apiintegration/regenerate/")
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate(self.raw_key)
+        user, _ = self.authenticate(response.data["api_key"])
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_deactivated_user_rejected(self):
+        self.authenticate(self.raw_key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate(self.raw_key)
+
+
+# ================== RATE LIMITS ==================
+class TokenBucketTests(TestCase):
+    def test_bucket_allows_burst_then_refills(self):
+        for store in (MemoryBucketStore(), DatabaseBucketStore()):
+            with self.subTest(store=type(store).__name__), mock.patch("core.throttling.time.time", return_value=1000.0) as now:
+                # 2 ka burst, 1 token / second
+                self.assertEqual([store.take("k", 2, 1.0) for _ in range(2)], [0.0, 0.0])
+                self.assertEqual(store.take("k", 2, 1.0), 1.0)
+                now.return_value = 1000.5
+                self.assertEqual(store.take("k", 2, 1.0), 0.5)
+                now.return_value = 1001.0
+                self.assertEqual(store.take("k", 2, 1.0), 0.0)
+                self.assertEqual(store.take("other", 2, 1.0), 0.0)
+
+    @override_settings(RATE_LIMITS={"user": "2/min", "api_key": "2/min", "anon": "2/min", "scan": "20/min"})
+    def test_429_with_retry_after(self):
+        client = APIClient()
+        client.force_authenticate(make_user())
+        self.assertEqual([client.get("/api/profile/").status_code for _ in range(2)], [200, 200])
+
+        response = client.get("/api/profile/")
+        self.assertEqual(response.status_code, 429)
+        # 2/min: agla token 30 second mein
+        self.assertEqual(response["Retry-After"], "30")
+
+    @override_settings(SCAN_MAX_IN_FLIGHT_PER_USER=1, SCAN_ADMISSION_RETRY_SECONDS=45)
+    def test_in_flight_scan_cap(self):
+        user = make_user()
+        client = APIClient()
+        client.force_authenticate(user)
+        ScanJob.objects.create(project=make_project(user), status=ScanJob.RUNNING)
+
+        response = client.post("/api/projects/", {
+            "name": "second", "file": SimpleUploadedFile("app.py", b"print(1)\n"),
+            "description": '{"framework": "GDPR", "scanType": "standard"}',
+        }, format="multipart")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "45")
+        self.assertEqual(Project.objects.filter(uploaded_by=user).count(), 1)
+
+
+# ================== EMAIL OUTBOX ==================
+class FailingEmailBackend(BaseEmailBackend):
+    """SMTP stand-in: ``error`` raise karta hai (EMAIL_BACKEND="core.tests.FailingEmailBackend")."""
+
+    error = smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+    def send_messages(self, messages):
+        raise self.error
+
+
+@override_settings(EMAIL_OUTBOX_RETRY_SECONDS=60, EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class OutboxTests(TestCase):
+    def test_locmem_send_marks_sent(self):
+        first = queue_email("Welcome", "Hi there", ["a@example.com"], html_body="<p>Hi there</p>")
+        queue_email("Report", "Your report", ["b@example.com"])
+
+        self.assertEqual(send_queued(), 2)
+
+        self.assertEqual([message.to for message in mail.outbox], [["a@example.com"], ["b@example.com"]])
+        self.assertEqual(mail.outbox[0].alternatives[0].content, "<p>Hi there</p>")
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts, first.last_error), (OutboundEmail.SENT, 1, ""))
+        self.assertEqual(send_queued(), 0)
+
+    def test_file_backend_writes_message(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        queue_email("Contact", "Thanks for writing", ["c@example.com"])
+
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.filebased.EmailBackend", EMAIL_FILE_PATH=directory):
+            self.assertEqual(send_queued(), 1)
+
+        [name] = os.listdir(directory)
+        with open(os.path.join(directory, name)) as f:
+            self.assertIn("Subject: Contact", f.read())
+
+    @override_settings(EMAIL_BACKEND="core.tests.FailingEmailBackend")
+    def test_smtp_failure_backs_off_then_fails(self):
+        email = queue_email("Alert", "Scan failed", ["d@example.com"])
+
+        before = timezone.now()
+        with self.assertLogs("core.mailer", "ERROR"):
+            for attempt in range(1, 4):
+                self.assertEqual(send_queued(), 0)
+                email.refresh_from_db()
+                self.assertEqual(email.attempts, attempt)
+                self.assertIn("unexpectedly closed", email.last_error)
+                if attempt < 3:
+                    # 60s, phir 120s; tab tak dobara claim nahi hoti
+                    self.assertEqual(email.status, OutboundEmail.QUEUED)
+                    self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=60 * 2 ** (attempt - 1)))
+                    self.assertEqual(send_queued(), 0)
+                    self.assertEqual(OutboundEmail.objects.get(pk=email.pk).attempts, attempt)
+                    OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(email.status, OutboundEmail.FAILED)
+
+    @override_settings(EMAIL_BACKEND="core.tests.FailingEmailBackend")
+    def test_refused_recipient_is_not_retried(self):
+        email = queue_email("Alert", "Scan failed", ["nobody@example.com"])
+        refused = smtplib.SMTPRecipientsRefused({"nobody@example.com": (550, b"No such user")})
+        with mock.patch.object(FailingEmailBackend, "error", refused), self.assertLogs("core.mailer", "ERROR"):
+            send_queued()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.FAILED, 1))
+
+
+# ================== EMAIL TEMPLATES ==================
+class EmailTemplateTests(SimpleTestCase):
+    def test_thank_you_plain_text(self):
+        html_body, text = emails.render_email("emails/thank_you.html", {"name": "O'Brien & Co"})
+
+        self.assertIn("O&#x27;Brien &amp; Co", html_body)
+        self.assertTrue(text.startswith("Ethical Software Compliance\n\nHi O'Brien & Co,\n"))
+        self.assertIn("within 24-48 business hours.", text)
+        self.assertIn("Best Regards,\nSupport Team", text)
+        self.assertIn("\u00a9 2026 Ethical Software Compliance.", text)
+        self.assertNotIn("font-family", text)
+        self.assertNotIn("<", text)
+
+    def test_table_cells_are_spaced(self):
+        source = "<table><tr><th>Score:</th><td>{{ score }}</td></tr><tr><td>Name:</td><td>{{ name }}</td></tr></table>"
+        text = Template(emails.text_source(source)).render(Context({"score": 80, "name": "Ann's app"}))
+        self.assertEqual(text, "Score: 80\nName: Ann's app\n")
+
+    def test_render_many_matches_render_email(self):
+        contexts = [{"name": name} for name in ("Ann", "O'Brien", "<b>Bob</b>")]
+        self.assertEqual(
+            list(emails.render_many("emails/thank_you.html", contexts)),
+            [emails.render_email("emails/thank_you.html", context) for context in contexts],
+        )
+
+    def test_only_latest_template_version_is_kept(self):
+        self.addCleanup(emails._text_templates.clear)
+        html_template = emails._html_template("emails/thank_you.html")
+        emails._text_template("emails/thank_you.html", html_template)
+        changed = Template(html_template.source.replace("Hi", "Hello"), engine=html_template.engine)
+        changed_text = emails._text_template("emails/thank_you.html", changed)
+
+        self.assertEqual(len(emails._text_templates), 1)
+        self.assertIn("Hello Ann", changed_text.render(Context({"name": "Ann"})))
+
+
+# ================== LIST API ==================
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(set(response.data), {"next", "previous", "results"})
+            ids += [row["id"] for row in response.data["results"]]
+            url, pages = response.data["next"], pages + 1
+        return ids, pages
+
+    def test_project_pages_cover_everything_once(self):
+        projects = [make_project(self.user, f"p{i}") for i in range(7)]
+        make_project(make_user("other@example.com"), "not mine")
+
+        ids, pages = self.walk("/api/projects/?page_size=3")
+
+        self.assertEqual(ids, sorted((p.id for p in projects), reverse=True))
+        self.assertEqual(pages, 3)
+
+    def test_new_rows_do_not_shift_later_pages(self):
+        projects = [make_project(self.user, f"p{i}") for i in range(6)]
+        first = self.client.get("/api/projects/?page_size=3").data
+        make_project(self.user, "uploaded while paging")
+
+        second = self.client.get(first["next"]).data
+        self.assertEqual([row["id"] for row in second["results"]], [p.id for p in projects[2::-1]])
+        previous = self.client.get(second["previous"]).data
+        self.assertEqual(previous["results"], first["results"])
+
+    def test_scan_results_tie_break_on_id(self):
+        project = make_project(self.user)
+        scans = [record_scan_result(project, engine_output(ethical=50 + i)) for i in range(5)]
+        ScanResult.objects.update(scanned_at=timezone.now())
+
+        ids, _ = self.walk("/api/scan-results/?page_size=2")
+        self.assertEqual(ids, [scan.id for scan in reversed(scans)])
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.scan = record_scan_result(make_project(self.user), engine_output(critical=1, ethical=70))
+
+    def test_fields_trim_reads(self):
+        response = self.client.get("/api/scan-results/?fields=id,ethical_score")
+        self.assertEqual(response.data["results"], [{"id": self.scan.id, "ethical_score": 70}])
+
+        response = self.client.get(f"/api/scan-results/{self.scan.id}/?fields=id,critical")
+        self.assertEqual(response.data, {"id": self.scan.id, "critical": 1})
+
+    def test_fields_ignored_on_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/scan-results/{self.scan.id}/?fields=id", {"ethical_score": 40}, format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["ethical_score"], 40)
+        self.assertIn("project_name", response.data)
+        self.scan.refresh_from_db()
+        self.assertEqual(self.scan.ethical_score, 40)
+
+
+# ================== HELP CENTER ==================
+@override_settings(HELP_CENTER_CACHE="default")
+class HelpCenterCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(make_user())
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get("/api/help-center/", **headers)
+
+    def test_etag_gives_304_without_rebuilding(self):
+        FAQ.objects.create(question="Upload limits", answer="50 MB.")
+        with mock.patch.object(helpcenter, "build_payload", wraps=helpcenter.build_payload) as build:
+            first = self.get()
+            again = self.get()
+            unchanged = self.get(first["ETag"])
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([faq["question"] for faq in first.data["faq"]], ["Upload limits"])
+        self.assertEqual(again.data, first.data)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged["ETag"], first["ETag"])
+
+    def test_save_and_delete_invalidate_after_commit(self):
+        first = self.get()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            faq = FAQ.objects.create(question="Billing")
+            # Commit se pehle purana version hi
+            self.assertEqual(self.get(first["ETag"]).status_code, 304)
+        for callback in callbacks:
+            callback()
+
+        saved = self.get(first["ETag"])
+        self.assertEqual(saved.status_code, 200)
+        self.assertNotEqual(saved["ETag"], first["ETag"])
+        self.assertEqual([item["question"] for item in saved.data["faq"]], ["Billing"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faq.delete()
+        deleted = self.get(saved["ETag"])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(deleted.data["faq"], [])
+
+
+# ================== HELP CENTER SEARCH ==================
+class HelpSearchTests(TestCase):
+    def add_faq(self, question, answer=""):
+        with self.captureOnCommitCallbacks(execute=True):
+            return FAQ.objects.create(question=question, answer=answer)
+
+    def test_index_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            faq = FAQ.objects.create(question="Upload limits", answer="Zip files up to 50 MB.")
+            self.assertEqual(search.search("upload"), [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual([hit["id"] for hit in search.search("upload")], [faq.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faq.delete()
+        self.assertEqual(search.search("upload"), [])
+        self.assertFalse(SearchDocument.objects.exists())
+
+    def test_title_match_ranks_first(self):
+        body_hit = self.add_faq("Project settings", "You can upload a new version from the project page.")
+        title_hit = self.add_faq("Upload a project", "Pick a zip file and press the button.")
+        self.add_faq("Billing", "Invoices are sent every month.")
+
+        hits = search.search("upload")
+        self.assertEqual([hit["id"] for hit in hits], [title_hit.id, body_hit.id])
+        self.assertGreater(hits[0]["score"], hits[1]["score"])
+
+    def test_prefix_match(self):
+        exact = self.add_faq("Upload", "Upload steps.")
+        longer = self.add_faq("Uploading archives", "Uploading zip and tar files.")
+        self.add_faq("Billing", "Invoices are sent every month.")
+
+        # Aakhri word adhoora bhi chalega; pura word exact match se upar
+        self.assertEqual({hit["id"] for hit in search.search("uplo")}, {exact.id, longer.id})
+        self.assertEqual(search.search("upload")[0]["id"], exact.id)
+        # Har word match hona chahiye
+        self.assertEqual([hit["id"] for hit in search.search("uploading tar")], [longer.id])
+
+    def test_search_endpoint(self):
+        faq = self.add_faq("Upload a project", "Pick a zip file.")
+        client = APIClient()
+        client.force_authenticate(make_user())
+        response = client.get("/api/help-center/search/?q=zip+uplo&type=faq")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([hit["id"] for hit in response.data["results"]], [faq.id])
@@ -0,0 +1,189 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from .authentication import ApiKeyAuthentication
+from .models import RateLimitBucket, ScanJob, User
+
+PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+def parse_rate(rate):
+    """``"120/min"`` -> ``(capacity, tokens per second)``. Burst = capacity."""
+    count, period = rate.split("/")
+    count = int(count)
+    return count, count / PERIODS[period.strip().lower()]
+
+
+def _refill(tokens, updated_at, now, capacity, refill_rate):
+    return min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+
+
+def _take(tokens, cost, refill_rate):
+    """``(tokens left, retry after seconds)``; retry 0 matlab allowed."""
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / refill_rate
+
+
+# ================== STORES ==================
+class MemoryBucketStore:
+    """
+    Process ke andar buckets. Tez, lekin har gunicorn worker ki apni
+    ginti (N workers = N guna limit); isliye default DatabaseBucketStore hai.
+    """
+
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, cost=1):
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens, retry_after = _take(_refill(tokens, updated_at, now, capacity, refill_rate), cost, refill_rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.MAX_KEYS:
+                self._prune(now)
+        return retry_after
+
+    def _prune(self, now):
+        # Ghante bhar idle bucket (aam rates par) dobara bhar chuka hota hai; naya bhi full banta hai
+        self._buckets = {
+            key: (tokens, updated_at)
+            for key, (tokens, updated_at) in self._buckets.items()
+            if now - updated_at < 3600
+        }
+
+
+class DatabaseBucketStore:
+    """Buckets RateLimitBucket table mein: sab processes / machines ek hi limit dekhte hain."""
+
+    def take(self, key, capacity, refill_rate, cost=1):
+        now = time.time()
+        with transaction.atomic():
+            RateLimitBucket.objects.get_or_create(key=key, defaults={"tokens": capacity, "updated_at": now})
+            bucket = RateLimitBucket.objects.select_for_update().get(key=key)
+            tokens = _refill(bucket.tokens, bucket.updated_at, now, capacity, refill_rate)
+            bucket.tokens, retry_after = _take(tokens, cost, refill_rate)
+            bucket.updated_at = now
+            bucket.save(update_fields=["tokens", "updated_at"])
+        return retry_after
+
+
+STORES = {
+    "memory": MemoryBucketStore,
+    "database": DatabaseBucketStore,
+}
+_store = None
+
+
+def get_store():
+    """RATE_LIMIT_STORE: "memory", "database" ya kisi class ka dotted path."""
+    global _store
+    if _store is None:
+        name = settings.RATE_LIMIT_STORE
+        _store = (STORES[name] if name in STORES else import_string(name))()
+    return _store
+
+
+# ================== DRF THROTTLES ==================
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket per ``get_key``; rate RATE_LIMITS[scope] se. Request
+    reject ho toh DRF 429 deta hai aur ``wait()`` se Retry-After header.
+    """
+
+    scope = None
+
+    def __init__(self):
+        self.retry_after = 0.0
+
+    def get_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        key = self.get_key(request, view)
+        rate = settings.RATE_LIMITS.get(self.scope)
+        if key is None or not rate:
+            return True
+        capacity, refill_rate = parse_rate(rate)
+        self.retry_after = get_store().take(f"{self.scope}:{key}", capacity, refill_rate)
+        return self.retry_after == 0
+
+    def wait(self):
+        return math.ceil(self.retry_after)
+
+
+def _is_api_key_request(request):
+    return isinstance(getattr(request, "successful_authenticator", None), ApiKeyAuthentication)
+
+
+class UserRateThrottle(TokenBucketThrottle):
+    """Login (JWT / session) wale users; API key requests ApiKeyRateThrottle mein."""
+
+    scope = "user"
+
+    def get_key(self, request, view):
+        if _is_api_key_request(request):
+            return None
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class AnonRateThrottle(TokenBucketThrottle):
+    scope = "anon"
+
+    def get_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class ApiKeyRateThrottle(TokenBucketThrottle):
+    """Har API key ka apna bucket (request.auth = key hash)."""
+
+    scope = "api_key"
+
+    def get_key(self, request, view):
+        return request.auth if _is_api_key_request(request) else None
+
+
+class ScanRateThrottle(TokenBucketThrottle):
+    """Scan uploads per user, auth ka tareeqa koi bhi ho."""
+
+    scope = "scan"
+
+    def get_key(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+# ================== SCAN ADMISSION ==================
+IN_FLIGHT = (ScanJob.QUEUED, ScanJob.RUNNING)
+
+
+def admit_scan(user):
+    """
+    Per-user cap on queued + running scans. Caller ki transaction ke andar
+    call karein: user row lock hoti hai (Postgres), taake do parallel uploads
+    dono cap ke neeche na dekhein.
+    """
+    limit = settings.SCAN_MAX_IN_FLIGHT_PER_USER
+    if not limit:
+        return
+    User.objects.select_for_update().filter(pk=user.pk).first()
+    in_flight = ScanJob.objects.filter(project__uploaded_by=user, status__in=IN_FLIGHT).count()
+    if in_flight >= limit:
+        raise Throttled(
+            wait=settings.SCAN_ADMISSION_RETRY_SECONDS,
+            detail=f"You already have {in_flight} scans in progress (limit {limit}). Try again when one finishes.",
+        )
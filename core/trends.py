@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import TruncDay, TruncHour, TruncMinute, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import ComplianceTrend
+
+# Calendar buckets jo API se maange ja sakte hain
+BUCKETS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+# points= ke liye DB pre-aggregation: motay se barik, approx length ke saath
+PRE_BUCKETS = [
+    ("month", TruncMonth, timedelta(days=30)),
+    ("week", TruncWeek, timedelta(days=7)),
+    ("day", TruncDay, timedelta(days=1)),
+    ("hour", TruncHour, timedelta(hours=1)),
+    ("minute", TruncMinute, timedelta(minutes=1)),
+]
+# LTTB ko chunne ke liye target se itne guna buckets chahiye
+PRE_BUCKET_FACTOR = 4
+
+LABEL_FORMATS = {
+    "minute": "%b %d - %H:%M",
+    "hour": "%b %d - %H:00",
+    "day": "%b %d",
+    "week": "%b %d",
+    "month": "%b %Y",
+}
+
+MAX_POINTS = 1000
+
+
+def _bucketed(trends, trunc):
+    """GROUP BY time bucket in the database: avg score + count per bucket."""
+    rows = (
+        trends.annotate(bucket=trunc("recorded_at"))
+        .values("bucket")
+        .annotate(score=Avg("score"), count=Count("id"))
+        .order_by("bucket")
+    )
+    return [(row["bucket"], row["score"], row["count"]) for row in rows]
+
+
+def bucket_series(trends, bucket):
+    """Series in calendar ``bucket``s ("day", "week" or "month")."""
+    return _points(_bucketed(trends, BUCKETS[bucket]), bucket)
+
+
+def downsample_series(trends, points):
+    """
+    Series reduced to at most ``points`` points. The database first
+    averages into the coarsest time buckets that still give about
+    PRE_BUCKET_FACTOR x ``points`` rows; LTTB then picks the points that
+    keep the chart's shape.
+    """
+    span = trends.aggregate(first=Min("recorded_at"), last=Max("recorded_at"))
+    if span["first"] is None:
+        return []
+
+    duration = span["last"] - span["first"]
+    # Na mile toh loop aakhri (minute) par khatam hota hai
+    for name, trunc, length in PRE_BUCKETS:
+        if duration / length >= points * PRE_BUCKET_FACTOR:
+            break
+    return _points(lttb(_bucketed(trends, trunc), points), name)
+
+
+def lttb(rows, threshold):
+    """
+    Largest-Triangle-Three-Buckets: ``rows`` are ``(time, score, count)``
+    sorted by time; keeps the first and last row and, from every bucket
+    in between, the row forming the largest triangle with its neighbours.
+    """
+    if threshold >= len(rows):
+        return rows
+    if threshold < 3:
+        return [rows[0], rows[-1]][:max(threshold, 0)]
+
+    xs = [row[0].timestamp() for row in rows]
+    ys = [row[1] for row in rows]
+    every = (len(rows) - 2) / (threshold - 2)
+
+    picked = [rows[0]]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        # Agle bucket ka average point (triangle ka teesra kona)
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, len(rows))
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(rows[best])
+        a = best
+
+    picked.append(rows[-1])
+    return picked
+
+
+def _points(rows, bucket):
+    fmt = LABEL_FORMATS[bucket]
+    return [
+        {
+            "time": bucket_start.isoformat(),
+            "label": timezone.localtime(bucket_start).strftime(fmt),
+            "score": round(score, 1),
+            "count": count,
+        }
+        for bucket_start, score, count in rows
+    ]
+
+
+def trend_series(user, bucket=None, points=None, since=None, until=None):
+    """User ki compliance series: ``bucket`` ya ``points`` (dono na hon toh day)."""
+    trends = ComplianceTrend.objects.filter(user=user)
+    if since:
+        trends = trends.filter(recorded_at__gte=since)
+    if until:
+        trends = trends.filter(recorded_at__lt=until)
+
+    if points:
+        return downsample_series(trends, min(points, MAX_POINTS))
+    return bucket_series(trends, bucket or "day")
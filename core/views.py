@@ -2,24 +2,32 @@ import csv
 import io
 import json
 import os
-import subprocess
 import logging
-import sys
-import secrets
-from datetime import timedelta
+from datetime import datetime, timedelta
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags, quote_etag
 from django.conf import settings
-from django.db.models import Avg, Count
+from django.db import transaction
+from django.db.models import Avg, Count, Prefetch
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.http import FileResponse, HttpResponse
 
 from rest_framework import viewsets, generics, status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from . import helpcenter, search
+from .emails import render_email
+from .mailer import queue_email
+from .scanning import enqueue_scan
+from .scheduler import lane_metrics
+from .stats import get_user_stats, rebuild_stats, rebuild_stats_on_commit
+from .throttling import ScanRateThrottle, admit_scan
+from .trends import BUCKETS, MAX_POINTS, trend_series
+
 # Logger setup
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -37,8 +45,9 @@ from .serializers import (
     NotificationSettingsSerializer, DisplaySettingsSerializer, ApiIntegrationSerializer,
     ComplianceSettingsSerializer, HelpHeroSerializer, DocumentationSerializer, 
     FAQSerializer, SupportResourceSerializer, ReleaseNoteSerializer, 
-    ContactMessageSerializer, 
+    ContactMessageSerializer, requested_fields,
 )
+from .pagination import ProjectCursorPagination, ScanResultCursorPagination
 # ✅ Sahi tareeqa: method_decorator use karein 'dispatch' method par
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -64,9 +73,22 @@ class UserProfileAPIView(APIView):
 class ProjectViewSet(viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ProjectCursorPagination
 
     def get_queryset(self):
-        return Project.objects.filter(uploaded_by=self.request.user).order_by('-id')
+        return Project.objects.filter(uploaded_by=self.request.user).select_related('uploaded_by').order_by('-id')
+
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action == 'create':
+            throttles.append(ScanRateThrottle())
+        return throttles
+
+    def create(self, request, *args, **kwargs):
+        # Scan background worker mein chalta hai: 202 Accepted, status 'Pending'
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
 
     def perform_create(self, serializer):
         # 1. Meta-data parsing
@@ -81,59 +103,26 @@ class ProjectViewSet(viewsets.ModelViewSet):
         except:
             pass
 
-        # 2. Project Initial Save
-        project = serializer.save(
-            uploaded_by=self.request.user, 
-            framework=framework_name,
-            status='Pending'
-        )
-        
-        # 3. Trigger AI Engine
-        try:
-            file_path = project.file.path
-            script_path = os.path.join(settings.BASE_DIR, 'ai_engine', 'predict.py')
-            
-            if os.path.exists(script_path):
-                # Timeout logic
-                p_timeout = 150 if scan_mode == 'deep' else 70
-                
-                result = subprocess.run(
-                    [sys.executable, script_path, file_path, scan_mode],
-                    capture_output=True, text=True, timeout=p_timeout
-                )
-
-                if result.returncode == 0:
-                    ai_json = json.loads(result.stdout)
-                    
-                    # 4. Save Scan Result
-                    ScanResult.objects.create(
-                        project=project,
-                        ethical_score=int(ai_json.get('ethical_score', 0)),
-                        security_score=int(ai_json.get('security_score', 0)),
-                        details=ai_json
-                    )
-
-                    # 5. SAVE TO COMPLIANCE TREND (Unique Timestamp)
-                    avg_score = (int(ai_json.get('ethical_score', 0)) + int(ai_json.get('security_score', 0))) // 2
-                    ComplianceTrend.objects.create(
-                        user=self.request.user,
-                        # Time add karne se har scan alag bar dikhayega
-                        month=timezone.now().strftime("%b %d - %H:%M"), 
-                        score=avg_score
-                    )
-                    
-                    project.status = 'Completed'
-                else:
-                    logger.error(f"AI Error: {result.stderr}")
-                    project.status = 'Failed'
-            else:
-                logger.error("AI Script path not found")
-                project.status = 'Failed'
-        except Exception as e:
-            logger.error(f"Scan Crash: {str(e)}")
-            project.status = 'Failed'
-        
-        project.save()
+        if scan_mode not in ('standard', 'deep'):
+            scan_mode = 'standard'
+
+        # 2. Project Initial Save + 3. Queue the AI scan (`manage.py scanworker`)
+        with transaction.atomic():
+            # In-flight scans ka cap: zyada hon toh 429 + Retry-After
+            admit_scan(self.request.user)
+            project = serializer.save(
+                uploaded_by=self.request.user, 
+                framework=framework_name,
+                status='Pending'
+            )
+            enqueue_scan(project, scan_mode)
+
+    def perform_destroy(self, instance):
+        # Project ke scans bhi delete hote hain: user ka rollup dobara banao
+        user_id = instance.uploaded_by_id
+        with transaction.atomic():
+            instance.delete()
+            rebuild_stats([user_id])
 # ================== DASHBOARD API (CLEANED & FILTERED) ==================
 class DashboardAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -141,42 +130,32 @@ class DashboardAPIView(APIView):
     def get(self, request):
         user = request.user
         projects = Project.objects.filter(uploaded_by=user)
-        scans = ScanResult.objects.filter(project__uploaded_by=user)
 
-        # 1. Aggregate Scores
-        agg = scans.aggregate(
-            ethical_avg=Avg("ethical_score"),
-            security_avg=Avg("security_score")
+        # 1. Scores + Issue Counters: per-user rollup se (core/stats.py), O(1)
+        stats = get_user_stats(user)
+        ethical_avg = stats.ethical_score
+        security_avg = stats.cybersecurity_score
+        compliance_score = stats.compliance_score
+
+        critical = stats.critical
+        high = stats.high
+        medium = stats.medium
+        total_issues = stats.issues_detected
+
+        # 2. Recent projects + unka latest scan (prefetch, har project ki alag query nahi)
+        latest_scans = Prefetch(
+            "scan_results",
+            queryset=ScanResult.objects.order_by("-scanned_at", "-id").only(
+                "id", "project_id", "ethical_score", "security_score", "scanned_at"
+            ),
+            to_attr="recent_scans",
         )
-        ethical_avg = int(agg.get("ethical_avg") or 0)
-        security_avg = int(agg.get("security_avg") or 0)
-        compliance_score = (ethical_avg + security_avg) // 2
-
-        # 2. Issue Counters (Fixed the UnboundLocalError)
-        critical = high = medium = total_issues = 0
-
-        for scan in scans:
-            data = scan.details
-            if isinstance(data, str):
-                try:
-                    data = json.loads(data)
-                except:
-                    continue
-
-            if not isinstance(data, dict):
-                continue
-
-            inner = data.get("details", data)
-            critical += int(inner.get("critical", 0) or 0)
-            high += int(inner.get("high", 0) or 0)
-            medium += int(inner.get("medium", 0) or 0)
-
-        total_issues = critical + high + medium
+        recent = list(projects.select_related("uploaded_by").prefetch_related(latest_scans).order_by('-id')[:6])
 
         # 3. Framework Cards
         f_cards = []
-        for p in projects.order_by('-id')[:6]:
-            s_obj = scans.filter(project=p).first()
+        for p in recent:
+            s_obj = p.recent_scans[0] if p.recent_scans else None
             f_cards.append({
                 "id": p.id,
                 "name": p.framework,
@@ -188,7 +167,7 @@ class DashboardAPIView(APIView):
         return Response({
             "user": UserSerializer(user).data,
             "stats": {
-                "projects_scanned": projects.count(),
+                "projects_scanned": stats.projects_scanned,
                 "issues_detected": total_issues,
                 "critical": critical,
                 "high": high,
@@ -197,7 +176,7 @@ class DashboardAPIView(APIView):
                 "ethical_score": ethical_avg,
                 "cybersecurity_score": security_avg,
             },
-            "projects": ProjectSerializer(projects.order_by('-id')[:5], many=True).data,
+            "projects": ProjectSerializer(recent[:5], many=True).data,
             "frameworks": f_cards if f_cards else [{"name": "Ready", "score": 0}],
             "charts": {
                 "issues_by_category": [
@@ -205,13 +184,69 @@ class DashboardAPIView(APIView):
                     {"category_name": "High", "issue_count": high},
                     {"category_name": "Medium", "issue_count": medium},
                 ],
-                "compliance_trend": ComplianceTrendSerializer(
-                    ComplianceTrend.objects.filter(user=user).order_by('id'), 
-                    many=True
-                ).data
+                # Poori history nahi: chart jitne points dikha sake (core/trends.py)
+                "compliance_trend": [
+                    {"id": i, "label": point["label"], "score": int(round(point["score"]))}
+                    for i, point in enumerate(trend_series(user, points=settings.DASHBOARD_TREND_POINTS))
+                ]
             }
         })
     permission_classes = [IsAuthenticated]
+# ================== COMPLIANCE TREND API ==================
+class ComplianceTrendAPIView(APIView):
+    """
+    GET /api/compliance-trend/?bucket=day|week|month
+    GET /api/compliance-trend/?points=100   (LTTB downsampling)
+    Optional ``since`` / ``until`` (ISO datetime ya date).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        bucket = request.query_params.get("bucket")
+        points = request.query_params.get("points")
+
+        if bucket and bucket not in BUCKETS:
+            return Response({"error": f"bucket must be one of: {', '.join(BUCKETS)}"}, status=400)
+        if points is not None:
+            if not points.isdigit() or not 2 <= int(points) <= MAX_POINTS:
+                return Response({"error": f"points must be between 2 and {MAX_POINTS}"}, status=400)
+            points = int(points)
+
+        bounds = {}
+        for name in ("since", "until"):
+            value = request.query_params.get(name)
+            if not value:
+                continue
+            try:
+                parsed = parse_datetime(value) or _date_start(parse_date(value))
+            except ValueError:
+                parsed = None
+            if parsed is None:
+                return Response({"error": f"Invalid {name} (use ISO date/datetime)"}, status=400)
+            bounds[name] = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+        series = trend_series(request.user, bucket=bucket, points=points, **bounds)
+        return Response({
+            "bucket": bucket if not points else None,
+            "points": series,
+        })
+
+
+class ScanQueueMetricsAPIView(APIView):
+    """GET /api/scan-queue/metrics/?window=3600 — har lane ki depth aur wait times (staff)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        window = request.query_params.get("window", "3600")
+        if not window.isdigit() or not 60 <= int(window) <= 7 * 86400:
+            return Response({"error": "window must be between 60 and 604800 seconds"}, status=400)
+        return Response(lane_metrics(int(window)))
+
+
+def _date_start(day):
+    return datetime.combine(day, datetime.min.time()) if day else None
+
+
 # ================== SETTINGS & INTEGRATIONS ==================
 class NotificationSettingsAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -253,9 +288,10 @@ class RegenerateApiKeyAPIView(APIView):
     permission_classes = [IsAuthenticated]
     def post(self, request):
         obj, _ = ApiIntegration.objects.get_or_create(user=request.user)
-        obj.api_key = "sk_live_" + secrets.token_hex(24)
+        # Raw key sirf isi response mein; DB mein hash (purani key ka cache save signal saaf karta hai)
+        raw_key = obj.set_api_key()
         obj.save()
-        return Response({"api_key": obj.api_key})
+        return Response({"api_key": raw_key, "api_key_preview": obj.api_key_preview})
 
 class ComplianceSettingsAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -286,33 +322,50 @@ class SecuritySettingsAPIView(APIView):
 class HelpCenterView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        hero = HelpHero.objects.first()
-        hero_data = HelpHeroSerializer(hero).data if hero else {}
-        return Response({
-            "hero": hero_data,
-            "documentation": DocumentationSerializer(Documentation.objects.all(), many=True).data,
-            "faq": FAQSerializer(FAQ.objects.all(), many=True).data,
-            "support": SupportResourceSerializer(SupportResource.objects.all(), many=True).data,
-            "releases": ReleaseNoteSerializer(ReleaseNote.objects.all(), many=True).data,
-        })
+        # Versioned cache (core/helpcenter.py): content na badla ho toh 304
+        version = helpcenter.current_version()
+        etag = quote_etag(f"help-{version}")
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        _, payload = helpcenter.get_payload(version)
+        return Response(payload, headers=headers)
+
+class HelpCenterSearchView(APIView):
+    """
+    GET /api/help-center/search/?q=upload&type=faq,documentation&limit=20
+    Ranked results (core/search.py); last word adhoora bhi chalega ("uplo").
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        kinds = [kind for kind in request.query_params.get("type", "").split(",") if kind]
+        limit = request.query_params.get("limit", "20")
+
+        unknown = [kind for kind in kinds if kind not in search.SOURCES]
+        if unknown:
+            return Response({"error": f"type must be one of: {', '.join(search.SOURCES)}"}, status=400)
+        if not limit.isdigit() or not 1 <= int(limit) <= search.MAX_LIMIT:
+            return Response({"error": f"limit must be between 1 and {search.MAX_LIMIT}"}, status=400)
+
+        results = search.search(query, kinds=kinds or None, limit=int(limit)) if query else []
+        return Response({"query": query, "count": len(results), "results": results})
 
 class ContactMessageView(APIView):
     permission_classes = [IsAuthenticated]
     def post(self, request):
         ContactMessage.objects.create(user=request.user, subject=request.data.get("subject"), message=request.data.get("message"))
-        send_mail(
+        queue_email(
             subject=f"New Support Request: {request.data.get('subject')}",
-            message=f"From: {request.user.email}\n\n{request.data.get('message')}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[settings.ADMIN_EMAIL],
+            body=f"From: {request.user.email}\n\n{request.data.get('message')}",
+            to=[settings.ADMIN_EMAIL],
         )
         return Response({"success": True})
     
 
 #-------------------------contact
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
@@ -340,21 +393,17 @@ class ContactMessageView2(APIView):
             admin_subject = f"New Contact Form Submission: {subject}"
             admin_msg = f"User Name: {name}\nUser Email: {email}\nSubject: {subject}\n\nMessage:\n{message}"
             
-            # fail_silently=True taaki agar SMTP error ho toh app crash na ho
-            from django.core.mail import send_mail
-            send_mail(admin_subject, admin_msg, settings.DEFAULT_FROM_EMAIL, [settings.ADMIN_EMAIL], fail_silently=True)
+            # Outbox mein: SMTP error ya slowness request ko nahi rokti (mailworker retry karta hai)
+            queue_email(admin_subject, admin_msg, [settings.ADMIN_EMAIL])
 
             # 3. THANK YOU EMAIL TO USER (HTML Template)
             user_subject = "We received your message! - Ethical Software Compliance"
             context = {'name': name}
             
-            # HTML Template ko load karein
-            html_content = render_to_string('emails/thank_you.html', context)
-            text_content = strip_tags(html_content) # Fallback text
+            # Compiled template + pehle se bana plain-text version (core/emails.py)
+            html_content, text_content = render_email('emails/thank_you.html', context)
 
-            msg = EmailMultiAlternatives(user_subject, text_content, settings.DEFAULT_FROM_EMAIL, [email])
-            msg.attach_alternative(html_content, "text/html")
-            msg.send(fail_silently=True)
+            queue_email(user_subject, text_content, [email], html_body=html_content)
 
             return Response({"success": True, "message": "Message sent successfully!"})
 
@@ -367,9 +416,31 @@ class ContactMessageView2(APIView):
 class ScanResultViewSet(viewsets.ModelViewSet):
     serializer_class = ScanResultSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ScanResultCursorPagination
     
     def get_queryset(self):
-        return ScanResult.objects.filter(project__uploaded_by=self.request.user)       
+        queryset = ScanResult.objects.filter(project__uploaded_by=self.request.user).select_related('project')
+        # ?fields= mein details nahi toh heavy JSON column DB se load hi na ho
+        wanted = requested_fields(self.request)
+        if wanted is not None and 'details' not in wanted:
+            queryset = queryset.defer('details')
+        return queryset.order_by('-scanned_at', '-id')
+
+    # Scores / counts badle toh dashboard rollup (Stats) bhi sahi rahe
+    def perform_create(self, serializer):
+        scan = serializer.save()
+        rebuild_stats_on_commit([scan.project.uploaded_by_id])
+
+    def perform_update(self, serializer):
+        # Project badal sakta hai: purane aur naye dono owners ka rollup
+        previous_owner = serializer.instance.project.uploaded_by_id
+        scan = serializer.save()
+        rebuild_stats_on_commit([previous_owner, scan.project.uploaded_by_id])
+
+    def perform_destroy(self, instance):
+        owner = instance.project.uploaded_by_id
+        instance.delete()
+        rebuild_stats_on_commit([owner])
     
 
 
@@ -0,0 +1,293 @@
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ApiIntegration, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-ESCC-Signature"
+USER_AGENT = "ESCC-Webhooks/1.0"
+
+_session = None
+
+
+def get_session():
+    """
+    Process-wide requests.Session: har endpoint ka keep-alive connection
+    pool mein rehta hai (har event par naya TCP/TLS handshake nahi).
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=settings.WEBHOOK_CONCURRENCY,
+            pool_maxsize=settings.WEBHOOK_CONCURRENCY,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        _session = session
+    return _session
+
+
+# ================== URL SAFETY ==================
+class UnsafeWebhookURL(ValueError):
+    """Webhook URL jo server ko internal network / metadata endpoints par bhejta (SSRF)."""
+
+
+def _is_public(ip):
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    # is_global: private, loopback, link-local (169.254 metadata), reserved sab False
+    return ip.is_global and not ip.is_multicast
+
+
+def check_webhook_url(url, resolve=True):
+    """
+    Raises UnsafeWebhookURL unless ``url`` is https and its host is public.
+    Save par ``resolve=False`` (scheme + literal IP / localhost); delivery
+    par host resolve karke har address check hota hai.
+    """
+    parts = urlsplit(url or "")
+    allow_private = settings.WEBHOOK_ALLOW_PRIVATE_URLS
+    if parts.scheme != "https" and not (allow_private and parts.scheme == "http"):
+        raise UnsafeWebhookURL("Webhook URL must use https.")
+    host = parts.hostname
+    if not host:
+        raise UnsafeWebhookURL("Webhook URL has no host.")
+    if allow_private:
+        return
+
+    try:
+        literal = ipaddress.ip_address(host)
+    except ValueError:
+        literal = None
+    if literal is not None or host == "localhost" or host.endswith(".localhost"):
+        if literal is None or not _is_public(literal):
+            raise UnsafeWebhookURL("Webhook URL points to a private address.")
+        return
+    if not resolve:
+        return
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parts.port or 443, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError) as e:
+        raise UnsafeWebhookURL(f"Cannot resolve webhook host {host}: {e}")
+    for address in addresses:
+        if not _is_public(ipaddress.ip_address(address.split("%")[0])):
+            raise UnsafeWebhookURL(f"Webhook host {host} resolves to a private address.")
+
+
+# ================== ENQUEUE ==================
+def queue_scan_event(project, event, scan=None, error=""):
+    """
+    Scan ke khatam hone par event queue karna (scan worker ki transaction
+    mein ek INSERT). Webhook URL na ho toh kuch nahi.
+    """
+    url = (
+        ApiIntegration.objects.filter(user_id=project.uploaded_by_id)
+        .values_list("webhook_url", flat=True)
+        .first()
+    )
+    if not url:
+        return None
+
+    data = {"project": {"id": project.id, "name": project.name, "framework": project.framework}}
+    if scan is not None:
+        data["scan"] = {
+            "id": scan.id,
+            "ethical_score": scan.ethical_score,
+            "security_score": scan.security_score,
+            "critical": scan.critical,
+            "high": scan.high,
+            "medium": scan.medium,
+            "total_issues": scan.total_issues,
+            "scanned_at": scan.scanned_at,
+        }
+    if error:
+        data["error"] = error[:500]
+
+    return WebhookDelivery.objects.create(
+        user_id=project.uploaded_by_id,
+        url=url,
+        event=event,
+        payload=json.loads(json.dumps(data, cls=DjangoJSONEncoder)),
+        # Coalesce window: burst ki baaki events bhi tab tak aa jati hain
+        next_attempt_at=timezone.now() + timedelta(seconds=settings.WEBHOOK_COALESCE_SECONDS),
+    )
+
+
+# ================== CLAIM ==================
+def claim_deliveries(limit):
+    token = uuid.uuid4().hex
+    now = timezone.now()
+
+    with transaction.atomic():
+        due = WebhookDelivery.objects.filter(
+            status=WebhookDelivery.QUEUED, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("id", flat=True)[:limit])
+        if not ids:
+            return []
+        WebhookDelivery.objects.filter(id__in=ids, status=WebhookDelivery.QUEUED).update(
+            status=WebhookDelivery.SENDING, claim_token=token, claimed_at=now
+        )
+    return list(WebhookDelivery.objects.filter(claim_token=token).order_by("id"))
+
+
+def requeue_stale_deliveries():
+    cutoff = timezone.now() - timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS)
+    return WebhookDelivery.objects.filter(status=WebhookDelivery.SENDING, claimed_at__lt=cutoff).update(
+        status=WebhookDelivery.QUEUED, claim_token=""
+    )
+
+
+# ================== SEND ==================
+def sign(secret, timestamp, body):
+    """``t=<unix>,v1=<hex>``: HMAC-SHA256 of ``"<timestamp>.<body>"`` (replay se bachne ko timestamp)."""
+    digest = hmac.new(secret.encode("utf-8"), f"{timestamp}.".encode("utf-8") + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def build_body(deliveries):
+    events = [
+        {
+            "id": delivery.id,
+            "type": delivery.event,
+            "created_at": delivery.created_at.isoformat(),
+            "data": delivery.payload,
+        }
+        for delivery in deliveries
+    ]
+    return json.dumps({"events": events}, separators=(",", ":")).encode("utf-8")
+
+
+def group_by_endpoint(deliveries):
+    """
+    (user, url) ke hisaab se groups, har group WEBHOOK_MAX_EVENTS_PER_REQUEST
+    tak: ek burst ki saari events ek hi signed POST mein.
+    """
+    groups = {}
+    for delivery in deliveries:
+        groups.setdefault((delivery.user_id, delivery.url), []).append(delivery)
+
+    size = settings.WEBHOOK_MAX_EVENTS_PER_REQUEST
+    return [
+        (user_id, url, batch[start:start + size])
+        for (user_id, url), batch in groups.items()
+        for start in range(0, len(batch), size)
+    ]
+
+
+def _post(url, secret, deliveries):
+    """
+    HTTP sirf yahan (thread mein chalta hai, DB nahi chhoota). Returns
+    (status code, error, permanent); blocked URL permanent hai, retry nahi.
+    """
+    try:
+        check_webhook_url(url)
+    except UnsafeWebhookURL as e:
+        return None, str(e), True
+
+    body = build_body(deliveries)
+    headers = {
+        "Content-Type": "application/json",
+        SIGNATURE_HEADER: sign(secret, int(time.time()), body),
+        "X-ESCC-Event-Count": str(len(deliveries)),
+    }
+    try:
+        # Redirect follow nahi: warna public URL 3xx se internal address par bhej sakta hai
+        response = get_session().post(
+            url, data=body, headers=headers, timeout=settings.WEBHOOK_TIMEOUT_SECONDS, allow_redirects=False,
+        )
+    except requests.RequestException as e:
+        return None, str(e), False
+    if 200 <= response.status_code < 300:
+        return response.status_code, "", False
+    return response.status_code, f"HTTP {response.status_code}", False
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x, 4x ... WEBHOOK_RETRY_MAX_SECONDS tak."""
+    delay = settings.WEBHOOK_RETRY_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.WEBHOOK_RETRY_MAX_SECONDS))
+
+
+def _record(deliveries, status_code, error, permanent=False):
+    now = timezone.now()
+    ids = [delivery.id for delivery in deliveries]
+    if not error:
+        WebhookDelivery.objects.filter(id__in=ids).update(
+            status=WebhookDelivery.DELIVERED, response_status=status_code, delivered_at=now,
+            last_error="", claim_token="",
+        )
+        return
+
+    # Ek group ki deliveries saath bheji gayi thi, toh attempts bhi saath
+    attempts = max(delivery.attempts for delivery in deliveries) + 1
+    if permanent or attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+        status, next_attempt_at = WebhookDelivery.FAILED, now
+        logger.error("Webhook %s failed after %s attempts: %s", deliveries[0].url, attempts, error)
+    else:
+        status, next_attempt_at = WebhookDelivery.QUEUED, now + retry_delay(attempts)
+    WebhookDelivery.objects.filter(id__in=ids).update(
+        status=status, attempts=attempts, response_status=status_code,
+        last_error=error[:1000], next_attempt_at=next_attempt_at, claim_token="",
+    )
+
+
+def deliver(deliveries):
+    """
+    Claimed deliveries bhejna: endpoint groups parallel threads mein (ek
+    slow endpoint baaki ko nahi rokta), results main thread DB mein likhta
+    hai. Returns number of events delivered.
+    """
+    groups = group_by_endpoint(deliveries)
+    if not groups:
+        return 0
+    secrets = dict(
+        ApiIntegration.objects.filter(user_id__in={user_id for user_id, _, _ in groups})
+        .values_list("user_id", "webhook_secret")
+    )
+
+    with ThreadPoolExecutor(max_workers=settings.WEBHOOK_CONCURRENCY) as pool:
+        futures = [
+            (batch, pool.submit(_post, url, secrets.get(user_id, ""), batch))
+            for user_id, url, batch in groups
+        ]
+        delivered = 0
+        for batch, future in futures:
+            status_code, error, permanent = future.result()
+            _record(batch, status_code, error, permanent)
+            if not error:
+                delivered += len(batch)
+    return delivered
+
+
+def send_due(limit=None):
+    """Abhi due saari deliveries bhejna (webhookworker --once). Returns delivered count."""
+    limit = limit or settings.WEBHOOK_BATCH_SIZE
+    requeue_stale_deliveries()
+    total = 0
+    while True:
+        deliveries = claim_deliveries(limit)
+        if not deliveries:
+            return total
+        total += deliver(deliveries)
@@ -1,25 +1,11 @@
-<<<<<<< HEAD
 """
 ASGI config for escc_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
-"""
-
-import os
-
-from django.core.asgi import get_asgi_application
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'escc_backend.settings')
-
-application = get_asgi_application()
-=======
-"""
-ASGI config for escc_backend project.
-
-It exposes the ASGI callable as a module-level variable named ``application``.
+Production runs this under gunicorn's uvicorn worker (see Procfile) so the
+async /api/projects/events/ stream holds a connection without tying up a
+worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -32,4 +18,3 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'escc_backend.settings')
 
 application = get_asgi_application()
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
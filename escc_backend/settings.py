@@ -1,4 +1,3 @@
-<<<<<<< HEAD
 from pathlib import Path
 from datetime import timedelta
 import os
@@ -107,12 +106,39 @@ SESSION_COOKIE_SECURE = False # Localhost par False rakhein
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # CI integrations: "Authorization: Api-Key sk_live_..." (core/authentication.py)
+        'core.authentication.ApiKeyAuthentication',
         'rest_framework.authentication.SessionAuthentication', # 👈 Ye line dashboard fix karegi
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Token bucket rate limits (core/throttling.py); reject par 429 + Retry-After
+    'DEFAULT_THROTTLE_CLASSES': (
+        'core.throttling.UserRateThrottle',
+        'core.throttling.ApiKeyRateThrottle',
+        'core.throttling.AnonRateThrottle',
+    ),
+}
+
+# "N/s|min|hour|day": N = burst, refill N per period. ProjectViewSet.create par "scan" bhi.
+RATE_LIMITS = {
+    'user': os.environ.get('RATE_LIMIT_USER', '300/min'),
+    'api_key': os.environ.get('RATE_LIMIT_API_KEY', '600/min'),
+    'anon': os.environ.get('RATE_LIMIT_ANON', '60/min'),
+    'scan': os.environ.get('RATE_LIMIT_SCAN', '20/min'),
 }
+# "database" (sab workers / machines ek hi limit) ya "memory" (har process alag:
+# N workers = N guna limit, sirf local dev / ek process ke liye)
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', 'database')
+
+# API key lookups ka in-process cache (har request par DB nahi)
+API_KEY_CACHE_SECONDS = int(os.environ.get('API_KEY_CACHE_SECONDS', 60))
+API_KEY_CACHE_SIZE = int(os.environ.get('API_KEY_CACHE_SIZE', 10000))
+
+# Cursor pagination (projects / scan-results), see core/pagination.py
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 50))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 500))
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -158,181 +184,87 @@ SOCIALACCOUNT_PROVIDERS = {
 }
 
 # --------------------------------------------------
-# REMAINING CONFIG
-# --------------------------------------------------
-AUTH_USER_MODEL = 'core.User'
-ROOT_URLCONF = 'escc_backend.urls'
-WSGI_APPLICATION = 'escc_backend.wsgi.application'
-
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
-EMAIL_HOST_USER = "Uzaifhassan852@gmail.com"
-EMAIL_HOST_PASSWORD = "hgzn nmiy gktc qbmj" 
-DEFAULT_FROM_EMAIL = "Ethical Software Compliance <Uzaifhassan852@gmail.com>"
-
-STATIC_URL = 'static/'
-MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
-=======
-from pathlib import Path
-from datetime import timedelta
-import os
-
-# --------------------------------------------------
-# BASE DIR
-# --------------------------------------------------
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# --------------------------------------------------
-# SECURITY
-# --------------------------------------------------
-SECRET_KEY = 'django-insecure-e_47)yb%7o1*(^w3+4wea0u=xa4&yv#qodz^)_0w#wq5#9pd!e'
-DEBUG = False
-ALLOWED_HOSTS = ["127.0.0.1", ".vercel.app"]
-
-# --------------------------------------------------
-# APPLICATIONS
-# --------------------------------------------------
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    'django.contrib.sites',
-
-    # Third Party
-    'rest_framework',
-    'rest_framework.authtoken',
-    'corsheaders',
-    'rest_framework_simplejwt',
-    
-    # Allauth
-    'allauth',
-    'allauth.account',
-    'allauth.socialaccount',
-    'allauth.socialaccount.providers.google',
-    'allauth.socialaccount.providers.linkedin_oauth2',
-
-    # Local Apps
-    'core',
-]
-
-SITE_ID = 1
-
-# --------------------------------------------------
-# MIDDLEWARE
-# --------------------------------------------------
-MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware', # Hamesha top par hona chahiye
-    'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'allauth.account.middleware.AccountMiddleware',
-]
-
-# --------------------------------------------------
-# ALLAUTH SETTINGS
-# --------------------------------------------------
-ACCOUNT_LOGIN_METHODS = {'email'}
-ACCOUNT_EMAIL_REQUIRED = True
-ACCOUNT_USERNAME_REQUIRED = False
-ACCOUNT_AUTHENTICATION_METHOD = 'email'
-ACCOUNT_EMAIL_VERIFICATION = 'none' # Development ke liye asaan hai
-
-SOCIALACCOUNT_LOGIN_ON_GET = True
-ACCOUNT_LOGOUT_ON_GET = True
-SOCIALACCOUNT_AUTO_SIGNUP = True 
-
-# Email Integration Fix
-SOCIALACCOUNT_ADAPTER = 'allauth.socialaccount.adapter.DefaultSocialAccountAdapter'
-SOCIALACCOUNT_EMAIL_AUTHENTICATION = True
-SOCIALACCOUNT_EMAIL_AUTHENTICATION_AUTO_CONNECT = True
-
-AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
-    'allauth.account.auth_backends.AuthenticationBackend',
-]
-
-# --------------------------------------------------
-# REDIRECTS & CROSS-DOMAIN SECURITY
-# --------------------------------------------------
-LOGIN_REDIRECT_URL = 'https://esccapp.netlify.app/dashboard'
-LOGOUT_REDIRECT_URL = 'https://esccapp.netlify.app/login'
-
-CORS_ALLOWED_ORIGINS = ["https://esccapp.netlify.app/"]
-CORS_ALLOW_CREDENTIALS = True
-CSRF_TRUSTED_ORIGINS = ["https://esccapp.netlify.app/"]
-
-# Session Cookies Fix (Taake React ko session mil sake)
-SESSION_COOKIE_SAMESITE = 'Lax'
-CSRF_COOKIE_SAMESITE = 'Lax'
-SESSION_COOKIE_HTTPONLY = True 
-SESSION_COOKIE_SECURE = False # Localhost par False rakhein
-
-# --------------------------------------------------
-# REST FRAMEWORK CONFIG
-# --------------------------------------------------
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication', # 👈 Ye line dashboard fix karegi
-    ),
-    'DEFAULT_PERMISSION_CLASSES': (
-        'rest_framework.permissions.IsAuthenticated',
-    ),
+# AI ENGINE
+# --------------------------------------------------
+# "inprocess": long-lived Scanner inside the web worker (fast)
+# "subprocess": fresh predict.py interpreter per scan (isolation)
+AI_ENGINE_MODE = os.environ.get('AI_ENGINE_MODE', 'inprocess')
+# Archive (zip/tar) uploads ke liye scan processes (khali = CPU count)
+AI_ENGINE_WORKERS = int(os.environ.get('AI_ENGINE_WORKERS', 0)) or None
+# Content-hash scan cache: "database" (sab processes share karte hain) ya "memory"
+AI_ENGINE_CACHE = os.environ.get('AI_ENGINE_CACHE', 'database')
+AI_ENGINE_CACHE_MAX_ENTRIES = int(os.environ.get('AI_ENGINE_CACHE_MAX_ENTRIES', 20000))
+
+# Scan job queue (`python manage.py scanworker`)
+SCAN_WORKER_CONCURRENCY = int(os.environ.get('SCAN_WORKER_CONCURRENCY', 2))
+SCAN_WORKER_POLL_SECONDS = float(os.environ.get('SCAN_WORKER_POLL_SECONDS', 1.0))
+# Itni der heartbeat na aaye toh job dobara queue hoti hai
+SCAN_JOB_LEASE_SECONDS = int(os.environ.get('SCAN_JOB_LEASE_SECONDS', 600))
+SCAN_JOB_MAX_ATTEMPTS = int(os.environ.get('SCAN_JOB_MAX_ATTEMPTS', 3))
+# Priority lanes (core/scheduler.py): claims standard:deep = 4:1 jab dono mein kaam ho
+SCAN_LANE_WEIGHTS = {
+    'standard': int(os.environ.get('SCAN_LANE_WEIGHT_STANDARD', 4)),
+    'deep': int(os.environ.get('SCAN_LANE_WEIGHT_DEEP', 1)),
 }
-
-SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
-    'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-    'AUTH_HEADER_TYPES': ('Bearer',),
+# Deep scans saare workers na gher lein: kam se kam ek slot standard ke liye khali
+SCAN_LANE_MAX_RUNNING = {
+    'deep': int(os.environ.get('SCAN_LANE_MAX_RUNNING_DEEP', max(1, SCAN_WORKER_CONCURRENCY - 1))),
 }
-
-# --------------------------------------------------
-# DATABASE & TEMPLATES
-# --------------------------------------------------
-DATABASES = {
+# Users ke beech fair pick kitni purani queued jobs mein se
+SCAN_FAIR_WINDOW = int(os.environ.get('SCAN_FAIR_WINDOW', 500))
+# Ek user ki ek waqt mein queued + running scans (0 = koi limit nahi)
+SCAN_MAX_IN_FLIGHT_PER_USER = int(os.environ.get('SCAN_MAX_IN_FLIGHT_PER_USER', 4))
+SCAN_ADMISSION_RETRY_SECONDS = int(os.environ.get('SCAN_ADMISSION_RETRY_SECONDS', 30))
+# Micro-batching: ek worker itni jobs tak ek model predict call mein score kare
+SCAN_BATCH_SIZE = int(os.environ.get('SCAN_BATCH_SIZE', 8))
+SCAN_BATCH_WINDOW_SECONDS = float(os.environ.get('SCAN_BATCH_WINDOW_SECONDS', 0.2))
+# Live progress: DB mein kitni der baad likhna, events stream kitni der baad padhe
+SCAN_PROGRESS_INTERVAL = float(os.environ.get('SCAN_PROGRESS_INTERVAL', 0.5))
+SCAN_EVENTS_POLL_SECONDS = float(os.environ.get('SCAN_EVENTS_POLL_SECONDS', 1.0))
+SCAN_EVENTS_MAX_SECONDS = int(os.environ.get('SCAN_EVENTS_MAX_SECONDS', 300))
+# POST projects/events/ticket/ wala ticket kitni der tak (ek hi dafa) chalta hai
+SCAN_EVENTS_TICKET_SECONDS = int(os.environ.get('SCAN_EVENTS_TICKET_SECONDS', 60))
+
+# Dashboard compliance chart: itne points tak downsample (core/trends.py)
+DASHBOARD_TREND_POINTS = int(os.environ.get('DASHBOARD_TREND_POINTS', 60))
+
+# --------------------------------------------------
+# WEBHOOKS (core/webhooks.py, `manage.py webhookworker`)
+# --------------------------------------------------
+# Event ke baad itni der ruk kar bhejna: burst ek hi POST mein chala jata hai
+WEBHOOK_COALESCE_SECONDS = float(os.environ.get('WEBHOOK_COALESCE_SECONDS', 2.0))
+WEBHOOK_MAX_EVENTS_PER_REQUEST = int(os.environ.get('WEBHOOK_MAX_EVENTS_PER_REQUEST', 50))
+WEBHOOK_BATCH_SIZE = int(os.environ.get('WEBHOOK_BATCH_SIZE', 200))
+WEBHOOK_CONCURRENCY = int(os.environ.get('WEBHOOK_CONCURRENCY', 8))
+WEBHOOK_TIMEOUT_SECONDS = float(os.environ.get('WEBHOOK_TIMEOUT_SECONDS', 5.0))
+WEBHOOK_POLL_SECONDS = float(os.environ.get('WEBHOOK_POLL_SECONDS', 1.0))
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS', 8))
+# Retry backoff: 30s, 60s, 120s ... max 1 ghanta
+WEBHOOK_RETRY_SECONDS = int(os.environ.get('WEBHOOK_RETRY_SECONDS', 30))
+WEBHOOK_RETRY_MAX_SECONDS = int(os.environ.get('WEBHOOK_RETRY_MAX_SECONDS', 3600))
+WEBHOOK_LEASE_SECONDS = int(os.environ.get('WEBHOOK_LEASE_SECONDS', 300))
+# Sirf local development: http:// aur private/loopback hosts (SSRF check band)
+WEBHOOK_ALLOW_PRIVATE_URLS = os.environ.get('WEBHOOK_ALLOW_PRIVATE_URLS', 'False') == 'True'
+
+# --------------------------------------------------
+# CACHES (Redis ke bina: memory + files)
+# --------------------------------------------------
+CACHES = {
+    # Har process ka apna
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates'], 
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'escc-default',
+    },
+    # Disk par: ek machine ke sab gunicorn workers share karte hain
+    'files': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('FILE_CACHE_DIR', str(BASE_DIR / '.cache')),
+        'OPTIONS': {'MAX_ENTRIES': 1000},
     },
-]
-
-# --------------------------------------------------
-# GOOGLE PROVIDER SETTINGS
-# --------------------------------------------------
-SOCIALACCOUNT_PROVIDERS = {
-    'google': {
-        'SCOPE': ['profile', 'email'],
-        'AUTH_PARAMS': {'access_type': 'online'},
-        'OAUTH_PKCE_ENABLED': True,
-    }
 }
+# Help center payload kis cache mein ("files" ya "default")
+HELP_CENTER_CACHE = os.environ.get('HELP_CENTER_CACHE', 'files')
+HELP_CENTER_CACHE_TIMEOUT = int(os.environ.get('HELP_CENTER_CACHE_TIMEOUT', 24 * 60 * 60))
 
 # --------------------------------------------------
 # REMAINING CONFIG
@@ -341,16 +273,31 @@ AUTH_USER_MODEL = 'core.User'
 ROOT_URLCONF = 'escc_backend.urls'
 WSGI_APPLICATION = 'escc_backend.wsgi.application'
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Tests / local: EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend
+# (emails EMAIL_FILE_PATH mein .log files ban jati hain, SMTP nahi chahiye)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', str(BASE_DIR / 'sent_emails'))
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
+EMAIL_TIMEOUT = 30
 EMAIL_HOST_USER = "Uzaifhassan852@gmail.com"
 EMAIL_HOST_PASSWORD = "hgzn nmiy gktc qbmj" 
 DEFAULT_FROM_EMAIL = "Ethical Software Compliance <Uzaifhassan852@gmail.com>"
+# Support / contact form emails yahan aati hain
+ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', EMAIL_HOST_USER)
+
+# Outbox (core/mailer.py): requests queue karti hain, `manage.py mailworker` bhejta hai
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.environ.get('EMAIL_OUTBOX_POLL_SECONDS', 2.0))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))
+# Retry backoff: 60s, 120s, 240s ... max 1 ghanta
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.environ.get('EMAIL_OUTBOX_RETRY_SECONDS', 60))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.environ.get('EMAIL_OUTBOX_RETRY_MAX_SECONDS', 3600))
+# Itni der "sending" mein atki email dobara queue (sender crash)
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.environ.get('EMAIL_OUTBOX_LEASE_SECONDS', 300))
 
 STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
->>>>>>> db10e5ef20a7e0293aa4275ab1c6357019f9d8ee
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
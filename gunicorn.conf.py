@@ -0,0 +1,17 @@
+# Gunicorn config (working directory se automatically load hoti hai)
+import gc
+
+# App (aur AI model) master process mein load ho, workers fork ke baad
+# same memory pages copy-on-write share karte hain
+preload_app = True
+
+
+def when_ready(server):
+    from ai_engine.registry import model_registry
+
+    model = model_registry.preload()
+    server.log.info(f"AI model preloaded: {model_registry.version if model is not None else 'not available'}")
+
+    # Preloaded objects ko GC generations se nikal do, warna collector
+    # unke refcount/gc headers touch karke shared pages copy karwa deta hai
+    gc.freeze()